@@ -0,0 +1,310 @@
+"""Export captions and ``SubtitleStyle`` to an Advanced SubStation Alpha script.
+
+Burning the script with ffmpeg's ``ass`` filter (libass) in the encode pass
+replaces per-frame subtitle compositing in MoviePy. The layout mirrors
+``MediaFactory.burn_subtitles``: the script resolution equals the canvas so
+positions are in output pixels, captions are top-anchored at the same
+baseline, and each animation is expressed with override tags.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+from .models import SubtitleStyle
+from .subtitles import CaptionLine
+from .text_render import TextStyle, available as text_render_available, layout_text
+
+SLIDE_MS = 250
+FIRE_STEP = 0.09
+BANNER_YELLOW = (255, 212, 0)
+HIGHLIGHT_BOX = (24, 30, 52)
+
+
+@dataclass
+class AssLayout:
+    """Resolved subtitle settings for one render."""
+
+    canvas_size: tuple[int, int]
+    font_path: Optional[str]
+    font_size: int
+    stroke_width: int
+    y_offset: int
+    animation: str = "none"
+    template: str = "classic"
+    banner_primary: Optional[str] = None
+    banner_secondary: Optional[str] = None
+    banner_primary_font_size: Optional[int] = None
+    banner_secondary_font_size: Optional[int] = None
+    banner_line_spacing: Optional[int] = None
+
+    @classmethod
+    def from_style(
+        cls,
+        style: SubtitleStyle,
+        *,
+        canvas_size: tuple[int, int] = (1080, 1920),
+        font_path: Optional[str] = None,
+        banner_primary: Optional[str] = None,
+        banner_secondary: Optional[str] = None,
+    ) -> "AssLayout":
+        return cls(
+            canvas_size=canvas_size,
+            font_path=font_path or style.font_path,
+            font_size=style.font_size,
+            stroke_width=style.stroke_width,
+            y_offset=style.y_offset,
+            animation=(style.animation or "none").lower(),
+            template=(style.template or "classic").lower(),
+            banner_primary=style.banner_primary_text if style.banner_primary_text is not None else banner_primary,
+            banner_secondary=(
+                style.banner_secondary_text if style.banner_secondary_text is not None else banner_secondary
+            ),
+            banner_primary_font_size=style.banner_primary_font_size,
+            banner_secondary_font_size=style.banner_secondary_font_size,
+            banner_line_spacing=style.banner_line_spacing,
+        )
+
+
+def _ass_time(seconds: float) -> str:
+    centis = max(int(round(seconds * 100)), 0)
+    hours, rem = divmod(centis, 360000)
+    minutes, rem = divmod(rem, 6000)
+    secs, centis = divmod(rem, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def _ass_color(rgb: Sequence[int], alpha: float = 1.0) -> str:
+    """``&HAABBGGRR`` where AA is transparency (00 = opaque)."""
+    transparency = int(round((1.0 - max(min(alpha, 1.0), 0.0)) * 255))
+    r, g, b = (int(c) for c in rgb[:3])
+    return f"&H{transparency:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def _bgr(rgb: Sequence[int]) -> str:
+    """Colour for ``\\1c``-style override tags."""
+    return _ass_color(rgb).replace("&H00", "&H", 1) + "&"
+
+
+def _alpha(alpha: float) -> str:
+    return _ass_color((0, 0, 0), alpha)[:4] + "&"
+
+
+def _escape(text: str) -> str:
+    # A zero-width space keeps a literal backslash from starting an escape.
+    return text.replace("\\", "\\\u200b").replace("{", "(").replace("}", ")")
+
+
+def _num(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+class _Block:
+    """Wrapped text plus its measured height (estimated when Pillow is missing)."""
+
+    def __init__(self, text: str, style: TextStyle) -> None:
+        layout = layout_text(text, style)
+        if layout is None:
+            self.lines = text.splitlines() or [""]
+            self.height = int(len(self.lines) * style.font_size * 1.2 + 2 * style.stroke_width)
+            self.font_height = style.font_size
+        else:
+            self.lines = layout.lines
+            self.height = layout.height
+            self.font_height = layout.font_height
+
+    @property
+    def text(self) -> str:
+        return "\\N".join(_escape(line) for line in self.lines)
+
+
+class AssDocument:
+    def __init__(self, layout: AssLayout) -> None:
+        self.layout = layout
+        self.events: List[str] = []
+        width, height = layout.canvas_size
+        self.center_x = width / 2
+        self.banner_enabled = layout.template == "banner"
+        self.banner_height = int(height * 0.21) if self.banner_enabled else 0
+        offset = 300 if self.banner_enabled else 250
+        self.base_y = height - offset - layout.y_offset
+        self.caption_style = TextStyle(
+            font_path=layout.font_path,
+            font_size=layout.font_size,
+            stroke_width=layout.stroke_width,
+            max_width=width - 120,
+        )
+        self.styles: List[str] = []
+
+    # -------------------- Styles --------------------
+    def _family(self) -> str:
+        from .ffmpeg_render import _font_family
+
+        return (_font_family(self.layout.font_path) if self.layout.font_path else None) or "Arial"
+
+    def add_style(self, name: str, text_style: TextStyle, color: Sequence[int], font_height: int) -> None:
+        # libass sizes fonts by line height (ascent + descent), not by em size.
+        self.styles.append(
+            "Style: {name},{font},{size},{primary},{primary},{outline},&H00000000,"
+            "0,0,0,0,100,100,0,0,1,{bord},0,8,60,60,0,1".format(
+                name=name,
+                font=self._family(),
+                size=max(int(font_height), 1),
+                primary=_ass_color(color),
+                outline=_ass_color((0, 0, 0)),
+                bord=_num(text_style.stroke_width),
+            )
+        )
+
+    def add_event(self, start: float, end: float, text: str, *, style: str = "Caption", layer: int = 0) -> None:
+        self.events.append(f"Dialogue: {layer},{_ass_time(start)},{_ass_time(end)},{style},,0,0,0,,{text}")
+
+    def rectangle(self, start: float, end: float, box: Sequence[float], color, alpha: float, layer: int) -> None:
+        x, y, w, h = box
+        tags = f"{{\\an7\\pos({_num(x)},{_num(y)})\\p1\\bord0\\shad0\\1c{_bgr(color)}\\1a{_alpha(alpha)}}}"
+        shape = f"m 0 0 l {_num(w)} 0 {_num(w)} {_num(h)} 0 {_num(h)}"
+        self.add_event(start, end, tags + shape, layer=layer)
+
+    # -------------------- Captions --------------------
+    def add_caption(self, caption: CaptionLine) -> None:
+        mode = self.layout.animation
+        block = _Block(caption.text, self.caption_style)
+        start, end = caption.start, caption.end
+        duration = max(end - start, 0.1)
+        cx, y = self.center_x, self.base_y
+        width, height = self.layout.canvas_size
+
+        if mode in {"slide_up", "slide_down", "slide_left", "slide_right"}:
+            dx = {"slide_left": width * 0.12, "slide_right": -width * 0.12}.get(mode, 0.0)
+            dy = {"slide_up": height * 0.08, "slide_down": -height * 0.08}.get(mode, 0.0)
+            tags = f"\\an8\\move({_num(cx + dx)},{_num(y + dy)},{_num(cx)},{_num(y)},0,{SLIDE_MS})"
+            self.add_event(start, end, f"{{{tags}}}{block.text}", layer=1)
+        elif mode == "bounce":
+            amplitude = self.layout.font_size * 0.45
+            steps = min(24, max(2, int(duration / 0.04)))
+
+            def bounce_y(progress: float) -> float:
+                return y - amplitude * math.sin(progress * math.pi * 2.2) * math.exp(-2.2 * progress)
+
+            for index in range(steps):
+                p0, p1 = index / steps, (index + 1) / steps
+                seg_start = start + duration * p0
+                seg_end = end if index == steps - 1 else start + duration * p1
+                move_ms = int(round(duration * (p1 - p0) * 1000))
+                tags = (
+                    f"\\an8\\move({_num(cx)},{_num(bounce_y(p0))},{_num(cx)},{_num(bounce_y(p1))},0,{move_ms})"
+                )
+                self.add_event(seg_start, seg_end, f"{{{tags}}}{block.text}", layer=1)
+        elif mode == "typewriter":
+            left = (width - self.caption_style.max_width) / 2
+            right = left + self.caption_style.max_width
+            ms = int(round(duration * 1000))
+            tags = (
+                f"\\an8\\pos({_num(cx)},{_num(y)})\\clip({_num(left)},0,{_num(left)},{height})"
+                f"\\t(0,{ms},\\clip({_num(left)},0,{_num(right)},{height}))"
+            )
+            self.add_event(start, end, f"{{{tags}}}{block.text}", layer=1)
+        elif mode == "highlight":
+            font_size = self.layout.font_size
+            box_w = max(self.caption_style.max_width + int(font_size * 0.9), width // 3)
+            box_h = max(block.height + int(font_size * 0.6), int(font_size * 1.6))
+            self.rectangle(start, end, (cx - box_w / 2, y, box_w, box_h), HIGHLIGHT_BOX, 0.55, layer=0)
+            tags = f"\\an5\\pos({_num(cx)},{_num(y + box_h / 2)})"
+            self.add_event(start, end, f"{{{tags}}}{block.text}", layer=1)
+        elif mode == "fire":
+            transforms = []
+            t = FIRE_STEP
+            while t < duration + FIRE_STEP:
+                t0 = int(round((t - FIRE_STEP) * 1000))
+                t1 = int(round(t * 1000))
+                transforms.append(f"\\t({t0},{t1},\\1c{_bgr(_fire_color(t))})")
+                t += FIRE_STEP
+            tags = f"\\an8\\pos({_num(cx)},{_num(y)})\\1c{_bgr(_fire_color(0.0))}" + "".join(transforms)
+            self.add_event(start, end, f"{{{tags}}}{block.text}", layer=1)
+        else:
+            self.add_event(start, end, f"{{\\an8\\pos({_num(cx)},{_num(y)})}}{block.text}", layer=1)
+
+    # -------------------- Banner --------------------
+    def add_banner(self, duration: float) -> None:
+        width, _ = self.layout.canvas_size
+        self.rectangle(0.0, duration, (0, 0, width, self.banner_height), (0, 0, 0), 0.92, layer=2)
+        spacing_adjust = int(self.layout.banner_line_spacing or 0)
+        lines = (
+            ("BannerPrimary", self.layout.banner_primary, (255, 255, 255), 0.35,
+             self.layout.banner_primary_font_size, -math.floor(spacing_adjust / 2)),
+            ("BannerSecondary", self.layout.banner_secondary, BANNER_YELLOW, 0.72,
+             self.layout.banner_secondary_font_size, math.ceil(spacing_adjust / 2)),
+        )
+        for style_name, text, color, y_factor, font_size_override, y_adjust in lines:
+            if not text:
+                continue
+            size_value = font_size_override or max(int(self.layout.font_size * 1.05), 48)
+            text_style = TextStyle(
+                font_path=self.layout.font_path,
+                font_size=max(size_value, 1),
+                stroke_width=max(2, self.layout.stroke_width + 1),
+                max_width=width - 160,
+            )
+            block = _Block(text, text_style)
+            self.add_style(style_name, text_style, color, block.font_height)
+            top = max(8, int(self.banner_height * y_factor) - block.height // 2 + int(y_adjust))
+            tags = f"\\an8\\pos({_num(self.center_x)},{top})"
+            self.add_event(0.0, duration, f"{{{tags}}}{block.text}", style=style_name, layer=3)
+
+    def render(self) -> str:
+        width, height = self.layout.canvas_size
+        header = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {width}",
+            f"PlayResY: {height}",
+            # Lines are pre-wrapped with the same CJK-aware rules as the MoviePy
+            # path when Pillow is available; otherwise libass wraps them.
+            f"WrapStyle: {2 if text_render_available() else 0}",
+            "ScaledBorderAndShadow: yes",
+            "YCbCr Matrix: TV.709",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+            "Alignment, MarginL, MarginR, MarginV, Encoding",
+            *self.styles,
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+            *self.events,
+        ]
+        return "\n".join(header) + "\n"
+
+
+def _fire_color(t: float) -> tuple[int, int, int]:
+    flicker = 0.6 + 0.4 * math.sin(t * 8.5)
+    return 255, int(255 * (0.55 + 0.35 * flicker)), int(255 * (0.25 + 0.2 * flicker))
+
+
+def build_ass(captions: Iterable[CaptionLine], layout: AssLayout, *, duration: Optional[float] = None) -> str:
+    """Return the ``.ass`` script for ``captions``; ``duration`` bounds the banner layer."""
+    captions = list(captions)
+    document = AssDocument(layout)
+    caption_font = _Block("", document.caption_style).font_height
+    document.add_style("Caption", document.caption_style, (255, 255, 255), caption_font)
+    for caption in captions:
+        document.add_caption(caption)
+    if document.banner_enabled:
+        end = duration if duration is not None else max((cap.end for cap in captions), default=0.0)
+        document.add_banner(end)
+    return document.render()
+
+
+def write_ass_file(
+    captions: Iterable[CaptionLine],
+    layout: AssLayout,
+    output_path: Path,
+    *,
+    duration: Optional[float] = None,
+) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(build_ass(captions, layout, duration=duration), encoding="utf-8")
+    return output_path
@@ -0,0 +1,168 @@
+"""Shared ``AsyncOpenAI`` transport for the web apps.
+
+The FastAPI routes used to call the synchronous wrappers through
+``run_in_threadpool`` (or directly), so a burst of translation or TTS requests
+pinned the worker threads and stalled unrelated routes. The async variants of
+``OpenAIShortsClient`` and ``keywordimagestory.openai_client.OpenAIClient`` go
+through :func:`request` instead:
+
+* one ``AsyncOpenAI`` per API key and event loop, over an ``httpx`` pool that
+  keeps connections alive between calls;
+* at most ``SHORTS_OPENAI_CONCURRENCY`` requests in flight per loop;
+* a per-attempt timeout (``SHORTS_OPENAI_TIMEOUT``);
+* up to ``SHORTS_OPENAI_MAX_RETRIES`` retries on 429/5xx and connection errors,
+  waiting for ``Retry-After`` when the server sends one and otherwise for an
+  exponential backoff with full jitter.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+try:
+    import httpx
+    import openai
+    from openai import AsyncOpenAI
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore
+    openai = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
+
+from .timings import registry
+
+logger = logging.getLogger(__name__)
+
+OPENAI_CONCURRENCY = int(os.getenv("SHORTS_OPENAI_CONCURRENCY", "8"))
+OPENAI_TIMEOUT = float(os.getenv("SHORTS_OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("SHORTS_OPENAI_MAX_RETRIES", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+# Keep-alive connections per pool; a few more than the concurrency limit.
+KEEPALIVE_CONNECTIONS = OPENAI_CONCURRENCY + 4
+
+T = TypeVar("T")
+
+
+class _Pool:
+    __slots__ = ("client", "semaphore")
+
+    def __init__(self, api_key: str) -> None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=KEEPALIVE_CONNECTIONS,
+                max_keepalive_connections=KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=OPENAI_TIMEOUT,
+        )
+        # Retries are ours (with Retry-After and the concurrency limit), not the SDK's.
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+        self.semaphore = asyncio.Semaphore(max(OPENAI_CONCURRENCY, 1))
+
+
+# httpx connections and asyncio semaphores belong to one event loop; a loop's
+# pools go away with the loop.
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Pool]]" = weakref.WeakKeyDictionary()
+
+
+def available() -> bool:
+    return AsyncOpenAI is not None
+
+
+def _pool(api_key: str) -> _Pool:
+    if AsyncOpenAI is None:
+        raise RuntimeError("The openai package is not installed.")
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    pool = pools.get(api_key)
+    if pool is None:
+        pool = pools[api_key] = _Pool(api_key)
+    return pool
+
+
+def shared_client(api_key: str) -> "AsyncOpenAI":
+    """The pooled ``AsyncOpenAI`` for ``api_key`` on the running loop."""
+    return _pool(api_key).client
+
+
+async def close_clients() -> None:
+    """Close the pools created on the running loop (call on app shutdown)."""
+    for pool in _pools.pop(asyncio.get_running_loop(), {}).values():
+        await pool.client.close()
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt: int, exc: Optional[BaseException] = None) -> float:
+    """Seconds to wait before retry ``attempt`` (0-based)."""
+    if exc is not None:
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_CAP)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+async def request(
+    api_key: str,
+    call: Callable[["AsyncOpenAI"], Awaitable[T]],
+    *,
+    timeout: float = OPENAI_TIMEOUT,
+    retries: int = OPENAI_MAX_RETRIES,
+    kind: str = "request",
+) -> T:
+    """Run ``call(client)`` under the concurrency limit, retrying transient failures.
+
+    The slot is released while waiting to retry so a throttled call does not
+    hold back the others.
+    """
+    pool = _pool(api_key)
+    attempt = 0
+    while True:
+        try:
+            async with pool.semaphore:
+                return await asyncio.wait_for(call(pool.client), timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            if attempt >= retries or not _retryable(exc):
+                raise
+            delay = backoff_delay(attempt, exc)
+            attempt += 1
+            registry.increment("openai_retries_total", kind=kind)
+            logger.warning(
+                "OpenAI %s failed (%s); retry %d/%d in %.1fs", kind, exc, attempt, retries, delay
+            )
+            await asyncio.sleep(delay)
+
@@ -0,0 +1,271 @@
+"""Precomputed NumPy audio mix with narration-driven music ducking.
+
+Narration and music are decoded to PCM once, the music is looped, faded and
+ducked with a sidechain gain curve derived from the narration's RMS envelope
+(with separate attack and release times), and the sum is encoded to a single
+AAC track. Mixed tracks are cached by the hashes of their inputs so a
+re-render with unchanged audio reuses the encoded file and only needs a
+stream-copy mux.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .ffmpeg_tools import pipe_ffmpeg, run_ffmpeg
+from .fingerprint import file_digest, hash_payload
+from .render_chunks import ChunkCache
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the mixing maths changes so cached tracks stop matching.
+MIX_VERSION = 1
+SAMPLE_RATE = 44100
+CHANNELS = 2
+MUSIC_FADE_SECONDS = 1.5
+CONTROL_RATE = 100  # gain-curve points per second
+CACHE_DIR = Path(
+    os.getenv("SHORTS_AUDIO_CACHE_DIR", Path(__file__).resolve().parent / "outputs" / ".audio_cache")
+).expanduser()
+CACHE_BYTES = int(os.getenv("SHORTS_AUDIO_CACHE_MB", "512")) * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class DuckingParams:
+    attack: float = 0.08
+    release: float = 0.6
+    window: float = 0.05
+    threshold_db: float = -35.0
+    floor_db: float = -50.0
+
+
+def decode_pcm(path: Path, *, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> np.ndarray:
+    """Decode any audio file to a ``(samples, channels)`` float32 array."""
+    raw = pipe_ffmpeg(
+        [
+            "-v",
+            "error",
+            "-nostdin",
+            "-i",
+            str(path),
+            "-vn",
+            "-f",
+            "f32le",
+            "-acodec",
+            "pcm_f32le",
+            "-ac",
+            str(channels),
+            "-ar",
+            str(sample_rate),
+            "pipe:1",
+        ]
+    )
+    return np.frombuffer(raw, dtype="<f4").reshape(-1, channels)
+
+
+def rms_envelope(
+    signal: np.ndarray,
+    *,
+    sample_rate: int = SAMPLE_RATE,
+    control_rate: int = CONTROL_RATE,
+    window: float = 0.05,
+) -> np.ndarray:
+    """RMS level of ``signal`` sampled at ``control_rate`` over a sliding ``window``."""
+    hop = max(sample_rate // control_rate, 1)
+    mono = signal.mean(axis=1) if signal.ndim == 2 else signal
+    frames = -(-len(mono) // hop)
+    padded = np.zeros(frames * hop, dtype=np.float32)
+    padded[: len(mono)] = mono
+    power = np.square(padded).reshape(frames, hop).mean(axis=1)
+    taps = max(int(round(window * control_rate)), 1)
+    if taps > 1 and frames:
+        power = np.convolve(power, np.ones(taps, dtype=np.float32) / taps, mode="same")
+    return np.sqrt(np.maximum(power, 0.0))
+
+
+def ducking_gain(
+    envelope: np.ndarray,
+    *,
+    ducking: float,
+    params: DuckingParams = DuckingParams(),
+    control_rate: int = CONTROL_RATE,
+) -> np.ndarray:
+    """Music gain per control frame: 1.0 in silence, ``max(1 - ducking, 0.05)`` under speech."""
+    floor_gain = max(1.0 - ducking, 0.05)
+    level_db = 20.0 * np.log10(np.maximum(envelope, 1e-9))
+    span = max(params.threshold_db - params.floor_db, 1e-6)
+    activity = np.clip((level_db - params.floor_db) / span, 0.0, 1.0)
+    target = 1.0 - (1.0 - floor_gain) * activity
+
+    attack = float(np.exp(-1.0 / max(params.attack * control_rate, 1e-6)))
+    release = float(np.exp(-1.0 / max(params.release * control_rate, 1e-6)))
+    gain = np.empty_like(target)
+    current = 1.0
+    # One-pole smoothing at the control rate; a few thousand steps per minute.
+    for index, value in enumerate(target.tolist()):
+        coeff = attack if value < current else release
+        current = value + coeff * (current - value)
+        gain[index] = current
+    return gain
+
+
+def _fade(length: int, fade_samples: int, *, rising: bool) -> np.ndarray:
+    ramp = np.linspace(0.0, 1.0, num=min(fade_samples, length), endpoint=False, dtype=np.float32)
+    return ramp if rising else ramp[::-1]
+
+
+def mix_tracks(
+    voice: np.ndarray,
+    music: Optional[np.ndarray],
+    *,
+    duration: float,
+    music_volume: float,
+    ducking: float,
+    sample_rate: int = SAMPLE_RATE,
+    params: DuckingParams = DuckingParams(),
+) -> np.ndarray:
+    """Return the ``duration``-long mix of ``voice`` and looped, faded, ducked ``music``."""
+    total = max(int(round(duration * sample_rate)), 1)
+    channels = voice.shape[1]
+    mix = np.zeros((total, channels), dtype=np.float32)
+    mix[: min(total, len(voice))] += voice[:total]
+    if music is None or not len(music):
+        return np.clip(mix, -1.0, 1.0)
+
+    # Same loop/fade timeline as MoviePy's attach_audio: the music is looped
+    # to one second past the longer of voice and video, faded at both ends of
+    # that span, then cut to the output length.
+    loop_length = int(round((max(len(voice) / sample_rate, duration) + 1.0) * sample_rate))
+    looped = np.resize(music, (loop_length, channels)).astype(np.float32, copy=False)
+    fade_samples = int(MUSIC_FADE_SECONDS * sample_rate)
+    fade_in = _fade(loop_length, fade_samples, rising=True)
+    fade_out = _fade(loop_length, fade_samples, rising=False)
+    looped[: len(fade_in)] *= fade_in[:, None]
+    looped[loop_length - len(fade_out) :] *= fade_out[:, None]
+    looped = looped[:total]
+
+    envelope = rms_envelope(voice, sample_rate=sample_rate, window=params.window)
+    control = ducking_gain(envelope, ducking=ducking, params=params)
+    if len(control):
+        control_times = (np.arange(len(control)) + 0.5) * (sample_rate / CONTROL_RATE)
+        # Past the end of the narration the music recovers to full level.
+        gain = np.interp(np.arange(len(looped)), control_times, control, right=1.0)
+    else:
+        gain = np.ones(len(looped))
+    gain *= max(music_volume, 0.0)
+    mix[: len(looped)] += looped * gain[:, None].astype(np.float32)
+    return np.clip(mix, -1.0, 1.0)
+
+
+def encode_aac(pcm: np.ndarray, output_path: Path, *, sample_rate: int = SAMPLE_RATE) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    pipe_ffmpeg(
+        [
+            "-v",
+            "error",
+            "-f",
+            "f32le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            str(pcm.shape[1]),
+            "-i",
+            "pipe:0",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "192k",
+            str(output_path),
+        ],
+        input_bytes=np.ascontiguousarray(pcm, dtype="<f4").tobytes(),
+    )
+    return output_path
+
+
+# Music decoded ahead of the mix (see ``prefetch_music``), keyed by file digest.
+_prefetched_music: Dict[str, np.ndarray] = {}
+_prefetch_lock = threading.Lock()
+
+
+def prefetch_music(path: Path) -> None:
+    """Decode ``path`` now so the next ``mix_to_file`` with it skips the decode.
+
+    Only the most recent track is kept, and it is released once a mix takes it.
+    """
+    digest = file_digest(path)
+    if digest is None:
+        return
+    pcm = decode_pcm(path)
+    with _prefetch_lock:
+        _prefetched_music.clear()
+        _prefetched_music[digest] = pcm
+
+
+def _take_prefetched_music(digest: Optional[str]) -> Optional[np.ndarray]:
+    with _prefetch_lock:
+        return _prefetched_music.pop(digest, None) if digest else None
+
+
+def mix_to_file(
+    voice_path: Path,
+    music_path: Optional[Path],
+    *,
+    duration: float,
+    music_volume: float,
+    ducking: float,
+    params: DuckingParams = DuckingParams(),
+    cache: Optional[ChunkCache] = None,
+) -> Path:
+    """Return an AAC file with the mixed track, reusing a cached encode when inputs match."""
+    cache = cache or ChunkCache(CACHE_DIR, CACHE_BYTES, suffix=".m4a")
+    music_digest = file_digest(music_path) if music_path else None
+    prefetched = _take_prefetched_music(music_digest)
+    key = hash_payload(
+        {
+            "version": MIX_VERSION,
+            "voice": file_digest(voice_path),
+            "music": music_digest,
+            "duration": round(duration, 3),
+            "music_volume": music_volume,
+            "ducking": ducking,
+            "params": asdict(params),
+            "sample_rate": SAMPLE_RATE,
+        }
+    )
+    cached = cache.lookup(key)
+    if cached is not None:
+        logger.info("Reusing mixed audio %s", cached.name)
+        return cached
+
+    voice = decode_pcm(voice_path)
+    music = prefetched if prefetched is not None else (decode_pcm(music_path) if music_path else None)
+    pcm = mix_tracks(voice, music, duration=duration, music_volume=music_volume, ducking=ducking, params=params)
+    # Unique per writer: a preview and a full render, or several job workers, may mix the same track.
+    partial = cache.partial_path(key)
+    try:
+        encode_aac(pcm, partial)
+        os.replace(partial, cache.path_for(key))
+    except FileNotFoundError:
+        # Another writer published the same mix first.
+        if cache.lookup(key) is None:
+            raise
+    finally:
+        partial.unlink(missing_ok=True)
+    cache.evict(keep=[key])
+    return cache.path_for(key)
+
+
+def mux_audio(video_path: Path, audio_path: Path, output_path: Path, *, duration: Optional[float] = None) -> Path:
+    """Combine a video-only file with an encoded audio track without re-encoding either."""
+    args = ["-i", str(video_path), "-i", str(audio_path), "-map", "0:v:0", "-map", "1:a:0", "-c", "copy"]
+    if duration is not None:
+        args.extend(["-t", f"{duration:.3f}"])
+    args.extend(["-movflags", "+faststart", str(output_path)])
+    run_ffmpeg(args)
+    return output_path
@@ -0,0 +1,222 @@
+"""Batch generation: many shorts from a JSONL file of option overrides.
+
+Each non-empty line of the batch file is a JSON object whose keys are
+``GenerationOptions`` fields (at least ``topic`` unless the CLI gives one);
+they override the options built from the command line. The network-bound half
+of each short (script and narration, ``prepare_short``) runs in a thread pool
+of ``concurrency`` workers, and every prepared short is handed to a process
+pool of ``render_workers`` renderers (``render_short``) as soon as it is
+ready, so TTS for later topics overlaps the encodes of earlier ones.
+
+Progress is kept in a JSON manifest next to the batch file. Rerunning the same
+batch skips entries the manifest lists as done and resumes the rest from their
+run checkpoints (see ``checkpoints``), so finished scripts and narrations are
+not requested again.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .checkpoints import run_dir
+from .generator import GenerationOptions, PreparedShort, build_output_name, prepare_short, render_short
+from .resources import CPU_CORES, governor, split_threads
+from .timings import pipeline
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv("SHORTS_BATCH_CONCURRENCY", "4"))
+BATCH_RENDER_WORKERS = int(os.getenv("SHORTS_BATCH_RENDER_WORKERS", "2"))
+
+_OPTION_FIELDS = {item.name for item in fields(GenerationOptions)}
+_PATH_FIELDS = {"assets_dir", "output_dir"}
+
+
+@dataclass
+class BatchEntry:
+    key: str
+    line: int
+    options: GenerationOptions
+
+
+def manifest_path_for(batch_path: Path) -> Path:
+    return batch_path.with_name(f"{batch_path.stem}.manifest.json")
+
+
+def load_batch(batch_path: Path, base: GenerationOptions) -> List[BatchEntry]:
+    """Parse ``batch_path`` into entries; ``base`` supplies the defaults for each line."""
+    entries: List[BatchEntry] = []
+    with batch_path.open(encoding="utf-8") as handle:
+        for line_no, raw in enumerate(handle, start=1):
+            raw = raw.strip()
+            if not raw or raw.startswith("#"):
+                continue
+            try:
+                overrides = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{batch_path}:{line_no}: invalid JSON ({exc.msg})") from exc
+            if not isinstance(overrides, dict):
+                raise ValueError(f"{batch_path}:{line_no}: expected a JSON object")
+            key = str(overrides.pop("id", None) or f"line-{line_no}")
+            unknown = sorted(set(overrides) - _OPTION_FIELDS)
+            if unknown:
+                raise ValueError(f"{batch_path}:{line_no}: unknown option(s): {', '.join(unknown)}")
+            for name in _PATH_FIELDS & set(overrides):
+                overrides[name] = Path(overrides[name])
+            options = replace(base, **overrides)
+            if not options.topic:
+                raise ValueError(f"{batch_path}:{line_no}: topic is required")
+            if any(entry.key == key for entry in entries):
+                raise ValueError(f"{batch_path}:{line_no}: duplicate id {key!r}")
+            entries.append(BatchEntry(key, line_no, options))
+    return entries
+
+
+class BatchManifest:
+    """Per-entry status of a batch run, rewritten atomically after every change."""
+
+    def __init__(self, path: Path, batch_path: Path) -> None:
+        self.path = path
+        self.data: Dict[str, Any] = {"batch": str(batch_path), "items": {}}
+        if path.exists():
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                logger.warning("Ignoring unreadable batch manifest %s", path)
+        self.data.setdefault("items", {})
+
+    @property
+    def items(self) -> Dict[str, Dict[str, Any]]:
+        return self.data["items"]
+
+    def is_done(self, key: str) -> bool:
+        return self.items.get(key, {}).get("status") == "done"
+
+    def update(self, key: str, **values: Any) -> None:
+        item = self.items.setdefault(key, {})
+        item.update(values)
+        item["updated_at"] = datetime.utcnow().isoformat(timespec="seconds")
+        self.save()
+
+    def save(self) -> None:
+        self.data["updated_at"] = datetime.utcnow().isoformat(timespec="seconds")
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> Dict[str, int]:
+        return dict(Counter(item.get("status", "pending") for item in self.items.values()))
+
+
+def _prepare(options: GenerationOptions) -> PreparedShort:
+    with pipeline("generate.prepare"):
+        return prepare_short(options)
+
+
+def _init_render_worker(cores: int, log_level: int) -> None:
+    # Renderers share the machine: each process gets its slice of the cores.
+    governor.cores = max(cores, 1)
+    logging.basicConfig(level=log_level, format="[%(asctime)s] %(levelname)s - %(name)s: %(message)s")
+
+
+def _render(prepared: PreparedShort) -> Dict[str, Any]:
+    with pipeline("generate.render"):
+        return render_short(prepared)
+
+
+def run_batch(
+    batch_path: Path,
+    base: GenerationOptions,
+    *,
+    concurrency: int = BATCH_CONCURRENCY,
+    render_workers: int = BATCH_RENDER_WORKERS,
+    manifest_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Generate every entry of ``batch_path`` and return the manifest data.
+
+    Entries already marked done in the manifest are skipped; failed or
+    unfinished ones resume their run, redoing only the stages whose inputs
+    changed or that never completed. A failing entry is recorded and does not
+    stop the others.
+    """
+    entries = load_batch(batch_path, base)
+    manifest = BatchManifest(manifest_path or manifest_path_for(batch_path), batch_path)
+    manifest.data["started_at"] = datetime.utcnow().isoformat(timespec="seconds")
+    pending = [entry for entry in entries if not manifest.is_done(entry.key)]
+    logger.info(
+        "Batch %s: %d entries, %d already done", batch_path.name, len(entries), len(entries) - len(pending)
+    )
+    for entry in pending:
+        # Fix the run id up front so an interrupted entry resumes its checkpointed stages.
+        run_id = manifest.items.get(entry.key, {}).get("run_id")
+        if run_id and run_dir(entry.options.output_dir, run_id).exists():
+            entry.options = replace(entry.options, resume=run_id)
+        else:
+            run_id = entry.options.output_name or "-".join(
+                [build_output_name(entry.options.topic, entry.options.style, entry.options.lang), entry.key]
+            )
+            entry.options = replace(entry.options, output_name=run_id)
+        manifest.items[entry.key] = {
+            "line": entry.line,
+            "topic": entry.options.topic,
+            "status": "pending",
+            "run_id": run_id,
+        }
+    if not pending:
+        manifest.data["summary"] = manifest.summary()
+        manifest.save()
+        return manifest.data
+    manifest.save()
+
+    render_workers = max(int(render_workers), 1)
+    prepare_pool = ThreadPoolExecutor(max_workers=max(int(concurrency), 1), thread_name_prefix="batch-prepare")
+    render_pool = ProcessPoolExecutor(
+        max_workers=render_workers,
+        initializer=_init_render_worker,
+        initargs=(split_threads(CPU_CORES, render_workers), logging.getLogger().getEffectiveLevel()),
+    )
+    started: Dict[str, float] = {}
+    running: Dict[Future, Tuple[str, str]] = {}
+    with prepare_pool, render_pool:
+        for entry in pending:
+            started[entry.key] = time.perf_counter()
+            running[prepare_pool.submit(_prepare, entry.options)] = (entry.key, "prepare")
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, stage = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.error("Batch entry %s failed during %s: %s", key, stage, exc)
+                    manifest.update(key, status="failed", stage=stage, error=str(exc))
+                    continue
+                if stage == "prepare":
+                    manifest.update(key, status="rendering")
+                    running[render_pool.submit(_render, result)] = (key, "render")
+                    continue
+                manifest.update(
+                    key,
+                    status="done",
+                    stage=None,
+                    error=None,
+                    video_path=result.get("video_path"),
+                    metadata_path=result.get("metadata_path"),
+                    seconds=round(time.perf_counter() - started[key], 2),
+                )
+
+    counts = manifest.summary()
+    logger.info("Batch %s finished: %s", batch_path.name, counts)
+    manifest.data["summary"] = counts
+    manifest.save()
+    return manifest.data
+
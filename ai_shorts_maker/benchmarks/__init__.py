@@ -0,0 +1 @@
+"""Offline benchmarks for the rendering pipeline (``python -m ai_shorts_maker.benchmarks.<name>``)."""
@@ -0,0 +1,91 @@
+"""Decode throughput of timeline media before and after decoder-side framing.
+
+Run ``python -m ai_shorts_maker.benchmarks.decode``. Prints frames per second
+for 4K and 1080p footage and a large still image, reading sequential frames
+the way a render does, through the legacy path (``VideoFileClip`` with audio
+plus ``_resize_clip``) and through ``media_reader``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..media import _resize_clip, _set_fps
+from ..media_reader import ImageClip, VideoFileClip, open_image_clip, open_video_clip
+from .synthetic import make_image, make_video
+
+CANVAS = (1080, 1920)
+
+
+def _legacy_video(path: Path, fps: int):
+    return _set_fps(_resize_clip(VideoFileClip(str(path)), CANVAS), fps)
+
+
+def _legacy_image(path: Path, fps: int):
+    return _set_fps(_resize_clip(ImageClip(str(path)), CANVAS), fps)
+
+
+def _lean_video(path: Path, fps: int):
+    return _resize_clip(open_video_clip(path, CANVAS, fps), CANVAS)
+
+
+def _lean_image(path: Path, fps: int):
+    return _set_fps(_resize_clip(open_image_clip(path, CANVAS), CANVAS), fps)
+
+
+def _measure(opener: Callable, path: Path, *, fps: int, seconds: float) -> float:
+    start = time.perf_counter()
+    clip = opener(path, fps)
+    frames = int(seconds * fps)
+    try:
+        for index in range(frames):
+            clip.get_frame(index / fps)
+    finally:
+        clip.close()
+    return frames / (time.perf_counter() - start)
+
+
+def run(*, seconds: float = 4.0, fps: int = 30) -> List[Dict[str, object]]:
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory(prefix="shorts-decode-") as tmp:
+        tmp_dir = Path(tmp)
+        sources = [
+            ("4k-portrait", make_video(tmp_dir / "4k.mp4", (2160, 3840), duration=seconds + 1, fps=fps), _legacy_video, _lean_video),
+            ("1080p-landscape", make_video(tmp_dir / "1080p.mp4", (1920, 1080), duration=seconds + 1, fps=fps), _legacy_video, _lean_video),
+            ("image-12mp", make_image(tmp_dir / "photo.jpg", (4000, 3000)), _legacy_image, _lean_image),
+        ]
+        for name, path, legacy, lean in sources:
+            before = _measure(legacy, path, fps=fps, seconds=seconds)
+            after = _measure(lean, path, fps=fps, seconds=seconds)
+            results.append(
+                {
+                    "source": name,
+                    "before_fps": round(before, 1),
+                    "after_fps": round(after, 1),
+                    "speedup": round(after / before, 2) if before else None,
+                }
+            )
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=4.0, help="Seconds of output read per source")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+    results = run(seconds=args.seconds, fps=args.fps)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'source':<18}{'before fps':>12}{'after fps':>12}{'speedup':>10}")
+    for row in results:
+        print(f"{row['source']:<18}{row['before_fps']:>12}{row['after_fps']:>12}{row['speedup']:>9}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Per-frame cost of auto-motion (Ken Burns) image segments.
+
+Run ``python -m ai_shorts_maker.benchmarks.motion``. Renders the same
+kenburns/zoom/pan motions on a 1080x1920 canvas through the legacy MoviePy
+path (callable resize + animated position in a composite) and through
+``motion.KenBurnsRenderer``, and prints frames per second for each.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from ..media import _set_duration
+from ..motion import KenBurnsRenderer, kenburns_clip
+from ..services import (
+    ColorClip,
+    CompositeVideoClip,
+    ImageClip,
+    SegmentMotion,
+    _apply_scale_effect,
+    _auto_motion_parameters,
+    _with_position,
+)
+
+CANVAS = (1080, 1920)
+MODES = ("kenburns", "zoom_in", "zoom_out", "pan_left", "pan_up")
+
+
+def _motion(mode: str, duration: float) -> SegmentMotion:
+    params = _auto_motion_parameters(CANVAS, mode, 1.1, 0.12, None)
+    motion = SegmentMotion(
+        duration=duration,
+        canvas_size=CANVAS,
+        scale_start=params["scale_start"],
+        scale_end=params["scale_end"],
+        apply_scale=True,
+        center_start=params["center_start"],
+        center_end=params["center_end"],
+        use_auto=True,
+    )
+    motion.pos_start = motion.center_to_top_left(motion.scale_start, motion.center_start)
+    motion.pos_end = motion.center_to_top_left(motion.scale_end, motion.center_end)
+    return motion
+
+
+def _legacy(image: np.ndarray, motion: SegmentMotion):
+    clip = _set_duration(ImageClip(image), motion.duration)
+    clip = _apply_scale_effect(clip, motion.scale_at)
+    clip = _with_position(clip, motion.position_at)
+    background = ColorClip(size=CANVAS, color=(0, 0, 0), duration=motion.duration)
+    return CompositeVideoClip([background, clip], size=CANVAS)
+
+
+def _fast(image: np.ndarray, motion: SegmentMotion):
+    renderer = KenBurnsRenderer(
+        image,
+        duration=motion.duration,
+        scale_start=motion.scale_start,
+        scale_end=motion.scale_end,
+        center_start=motion.center_start,
+        center_end=motion.center_end,
+    )
+    return kenburns_clip(renderer)
+
+
+def _measure(clip, *, fps: int, duration: float) -> float:
+    frames = int(duration * fps)
+    start = time.perf_counter()
+    for index in range(frames):
+        clip.get_frame(index / fps)
+    return frames / (time.perf_counter() - start)
+
+
+def run(*, duration: float = 2.0, fps: int = 30) -> List[Dict[str, object]]:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(CANVAS[1], CANVAS[0], 3), dtype=np.uint8)
+    results: List[Dict[str, object]] = []
+    for mode in MODES:
+        motion = _motion(mode, duration)
+        start = time.perf_counter()
+        fast_clip = _fast(image, motion)
+        setup = time.perf_counter() - start
+        before = _measure(_legacy(image, motion), fps=fps, duration=duration)
+        after = _measure(fast_clip, fps=fps, duration=duration)
+        results.append(
+            {
+                "mode": mode,
+                "before_fps": round(before, 1),
+                "after_fps": round(after, 1),
+                "speedup": round(after / before, 2) if before else None,
+                "setup_ms": round(setup * 1000, 1),
+            }
+        )
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds rendered per motion")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+    results = run(duration=args.duration, fps=args.fps)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<12}{'before fps':>12}{'after fps':>12}{'speedup':>10}{'setup ms':>10}")
+    for row in results:
+        print(
+            f"{row['mode']:<12}{row['before_fps']:>12}{row['after_fps']:>12}"
+            f"{row['speedup']:>9}x{row['setup_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
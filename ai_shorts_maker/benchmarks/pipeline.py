@@ -0,0 +1,488 @@
+"""End-to-end render benchmarks on synthetic media.
+
+Run ``python -m ai_shorts_maker.benchmarks.pipeline --output run.json``. All
+inputs (noise/colour footage, gradient overlays, sine-tone narration and
+music, caption sets) are generated offline; OpenAI is replaced by a stub, so
+no network access or API key is needed. Three suites are measured:
+
+- ``subtitles``: ``MediaFactory.burn_subtitles`` for every animation mode and
+  both layout templates, composing every frame of a plain background;
+- ``render``: ``render_project`` with 1/10/100 image overlays;
+- ``generate``: ``generate_short`` end to end with the stubbed client.
+
+Each case runs in a fresh process so peak RSS is per case. Results carry wall
+time, output fps, peak RSS and per-stage timings; ``--baseline`` compares
+against an earlier JSON file.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .synthetic import fake_captions, make_gradient, make_tone, make_video
+
+CANVAS = (1080, 1920)
+FPS = 24
+ANIMATIONS = (
+    "none",
+    "slide_up",
+    "slide_down",
+    "slide_left",
+    "slide_right",
+    "bounce",
+    "typewriter",
+    "highlight",
+    "fire",
+)
+TEMPLATES = ("classic", "banner")
+OVERLAY_COUNTS = (1, 10, 100)
+DURATIONS = (5.0, 15.0)
+SUITES = ("subtitles", "render", "generate")
+# Every persistent cache the pipeline reads: environment variable, module and
+# the module constant it is read into at import. Each case gets empty ones.
+CACHE_DIRS = (
+    ("SHORTS_AUDIO_CACHE_DIR", "audio_mix", "CACHE_DIR"),
+    ("SHORTS_TEXT_CACHE_DIR", "text_render", "CACHE_DIR"),
+    ("SHORTS_OPENAI_CACHE_DIR", "response_cache", "CACHE_DIR"),
+    ("SHORTS_BROLL_INDEX_DIR", "broll_index", "INDEX_DIR"),
+)
+
+
+@dataclass
+class Case:
+    suite: str
+    duration: float
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        extra = ",".join(f"{key}={value}" for key, value in sorted(self.params.items()))
+        return f"{self.suite}[{self.duration:g}s{',' + extra if extra else ''}]"
+
+
+class StageTimer:
+    """Accumulates wall time of selected functions while they are patched in."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[stage] += time.perf_counter() - start
+
+    def wrap(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            with self.measure(stage):
+                return func(*args, **kwargs)
+
+        return timed
+
+    @contextmanager
+    def patched(self, targets: Sequence[tuple[Any, str, str]]) -> Iterator[None]:
+        """Temporarily replace ``owner.attr`` with a timed wrapper for each ``(owner, attr, stage)``."""
+        with ExitStack() as stack:
+            for owner, attr, stage in targets:
+                stack.enter_context(replaced(owner, attr, self.wrap(stage, getattr(owner, attr))))
+            yield
+
+    def rounded(self) -> Dict[str, float]:
+        return {stage: round(seconds, 4) for stage, seconds in self.stages.items()}
+
+
+@contextmanager
+def replaced(owner: Any, attr: str, value: Any) -> Iterator[None]:
+    original = getattr(owner, attr)
+    setattr(owner, attr, value)
+    try:
+        yield
+    finally:
+        setattr(owner, attr, original)
+
+
+@contextmanager
+def isolated_outputs(output_dir: Path) -> Iterator[None]:
+    """Point the project repository at ``output_dir`` for the duration of a case."""
+    from .. import repository, services
+
+    previous = repository.OUTPUT_DIR, services.OUTPUT_DIR
+    repository.OUTPUT_DIR = services.OUTPUT_DIR = output_dir
+    try:
+        yield
+    finally:
+        repository.OUTPUT_DIR, services.OUTPUT_DIR = previous
+
+
+class StubOpenAIClient:
+    """Offline stand-in for ``OpenAIShortsClient``: canned script and a sine-tone narration."""
+
+    SECONDS_PER_SENTENCE = 2.5
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.duration = float(os.environ.get("SHORTS_BENCH_NARRATION", "15"))
+
+    def generate_script(self, prompt: str, temperature: float = 0.8) -> str:
+        from .synthetic import CAPTION_TEXTS
+
+        count = max(int(self.duration / self.SECONDS_PER_SENTENCE), 1)
+        return " ".join(CAPTION_TEXTS[index % len(CAPTION_TEXTS)] for index in range(count))
+
+    def synthesize_voice(self, text: str, voice: str, output_path: Path, audio_format: str = "mp3") -> Path:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        return make_tone(output_path, duration=self.duration, frequency=180.0)
+
+
+def _synthetic_project(case: Case, media: Dict[str, Path], output_dir: Path):
+    from ..models import AudioSettings, ProjectMetadata, TimelineSegment
+    from ..repository import save_project
+    from ..subtitles import subtitle_lines_from_captions
+
+    duration = case.duration
+    overlays = int(case.params.get("overlays", 0))
+    timeline = [
+        TimelineSegment(id="base", media_type="broll", source=str(media["video"]), start=0.0, end=duration)
+    ]
+    span = min(duration, 3.0)
+    for index in range(overlays):
+        start = (duration - span) * index / max(overlays - 1, 1)
+        timeline.append(
+            TimelineSegment(
+                id=f"overlay-{index}",
+                media_type="image",
+                source=str(media["overlay"]),
+                start=round(start, 3),
+                end=round(start + span, 3),
+                extras={
+                    "position": [60 + (index * 97) % 700, 200 + (index * 173) % 1300],
+                    "scale_start": 0.25,
+                    "alpha": 0.8,
+                },
+            )
+        )
+    base_name = f"bench-{overlays}ov-{duration:g}s"
+    voice_path = output_dir / f"{base_name}.wav"
+    shutil.copyfile(media["voice"], voice_path)
+    captions = subtitle_lines_from_captions(fake_captions(duration))
+    metadata = ProjectMetadata(
+        base_name=base_name,
+        topic="benchmark",
+        style="benchmark",
+        language="ko",
+        duration=duration,
+        script_path=str(output_dir / f"{base_name}.txt"),
+        audio_path=str(voice_path),
+        subtitles_path=str(output_dir / f"{base_name}.srt"),
+        video_path=str(output_dir / f"{base_name}.mp4"),
+        captions=captions,
+        timeline=timeline,
+        audio_settings=AudioSettings(voice_path=str(voice_path), music_track=str(media["music"])),
+        extra={"fps": FPS},
+    )
+    save_project(metadata, output_dir)
+    return metadata
+
+
+def _run_subtitles(case: Case, media: Dict[str, Path], work_dir: Path, timer: StageTimer) -> int:
+    from ..media import MediaFactory, _set_duration
+    from ..services import ColorClip
+
+    template = case.params["template"]
+    factory = MediaFactory(
+        media["assets"],
+        fps=FPS,
+        subtitle_animation=case.params["animation"],
+        layout_template=template,
+        banner_primary="오늘의 이야기" if template == "banner" else None,
+        banner_secondary="끝까지 보세요" if template == "banner" else None,
+    )
+    background = _set_duration(ColorClip(size=CANVAS, color=(20, 24, 32)), case.duration)
+    with timer.measure("burn_subtitles"):
+        clip = factory.burn_subtitles(background, fake_captions(case.duration))
+    frames = int(case.duration * FPS)
+    try:
+        with timer.measure("compose_frames"):
+            for index in range(frames):
+                clip.get_frame(index / FPS)
+    finally:
+        clip.close()
+    return frames
+
+
+def _run_render(case: Case, media: Dict[str, Path], work_dir: Path, timer: StageTimer) -> int:
+    from .. import services
+
+    output_dir = work_dir / "outputs"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with isolated_outputs(output_dir):
+        base_name = _synthetic_project(case, media, output_dir).base_name
+        targets = [
+            (services, "_render_key", "render_key"),
+            (services, "_mix_project_audio", "mix_audio"),
+            (services, "_build_moviepy_visual", "build_visual"),
+            (services, "mux_audio", "mux_audio"),
+        ]
+        with timer.patched(targets), timer.measure("render_project"):
+            services.render_project(
+                base_name,
+                burn_subs=True,
+                engine=case.params.get("engine", "moviepy"),
+            )
+    return int(case.duration * FPS)
+
+
+def _run_generate(case: Case, media: Dict[str, Path], work_dir: Path, timer: StageTimer) -> int:
+    from .. import generator
+    from ..media import MediaFactory
+
+    os.environ["SHORTS_BENCH_NARRATION"] = str(case.duration)
+    output_dir = work_dir / "outputs"
+    options = generator.GenerationOptions(
+        topic="benchmark",
+        fps=FPS,
+        burn_subs=True,
+        output_name=f"bench-generate-{case.duration:g}s",
+        assets_dir=media["assets"],
+        output_dir=output_dir,
+    )
+    targets = [
+        (StubOpenAIClient, "generate_script", "script"),
+        (StubOpenAIClient, "synthesize_voice", "tts"),
+        (MediaFactory, "build_broll_clip", "build_broll"),
+        (MediaFactory, "mix_audio", "mix_audio"),
+        (MediaFactory, "burn_subtitles", "burn_subtitles"),
+        (generator, "mux_audio", "mux_audio"),
+    ]
+    with ExitStack() as stack:
+        stack.enter_context(isolated_outputs(output_dir))
+        stack.enter_context(replaced(generator, "OpenAIShortsClient", StubOpenAIClient))
+        stack.enter_context(timer.patched(targets))
+        with timer.measure("generate_short"):
+            generator.generate_short(options)
+    return int(case.duration * FPS)
+
+
+RUNNERS = {"subtitles": _run_subtitles, "render": _run_render, "generate": _run_generate}
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextmanager
+def isolated_caches(work_dir: Path) -> Iterator[None]:
+    """Point every cache at ``work_dir`` for one case, restoring the environment afterwards.
+
+    Modules imported before the case (``--no-isolate`` runs) read their cache
+    directory at import, so their constants and in-memory caches are reset too.
+    """
+    saved_env = {name: os.environ.get(name) for name, _, _ in CACHE_DIRS}
+    restore: List[Callable[[], None]] = []
+    try:
+        for name, module_name, attr in CACHE_DIRS:
+            path = work_dir / f".{module_name}"
+            os.environ[name] = str(path)
+            module = sys.modules.get(f"ai_shorts_maker.{module_name}")
+            if module is not None:
+                previous = getattr(module, attr)
+                setattr(module, attr, path)
+                restore.append(lambda module=module, attr=attr, previous=previous: setattr(module, attr, previous))
+        text_render = sys.modules.get("ai_shorts_maker.text_render")
+        if text_render is not None:
+            text_render._memory_cache.clear()
+        response_cache = sys.modules.get("ai_shorts_maker.response_cache")
+        if response_cache is not None:
+            shared = response_cache.response_cache
+            previous_dir = shared.directory
+            shared.directory, shared._conn = work_dir / ".response_cache", None
+            restore.append(lambda: setattr(shared, "directory", previous_dir) or setattr(shared, "_conn", None))
+        yield
+    finally:
+        for undo in reversed(restore):
+            undo()
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_case(case: Case, media: Dict[str, str]) -> Dict[str, Any]:
+    """Run one case (normally in a fresh worker process) and return its measurements."""
+    paths = {key: Path(value) for key, value in media.items()}
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory(prefix="shorts-bench-case-") as tmp:
+        work_dir = Path(tmp)
+        with isolated_caches(work_dir):
+            start = time.perf_counter()
+            error = None
+            try:
+                frames = RUNNERS[case.suite](case, paths, work_dir, timer)
+            except Exception as exc:  # pylint: disable=broad-except
+                frames, error = 0, f"{type(exc).__name__}: {exc}"
+            wall = time.perf_counter() - start
+    return {
+        "case": case.name,
+        **asdict(case),
+        "frames": frames,
+        "wall_s": round(wall, 3),
+        "fps": round(frames / wall, 2) if frames and wall else None,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_child_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "stages": timer.rounded(),
+        "error": error,
+    }
+
+
+def build_cases(
+    suites: Sequence[str],
+    durations: Sequence[float],
+    *,
+    animations: Sequence[str] = ANIMATIONS,
+    templates: Sequence[str] = TEMPLATES,
+    overlays: Sequence[int] = OVERLAY_COUNTS,
+    engines: Sequence[str] = ("moviepy",),
+) -> List[Case]:
+    cases: List[Case] = []
+    for duration in durations:
+        if "subtitles" in suites:
+            for template in templates:
+                for animation in animations:
+                    cases.append(Case("subtitles", duration, {"animation": animation, "template": template}))
+        if "render" in suites:
+            for engine in engines:
+                for count in overlays:
+                    cases.append(Case("render", duration, {"overlays": count, "engine": engine}))
+        if "generate" in suites:
+            cases.append(Case("generate", duration))
+    return cases
+
+
+def prepare_media(work_dir: Path, duration: float) -> Dict[str, str]:
+    """Generate the shared inputs once; clips loop when a case is longer."""
+    assets = work_dir / "assets"
+    (assets / "broll").mkdir(parents=True, exist_ok=True)
+    (assets / "music").mkdir(parents=True, exist_ok=True)
+    length = max(duration, 1.0)
+    video = make_video(assets / "broll" / "noise.mp4", CANVAS, duration=length, fps=30, audio=False, pattern="noise")
+    make_video(assets / "broll" / "color.mp4", (1920, 1080), duration=length, fps=30, audio=False, pattern="color")
+    return {
+        "assets": str(assets),
+        "video": str(video),
+        "overlay": str(make_gradient(work_dir / "overlay.png", (640, 640), alpha=True, seed=1)),
+        "voice": str(make_tone(work_dir / "voice.wav", duration=length, frequency=180.0)),
+        "music": str(make_tone(assets / "music" / "music.wav", duration=length, frequency=440.0)),
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        ).stdout.decode().strip() or None
+    except OSError:
+        revision = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_revision": revision,
+        "canvas": list(CANVAS),
+        "fps": FPS,
+    }
+
+
+def run(cases: Sequence[Case], *, isolate: bool = True) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="shorts-bench-") as tmp:
+        media = prepare_media(Path(tmp), max((case.duration for case in cases), default=1.0))
+        for case in cases:
+            if isolate:
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(run_case, case, media).result()
+            else:
+                result = run_case(case, media)
+            results.append(result)
+            print(_format_row(result), file=sys.stderr)
+    return {"environment": _environment(), "results": results}
+
+
+def _format_row(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    fps = result["fps"]
+    row = f"{result['case']:<56}{result['wall_s']:>9.2f}s{(fps or 0):>9.1f} fps{result['peak_rss_mb']:>9.0f} MB"
+    if result["error"]:
+        row += f"  ERROR {result['error']}"
+    elif baseline and baseline.get("fps") and fps:
+        row += f"  x{fps / baseline['fps']:.2f}"
+    return row
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    previous = {row["case"]: row for row in baseline.get("results", [])}
+    return [_format_row(row, previous.get(row["case"])) for row in current["results"]]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=SUITES, help="Suite to run (repeatable; default all)")
+    parser.add_argument("--durations", type=float, nargs="+", default=list(DURATIONS))
+    parser.add_argument("--animations", nargs="+", default=list(ANIMATIONS))
+    parser.add_argument("--templates", nargs="+", choices=TEMPLATES, default=list(TEMPLATES))
+    parser.add_argument("--overlays", type=int, nargs="+", default=list(OVERLAY_COUNTS))
+    parser.add_argument("--engines", nargs="+", choices=("moviepy", "ffmpeg"), default=["moviepy"])
+    parser.add_argument("--output", type=Path, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare fps against")
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="Run cases in this process (faster; peak RSS and in-process caches are shared)",
+    )
+    args = parser.parse_args(argv)
+
+    cases = build_cases(
+        args.suite or SUITES,
+        args.durations,
+        animations=args.animations,
+        templates=args.templates,
+        overlays=args.overlays,
+        engines=args.engines,
+    )
+    report = run(cases, isolate=not args.no_isolate)
+    if args.baseline:
+        for line in compare(report, json.loads(args.baseline.read_text(encoding="utf-8"))):
+            print(line, file=sys.stderr)
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
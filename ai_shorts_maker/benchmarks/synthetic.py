@@ -0,0 +1,106 @@
+"""Synthetic media for benchmarks, generated with ffmpeg's lavfi sources."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from ..ffmpeg_tools import run_ffmpeg
+from ..subtitles import CaptionLine
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional at import time
+    Image = None  # type: ignore
+
+# lavfi sources by pattern name; ``noise`` is the worst case for the encoder.
+VIDEO_PATTERNS = {
+    "testsrc": "testsrc2=size={w}x{h}:rate={fps}:duration={duration}",
+    "color": "color=c=0x3050a0:size={w}x{h}:rate={fps}:duration={duration}",
+    "noise": "color=c=gray:size={w}x{h}:rate={fps}:duration={duration},noise=alls=60:allf=t+u",
+}
+
+CAPTION_TEXTS = (
+    "오늘은 아무도 몰랐던 이야기를 들려드릴게요.",
+    "그날 밤, 창밖에서 이상한 소리가 들렸습니다.",
+    "This is where everything started to change.",
+    "믿기 어렵겠지만 모두 실제로 있었던 일입니다.",
+    "끝까지 보시면 반전이 기다리고 있어요!",
+    "Numbers don't lie: 3 out of 4 people missed it.",
+)
+
+
+def make_video(
+    path: Path,
+    size: Tuple[int, int],
+    *,
+    duration: float = 5.0,
+    fps: int = 30,
+    audio: bool = True,
+    pattern: str = "testsrc",
+) -> Path:
+    """Write an H.264 clip of ``pattern`` (with a sine soundtrack unless ``audio`` is False)."""
+    width, height = size
+    source = VIDEO_PATTERNS[pattern].format(w=width, h=height, fps=fps, duration=duration)
+    args = ["-f", "lavfi", "-i", source]
+    if audio:
+        args.extend(["-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={duration}"])
+    args.extend(["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"])
+    if audio:
+        args.extend(["-c:a", "aac", "-shortest"])
+    args.append(str(path))
+    run_ffmpeg(args)
+    return path
+
+
+def make_image(path: Path, size: Tuple[int, int]) -> Path:
+    width, height = size
+    run_ffmpeg(["-f", "lavfi", "-i", f"testsrc2=size={width}x{height}", "-frames:v", "1", "-q:v", "3", str(path)])
+    return path
+
+
+def make_gradient(path: Path, size: Tuple[int, int], *, alpha: bool = False, seed: int = 0) -> Path:
+    """Write a diagonal two-colour gradient; with ``alpha`` a PNG that fades out towards one corner."""
+    if Image is None:
+        raise RuntimeError("Pillow is required to write gradient images")
+    width, height = size
+    rng = np.random.default_rng(seed)
+    start, end = rng.integers(0, 256, size=(2, 3))
+    ramp = (np.linspace(0.0, 1.0, width)[None, :] + np.linspace(0.0, 1.0, height)[:, None]) / 2.0
+    rgb = start[None, None, :] + (end - start)[None, None, :] * ramp[:, :, None]
+    channels = [rgb]
+    if alpha:
+        channels.append((255.0 * (1.0 - ramp))[:, :, None])
+    array = np.concatenate(channels, axis=2).round().astype(np.uint8)
+    Image.fromarray(array).save(path)
+    return path
+
+
+def make_tone(path: Path, *, duration: float, frequency: float = 220.0, sample_rate: int = 48000) -> Path:
+    """Write a sine tone; the container (wav, mp3, ...) follows ``path``'s suffix."""
+    run_ffmpeg(
+        [
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency={frequency}:sample_rate={sample_rate}:duration={duration}",
+            "-ac",
+            "1",
+            str(path),
+        ]
+    )
+    return path
+
+
+def fake_captions(duration: float, *, seconds_per_caption: float = 2.5) -> List[CaptionLine]:
+    """Back-to-back captions covering ``duration`` with mixed Korean/English text."""
+    captions: List[CaptionLine] = []
+    start = 0.0
+    index = 0
+    while start < duration - 1e-6:
+        end = min(start + seconds_per_caption, duration)
+        captions.append(CaptionLine(start=start, end=end, text=CAPTION_TEXTS[index % len(CAPTION_TEXTS)]))
+        start = end
+        index += 1
+    return captions
@@ -0,0 +1,253 @@
+"""Persistent ffprobe index of the b-roll library.
+
+Selecting b-roll used to open every candidate with ``VideoFileClip`` just to
+learn its duration. The index stores duration, resolution, fps, codec,
+rotation and a content hash per file in ``outputs/.broll_index/`` (one JSON
+file per library directory), keyed by name and validated by size and mtime.
+A refresh only stats the directory and re-probes files that are new or
+changed, so planning a background is a dictionary lookup and only the clips
+actually used are opened. The index is kept outside the library because
+writing it there would change the directory mtime the refresh shortcut
+relies on.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .ffmpeg_tools import probe_media
+from .fingerprint import file_digest, hash_payload
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the stored fields change so stale indexes are rebuilt.
+INDEX_VERSION = 1
+INDEX_DIR = Path(
+    os.getenv("SHORTS_BROLL_INDEX_DIR", Path(__file__).resolve().parent / "outputs" / ".broll_index")
+).expanduser()
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".webm"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+IMAGE_DURATION = 6.0
+
+_indexes: Dict[str, "BrollIndex"] = {}
+_indexes_guard = threading.Lock()
+
+
+@dataclass
+class BrollEntry:
+    name: str
+    kind: str  # "video" or "image"
+    size: int
+    mtime_ns: int
+    duration: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    codec: Optional[str] = None
+    rotation: int = 0
+    digest: Optional[str] = None
+
+    @property
+    def usable_duration(self) -> Optional[float]:
+        """Seconds this asset can cover in a background, ``None`` when unknown."""
+        if self.kind == "image":
+            return IMAGE_DURATION
+        if self.duration and self.duration > 0:
+            return self.duration
+        return None
+
+    @property
+    def display_size(self) -> Optional[Tuple[int, int]]:
+        if not self.width or not self.height:
+            return None
+        if self.rotation % 180:
+            return self.height, self.width
+        return self.width, self.height
+
+
+def _parse_rate(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        num, _, den = value.partition("/")
+        rate = float(num) / float(den or 1)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    return rate if rate > 0 else None
+
+
+def _stream_rotation(stream: dict) -> int:
+    rotate = stream.get("tags", {}).get("rotate")
+    if rotate is None:
+        for side_data in stream.get("side_data_list", []) or []:
+            if "rotation" in side_data:
+                rotate = side_data["rotation"]
+                break
+    try:
+        return int(float(rotate or 0)) % 360
+    except (TypeError, ValueError):
+        return 0
+
+
+def probe_entry(path: Path, stat: os.stat_result) -> BrollEntry:
+    """Describe one asset with ffprobe; probe failures yield an entry without duration."""
+    kind = "image" if path.suffix.lower() in IMAGE_EXTENSIONS else "video"
+    entry = BrollEntry(name=path.name, kind=kind, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    try:
+        info = probe_media(path)
+    except (RuntimeError, OSError, ValueError) as exc:
+        logger.warning("Could not probe b-roll asset %s: %s", path.name, exc)
+        return entry
+
+    stream = next((s for s in info.get("streams", []) if s.get("codec_type") == "video"), None)
+    if stream is not None:
+        entry.width = stream.get("width")
+        entry.height = stream.get("height")
+        entry.codec = stream.get("codec_name")
+        entry.rotation = _stream_rotation(stream)
+        if kind == "video":
+            entry.fps = _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate"))
+    if kind == "video":
+        for source in (info.get("format", {}), stream or {}):
+            try:
+                entry.duration = float(source.get("duration"))
+                break
+            except (TypeError, ValueError):
+                continue
+    entry.digest = file_digest(path)
+    return entry
+
+
+class BrollIndex:
+    """Metadata of every supported file in one b-roll directory."""
+
+    def __init__(self, directory: Path, index_path: Optional[Path] = None) -> None:
+        self.directory = directory
+        self.index_path = index_path or index_path_for(directory)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, BrollEntry] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        known = {field.name for field in fields(BrollEntry)}
+        for raw in data.get("entries", []):
+            try:
+                entry = BrollEntry(**{key: value for key, value in raw.items() if key in known})
+            except TypeError:
+                continue
+            self._entries[entry.name] = entry
+        self._dir_mtime_ns = data.get("dir_mtime_ns")
+
+    def _save(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "dir_mtime_ns": self._dir_mtime_ns,
+            "entries": [asdict(entry) for entry in sorted(self._entries.values(), key=lambda e: e.name)],
+        }
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+        except OSError as exc:
+            logger.debug("Could not persist b-roll index %s: %s", self.index_path, exc)
+            tmp_path.unlink(missing_ok=True)
+
+    def refresh(self, *, force: bool = False) -> List[BrollEntry]:
+        """Bring the index up to date and return its entries sorted by name.
+
+        Unless ``force`` is set, the directory is only rescanned when its own
+        mtime changed (files added, removed or renamed); files replaced in
+        place are picked up by a forced refresh.
+        """
+        with self._lock:
+            try:
+                dir_mtime_ns = self.directory.stat().st_mtime_ns
+            except OSError:
+                self._entries.clear()
+                return []
+            if force or dir_mtime_ns != self._dir_mtime_ns:
+                self._rescan(dir_mtime_ns)
+            return sorted(self._entries.values(), key=lambda entry: entry.name)
+
+    def _rescan(self, dir_mtime_ns: int) -> None:
+        seen: Dict[str, BrollEntry] = {}
+        probed = 0
+        with os.scandir(self.directory) as listing:
+            for item in listing:
+                suffix = os.path.splitext(item.name)[1].lower()
+                if suffix not in VIDEO_EXTENSIONS | IMAGE_EXTENSIONS or not item.is_file():
+                    continue
+                stat = item.stat()
+                entry = self._entries.get(item.name)
+                if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+                    entry = probe_entry(Path(item.path), stat)
+                    probed += 1
+                seen[item.name] = entry
+        removed = len(set(self._entries) - set(seen))
+        changed = probed or removed or dir_mtime_ns != self._dir_mtime_ns
+        self._entries = seen
+        self._dir_mtime_ns = dir_mtime_ns
+        if probed or removed:
+            logger.info("B-roll index: probed %d, removed %d, %d assets", probed, removed, len(seen))
+        if changed:
+            self._save()
+
+    def path_for(self, entry: BrollEntry) -> Path:
+        return self.directory / entry.name
+
+
+def index_path_for(directory: Path) -> Path:
+    resolved = directory.resolve()
+    return INDEX_DIR / f"{resolved.name}-{hash_payload(str(resolved))[:16]}.json"
+
+
+def get_index(directory: Path) -> BrollIndex:
+    """Return the process-wide index for ``directory``."""
+    key = str(directory.resolve())
+    with _indexes_guard:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = BrollIndex(directory)
+    return index
+
+
+def plan_broll(
+    entries: Sequence[BrollEntry],
+    duration: float,
+    *,
+    seed: Optional[int] = None,
+) -> List[Tuple[BrollEntry, float]]:
+    """Shuffle ``entries`` and pick just enough of them to cover ``duration``.
+
+    Returns ``(entry, seconds)`` pairs; the last pair may be shorter than the
+    asset. When the library is too short the caller loops the last clip.
+    """
+    candidates = [entry for entry in entries if entry.usable_duration]
+    if seed is None:
+        random.shuffle(candidates)
+    else:
+        candidates.sort(key=lambda entry: entry.name)
+        random.Random(seed).shuffle(candidates)
+    plan: List[Tuple[BrollEntry, float]] = []
+    remaining = duration
+    for entry in candidates:
+        if remaining <= 0:
+            break
+        take = min(entry.usable_duration, remaining)
+        plan.append((entry, take))
+        remaining -= take
+    return plan
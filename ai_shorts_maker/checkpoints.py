@@ -0,0 +1,141 @@
+"""Per-run stage checkpoints for ``generate_short``.
+
+Every generation gets a work directory ``outputs/.runs/<run_id>`` (the run id
+is the output name) holding each stage's artifact - script text, sentence
+list, caption timings, b-roll plan - and a ``run.json`` manifest that
+records, per stage, a hash of the stage's inputs and the artifacts it
+produced; the narration and video are recorded where they were written in
+the output directory rather than copied. Resuming a run
+(``GenerationOptions.resume``) reuses a stage when its recorded input hash
+matches and its artifacts still exist, so a failed encode no longer costs a
+new script and TTS call (and a different script). Work directories untouched
+for ``SHORTS_RUN_TTL_DAYS`` are removed when a new run starts.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .fingerprint import hash_payload
+
+logger = logging.getLogger(__name__)
+
+RUNS_DIRNAME = ".runs"
+MANIFEST_FILENAME = "run.json"
+RUN_TTL_SECONDS = float(os.getenv("SHORTS_RUN_TTL_DAYS", "30")) * 86400
+
+
+def run_dir(output_dir: Path, run_id: str) -> Path:
+    return output_dir / RUNS_DIRNAME / run_id
+
+
+def stage_key(*inputs: Any) -> str:
+    """Hash of a stage's inputs; a stage is reused only while this stays the same."""
+    return hash_payload(list(inputs))
+
+
+class RunCheckpoint:
+    """The work directory and manifest of one generation run."""
+
+    def __init__(self, work_dir: Path, data: Dict[str, Any]) -> None:
+        self.work_dir = work_dir
+        self.data = data
+        self.data.setdefault("stages", {})
+
+    @classmethod
+    def create(cls, output_dir: Path, run_id: str, options: Any = None) -> "RunCheckpoint":
+        prune_runs(output_dir)
+        work_dir = run_dir(output_dir, run_id)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = cls(work_dir, {"run_id": run_id, "created_at": _now(), "stages": {}})
+        if options is not None:
+            checkpoint.data["options"] = asdict(options)
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, output_dir: Path, run_id: str) -> "RunCheckpoint":
+        work_dir = run_dir(output_dir, run_id)
+        manifest = work_dir / MANIFEST_FILENAME
+        if not manifest.exists():
+            raise FileNotFoundError(f"No checkpointed run {run_id!r} in {output_dir / RUNS_DIRNAME}")
+        return cls(work_dir, json.loads(manifest.read_text(encoding="utf-8")))
+
+    @property
+    def run_id(self) -> str:
+        return self.data["run_id"]
+
+    def path(self, name: str) -> Path:
+        return self.work_dir / name
+
+    def cached(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stage's record when it completed with ``key`` and its artifacts exist."""
+        record = self.data["stages"].get(stage)
+        if not record or record.get("key") != key:
+            return None
+        if not all(self.path(name).exists() for name in record.get("artifacts", [])):
+            logger.info("Checkpoint %s/%s is missing artifacts; running it again", self.run_id, stage)
+            return None
+        logger.info("Reusing checkpointed stage %s of run %s", stage, self.run_id)
+        return record
+
+    def complete(self, stage: str, key: str, artifacts: Iterable[str] = (), **values: Any) -> None:
+        self.data["stages"][stage] = {
+            "key": key,
+            "artifacts": list(artifacts),
+            "completed_at": _now(),
+            **values,
+        }
+        self.save()
+
+    def save(self) -> None:
+        self.data["updated_at"] = _now()
+        manifest = self.path(MANIFEST_FILENAME)
+        tmp_path = manifest.with_name(f"{manifest.name}.tmp")
+        tmp_path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, manifest)
+
+
+def prune_runs(output_dir: Path, max_age: float = RUN_TTL_SECONDS) -> int:
+    """Remove run work directories whose manifest has not changed for ``max_age`` seconds."""
+    runs = output_dir / RUNS_DIRNAME
+    if not runs.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for work_dir in runs.iterdir():
+        try:
+            if (work_dir / MANIFEST_FILENAME).stat().st_mtime >= cutoff:
+                continue
+        except OSError:
+            # No manifest: a run still being created, or not a run at all.
+            continue
+        shutil.rmtree(work_dir, ignore_errors=True)
+        removed += 1
+    if removed:
+        logger.info("Removed %d stale run directories from %s", removed, runs)
+    return removed
+
+
+def load_run_options(output_dir: Path, run_id: str, options_cls: type) -> Any:
+    """Rebuild the ``GenerationOptions`` a run was started with (for ``--resume`` alone)."""
+    stored = RunCheckpoint.load(output_dir, run_id).data.get("options")
+    if not stored:
+        raise RuntimeError(f"Run {run_id!r} did not record its options; pass them again")
+    known = {item.name for item in fields(options_cls)}
+    values = {name: value for name, value in stored.items() if name in known}
+    for name in ("assets_dir", "output_dir"):
+        if values.get(name):
+            values[name] = Path(values[name])
+    return options_cls(**values)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat(timespec="seconds")
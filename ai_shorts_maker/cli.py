@@ -4,17 +4,21 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 
-from .generator import GenerationOptions, generate_short
+from .batch import BATCH_CONCURRENCY, BATCH_RENDER_WORKERS, run_batch
+from .checkpoints import load_run_options
+from .generator import TTS_MODES, GenerationOptions, generate_short
+from .sentence_tts import SENTENCE_GAP, TTS_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="AI-powered Shorts video generator")
-    parser.add_argument("--topic", required=True, help="Short-form video topic")
+    parser.add_argument("--topic", help="Short-form video topic (required unless --batch or --resume is given)")
     parser.add_argument("--style", default="정보/요약", help="Tone or niche style for the script")
     parser.add_argument("--duration", type=int, default=30, help="Target duration in seconds")
     parser.add_argument("--lang", default="ko", help="Language code (ko/en etc)")
@@ -40,9 +44,68 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--dry-run", action="store_true", help="Generate script + subtitles only")
     parser.add_argument("--script-model", default="gpt-4o-mini", help="OpenAI model for script generation")
     parser.add_argument("--tts-model", default="gpt-4o-mini-tts", help="OpenAI TTS model")
+    parser.add_argument(
+        "--tts-mode",
+        choices=list(TTS_MODES),
+        default="script",
+        help="'sentence' synthesizes each sentence concurrently and times captions from the real durations",
+    )
+    parser.add_argument(
+        "--sentence-gap",
+        type=float,
+        default=SENTENCE_GAP,
+        help="Silence in seconds between sentences with --tts-mode sentence",
+    )
+    parser.add_argument(
+        "--tts-concurrency",
+        type=int,
+        default=TTS_CONCURRENCY,
+        help="Concurrent TTS requests with --tts-mode sentence",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Prepare b-roll and music while the script and narration are generated (same output)",
+    )
     parser.add_argument("--output", help="Custom output filename (without extension)")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Render the video in N parallel time shards (joined without re-encoding)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an earlier run (its output name), reusing completed stages whose inputs are unchanged",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="JSONL file with one set of option overrides per line; generates every line",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help="Batch mode: scripts/narrations requested at the same time",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=BATCH_RENDER_WORKERS,
+        help="Batch mode: renderer processes",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Batch mode: progress manifest (default: <batch>.manifest.json next to the batch file)",
+    )
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if not args.topic and not args.batch and not args.resume:
+        parser.error("--topic is required unless --batch or --resume is given")
+    return args
 
 
 def configure_logging(level: str) -> None:
@@ -52,13 +115,9 @@ def configure_logging(level: str) -> None:
     )
 
 
-def run_generation(args: argparse.Namespace) -> dict:
-    load_dotenv()
-
-    configure_logging(args.log_level)
-
-    options = GenerationOptions(
-        topic=args.topic,
+def build_options(args: argparse.Namespace) -> GenerationOptions:
+    return GenerationOptions(
+        topic=args.topic or "",
         style=args.style,
         duration=args.duration,
         lang=args.lang,
@@ -73,15 +132,48 @@ def run_generation(args: argparse.Namespace) -> dict:
         script_model=args.script_model,
         tts_model=args.tts_model,
         output_name=args.output,
+        shards=max(args.shards, 1),
+        tts_mode=args.tts_mode,
+        sentence_gap=max(args.sentence_gap, 0.0),
+        tts_concurrency=max(args.tts_concurrency, 1),
+        pipelined=args.pipelined,
     )
 
+
+def run_generation(args: argparse.Namespace) -> dict:
+    load_dotenv()
+
+    configure_logging(args.log_level)
+
+    options = build_options(args)
+    if args.resume and not args.topic:
+        # Without a topic the run is resumed with the options it was started with.
+        options = load_run_options(options.output_dir, args.resume, GenerationOptions)
+    options.resume = args.resume
     return generate_short(options)
 
 
+def run_batch_generation(args: argparse.Namespace) -> dict:
+    load_dotenv()
+
+    configure_logging(args.log_level)
+
+    return run_batch(
+        args.batch,
+        build_options(args),
+        concurrency=args.concurrency,
+        render_workers=args.render_workers,
+        manifest_path=args.manifest,
+    )
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = argv if argv is not None else sys.argv[1:]
     args = parse_args(argv)
     try:
+        if args.batch:
+            manifest = run_batch_generation(args)
+            return 1 if manifest.get("summary", {}).get("failed") else 0
         run_generation(args)
     except Exception as exc:  # pylint: disable=broad-except
         logger.exception("Generation failed: %s", exc)
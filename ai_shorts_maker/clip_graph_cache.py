@@ -0,0 +1,84 @@
+"""In-memory cache of assembled MoviePy clip graphs for interactive frame previews.
+
+Building a project's visual track (opening media, rasterizing captions,
+compositing) dominates the cost of showing a single frame. Graphs are kept per
+``(base_name, scale)`` and stamped with the project version they were built
+from; a different stamp or an explicit :meth:`ClipGraphCache.invalidate` from
+``services._touch`` rebuilds them. Each graph has its own lock because MoviePy
+readers are not safe to seek from two threads at once.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClipGraph:
+    stamp: Hashable
+    clip: Any
+    cleanup: Callable[[], None]
+    duration: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    closed: bool = False
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            try:
+                self.cleanup()
+            except Exception:
+                logger.debug("Could not close cached clip graph", exc_info=True)
+
+
+class ClipGraphCache:
+    """LRU of built clip graphs keyed by ``(base_name, ...)`` tuples."""
+
+    def __init__(self, max_entries: int = 4) -> None:
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[Tuple[Any, ...], ClipGraph]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: dict[Tuple[Any, ...], threading.Lock] = {}
+
+    def get(
+        self,
+        key: Tuple[Any, ...],
+        stamp: Hashable,
+        build: Callable[[], Tuple[Any, Callable[[], None], float]],
+    ) -> ClipGraph:
+        """Return the graph for ``key`` built at ``stamp``, building it with ``build()`` if needed."""
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            with self._lock:
+                graph = self._entries.get(key)
+                if graph is not None and graph.stamp == stamp:
+                    self._entries.move_to_end(key)
+                    return graph
+            clip, cleanup, duration = build()
+            fresh = ClipGraph(stamp=stamp, clip=clip, cleanup=cleanup, duration=duration)
+            stale = []
+            with self._lock:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    stale.append(previous)
+                self._entries[key] = fresh
+                while len(self._entries) > self.max_entries:
+                    stale.append(self._entries.popitem(last=False)[1])
+            for graph in stale:
+                graph.close()
+            return fresh
+
+    def invalidate(self, base_name: Optional[str] = None) -> int:
+        """Drop every graph of ``base_name`` (or all graphs) and release their readers."""
+        with self._lock:
+            keys = [key for key in self._entries if base_name is None or key[0] == base_name]
+            stale = [self._entries.pop(key) for key in keys]
+        for graph in stale:
+            graph.close()
+        return len(stale)
@@ -0,0 +1,360 @@
+"""Compile a project timeline into a single ffmpeg ``filter_complex`` render.
+
+The MoviePy renderer in :mod:`ai_shorts_maker.services` pulls every frame
+through Python. This module expresses the same timeline (base segments, gap
+fillers, overlays with enable windows, Ken Burns motion via ``zoompan``,
+the pre-mixed soundtrack) as one ffmpeg invocation. Anything the compiler
+cannot express raises :class:`FilterGraphUnsupported` so callers can fall back
+to the MoviePy path.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from .ffmpeg_tools import run_ffmpeg
+from .jobs import ffmpeg_progress
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".webm"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# zoompan rounds the crop window to whole pixels; oversampling the still
+# image first keeps slow Ken Burns moves from visibly stepping.
+ZOOMPAN_OVERSAMPLE = 2
+
+
+class FilterGraphUnsupported(RuntimeError):
+    """Raised when a project uses a feature the filtergraph compiler cannot express."""
+
+
+@dataclass
+class GraphSource:
+    """A visual timeline entry resolved to a concrete input."""
+
+    kind: str  # "video", "image" or "color"
+    start: float
+    end: float
+    path: Optional[Path] = None
+    color: tuple[int, int, int] = (15, 15, 20)
+    motion: Any = None  # services.SegmentMotion
+
+    @property
+    def duration(self) -> float:
+        return max(self.end - self.start, 0.1)
+
+
+@dataclass
+class FilterGraph:
+    inputs: List[List[str]] = field(default_factory=list)
+    chains: List[str] = field(default_factory=list)
+    video_label: str = ""
+    audio_label: Optional[str] = None
+    duration: float = 0.0
+
+    def add_input(self, args: Sequence[str]) -> int:
+        self.inputs.append(list(args))
+        return len(self.inputs) - 1
+
+    def command(
+        self,
+        output_path: Path,
+        *,
+        fps: int,
+        threads: Optional[int] = None,
+        preset: str = "medium",
+        crf: Optional[int] = None,
+        extra_output_args: Sequence[str] = (),
+    ) -> List[str]:
+        args: List[str] = []
+        for input_args in self.inputs:
+            args.extend(input_args)
+        args.extend(["-filter_complex", ";".join(self.chains)])
+        args.extend(["-map", f"[{self.video_label}]"])
+        if self.audio_label:
+            args.extend(["-map", f"[{self.audio_label}]", "-c:a", "aac"])
+        args.extend(["-c:v", "libx264", "-preset", preset, "-pix_fmt", "yuv420p", "-r", str(fps)])
+        if crf is not None:
+            args.extend(["-crf", str(crf)])
+        if threads:
+            args.extend(["-threads", str(threads)])
+        args.extend(["-t", f"{self.duration:.3f}", "-movflags", "+faststart"])
+        args.extend(extra_output_args)
+        args.append(str(output_path))
+        return args
+
+
+def _fmt(value: float) -> str:
+    return f"{float(value):.4f}".rstrip("0").rstrip(".") or "0"
+
+
+def _cover_filter(canvas_size: tuple[int, int]) -> str:
+    """Mirror ``media._resize_clip``: upscale to cover the canvas (never shrink), then centre-crop."""
+    width, height = canvas_size
+    factor = f"max(max({width}/iw,{height}/ih),1)"
+    return f"scale=w='ceil(iw*{factor})':h='ceil(ih*{factor})',crop={width}:{height}"
+
+
+def _position_expr(value: Any, axis: str) -> str:
+    size_var, canvas_var = ("w", "W") if axis == "x" else ("h", "H")
+    if isinstance(value, (int, float)):
+        return _fmt(value)
+    if value == "center":
+        return f"({canvas_var}-{size_var})/2"
+    if value in {"left", "top"}:
+        return "0"
+    if value in {"right", "bottom"}:
+        return f"{canvas_var}-{size_var}"
+    raise FilterGraphUnsupported(f"Unsupported overlay position {value!r}")
+
+
+def _overlay_xy(motion, start: float) -> tuple[str, str]:
+    pos_start = motion.pos_start
+    if isinstance(pos_start, str):
+        return _position_expr(pos_start, "x"), _position_expr(pos_start, "y")
+    if not isinstance(pos_start, tuple) or len(pos_start) != 2:
+        raise FilterGraphUnsupported(f"Unsupported overlay position {pos_start!r}")
+    if not motion.position_animated:
+        return _position_expr(pos_start[0], "x"), _position_expr(pos_start[1], "y")
+    pos_end = motion.pos_end
+    ratio = f"clip((t-{_fmt(start)})/{_fmt(motion.duration)},0,1)"
+    x = f"{_fmt(pos_start[0])}+({_fmt(pos_end[0] - pos_start[0])})*{ratio}"
+    y = f"{_fmt(pos_start[1])}+({_fmt(pos_end[1] - pos_start[1])})*{ratio}"
+    return x, y
+
+
+def _is_identity_motion(motion) -> bool:
+    if motion is None:
+        return True
+    if motion.apply_scale and (abs(motion.scale_start - 1.0) > 1e-3 or motion.scale_animated):
+        return False
+    if motion.alpha is not None and motion.alpha < 1.0:
+        return False
+    pos = motion.pos_start
+    if motion.position_animated:
+        return False
+    return pos in {None, "center"} or (isinstance(pos, tuple) and all(v == 0 for v in pos))
+
+
+def _zoompan_chain(source: GraphSource, canvas_size: tuple[int, int], fps: int) -> str:
+    width, height = canvas_size
+    motion = source.motion
+    frames = max(int(round(source.duration * fps)), 1)
+    k = ZOOMPAN_OVERSAMPLE
+    start_center = motion.center_start or (0.0, 0.0)
+    end_center = motion.center_end or start_center
+    ratio = f"min(on/{frames},1)"
+    zoom = f"{_fmt(max(motion.scale_start, 1.0))}+({_fmt(motion.scale_end - motion.scale_start)})*{ratio}"
+    cx = f"({_fmt(start_center[0])}+({_fmt(end_center[0] - start_center[0])})*{ratio})"
+    cy = f"({_fmt(start_center[1])}+({_fmt(end_center[1] - start_center[1])})*{ratio})"
+    x = f"{k}*({width}*(zoom-1)/2-{cx})/zoom"
+    y = f"{k}*({height}*(zoom-1)/2-{cy})/zoom"
+    return (
+        f"{_cover_filter(canvas_size)},scale={width * k}:{height * k},"
+        f"zoompan=z='{zoom}':x='{x}':y='{y}':d={frames}:s={width}x{height}:fps={fps}"
+    )
+
+
+def _source_input(graph: FilterGraph, source: GraphSource, fps: int, *, single_frame: bool = False) -> int:
+    if source.kind == "video":
+        return graph.add_input(["-stream_loop", "-1", "-i", str(source.path)])
+    if single_frame:
+        return graph.add_input(["-i", str(source.path)])
+    return graph.add_input(
+        ["-loop", "1", "-framerate", str(fps), "-t", _fmt(source.duration), "-i", str(source.path)]
+    )
+
+
+def _base_chain(graph: FilterGraph, source: GraphSource, label: str, canvas_size: tuple[int, int], fps: int) -> None:
+    width, height = canvas_size
+    duration = _fmt(source.duration)
+    if not _is_identity_motion(source.motion):
+        raise FilterGraphUnsupported("Base segments with scale/position/alpha effects")
+    if source.kind == "color":
+        r, g, b = source.color
+        graph.chains.append(
+            f"color=c=0x{r:02x}{g:02x}{b:02x}:s={width}x{height}:r={fps}:d={duration},"
+            f"format=yuv420p,setsar=1[{label}]"
+        )
+        return
+    index = _source_input(graph, source, fps)
+    graph.chains.append(
+        f"[{index}:v]fps={fps},trim=duration={duration},setpts=PTS-STARTPTS,"
+        f"{_cover_filter(canvas_size)},format=yuv420p,setsar=1[{label}]"
+    )
+
+
+def _overlay_chain(
+    graph: FilterGraph,
+    source: GraphSource,
+    label: str,
+    canvas_size: tuple[int, int],
+    fps: int,
+) -> tuple[str, str]:
+    motion = source.motion
+    offset = f"setpts=PTS-STARTPTS+{_fmt(source.start)}/TB"
+    if source.kind == "color":
+        raise FilterGraphUnsupported("Colour overlays")
+
+    if source.kind == "image" and motion is not None and motion.use_auto:
+        index = _source_input(graph, source, fps, single_frame=True)
+        filters = [_zoompan_chain(source, canvas_size, fps)]
+        xy = ("0", "0")
+    else:
+        if motion is not None and motion.scale_animated:
+            raise FilterGraphUnsupported("Animated scale on overlays without auto motion")
+        index = _source_input(graph, source, fps)
+        filters = [f"fps={fps}", f"trim=duration={_fmt(source.duration)}", _cover_filter(canvas_size)]
+        if motion is not None and motion.apply_scale and abs(motion.scale_start - 1.0) > 1e-3:
+            scale = _fmt(max(motion.scale_start, 1.0))
+            filters.append(f"scale=w='ceil(iw*{scale})':h='ceil(ih*{scale})'")
+        xy = _overlay_xy(motion, source.start) if motion is not None else ("(W-w)/2", "(H-h)/2")
+
+    filters.append("format=rgba")
+    if motion is not None and motion.alpha is not None:
+        filters.append(f"colorchannelmixer=aa={_fmt(max(0.0, min(motion.alpha, 1.0)))}")
+    filters.append(offset)
+    graph.chains.append(f"[{index}:v]{','.join(filters)}[{label}]")
+    return xy
+
+
+def _audio_chain(graph: FilterGraph, *, audio_path: Path, video_duration: float) -> None:
+    # The soundtrack arrives pre-mixed (narration, music and ducking) from
+    # ``audio_mix``; the graph only pads or trims it to the video.
+    audio_index = graph.add_input(["-i", str(audio_path)])
+    graph.chains.append(
+        f"[{audio_index}:a]aformat=sample_rates=44100:channel_layouts=stereo,"
+        f"apad,atrim=duration={_fmt(video_duration)}[aout]"
+    )
+    graph.audio_label = "aout"
+
+
+def compile_filtergraph(
+    *,
+    canvas_size: tuple[int, int],
+    fps: int,
+    duration: float,
+    base_sources: Sequence[GraphSource],
+    overlay_sources: Sequence[GraphSource],
+    audio_path: Path,
+    video_filters: Sequence[str] = (),
+) -> FilterGraph:
+    """Build the filtergraph for a timeline whose base sources already include gap fillers."""
+    width, height = canvas_size
+    graph = FilterGraph(duration=duration)
+
+    base_labels: List[str] = []
+    for idx, source in enumerate(base_sources):
+        label = f"b{idx}"
+        _base_chain(graph, source, label, canvas_size, fps)
+        base_labels.append(label)
+
+    if base_labels:
+        joined = "".join(f"[{label}]" for label in base_labels)
+        graph.chains.append(f"{joined}concat=n={len(base_labels)}:v=1:a=0[base]")
+    else:
+        graph.chains.append(
+            f"color=c=0x0f0f14:s={width}x{height}:r={fps}:d={_fmt(duration)},format=yuv420p[base]"
+        )
+
+    current = "base"
+    for idx, source in enumerate(overlay_sources):
+        label = f"o{idx}"
+        x, y = _overlay_chain(graph, source, label, canvas_size, fps)
+        target = f"v{idx}"
+        graph.chains.append(
+            f"[{current}][{label}]overlay=x='{x}':y='{y}':"
+            f"enable='between(t,{_fmt(source.start)},{_fmt(source.end)})':eof_action=pass[{target}]"
+        )
+        current = target
+
+    tail = [f"trim=duration={_fmt(duration)}", *video_filters, "format=yuv420p"]
+    graph.chains.append(f"[{current}]{','.join(tail)}[vout]")
+    graph.video_label = "vout"
+
+    _audio_chain(graph, audio_path=audio_path, video_duration=duration)
+    return graph
+
+
+def srt_subtitle_filter(
+    srt_path: Path,
+    *,
+    canvas_size: tuple[int, int],
+    font_path: Optional[str],
+    font_size: int,
+    stroke_width: int,
+    y_offset: int,
+    bottom_margin: int = 250,
+) -> str:
+    """Return a ``subtitles=`` filter approximating the classic, unanimated caption style."""
+    from .ffmpeg_tools import quote_filter_path
+
+    _, height = canvas_size
+    # libass renders SRT input against a 288px-high script resolution.
+    scale = 288 / float(height)
+    margin_px = max(bottom_margin + y_offset - font_size * 1.2, 0)
+    style = [
+        f"FontSize={max(int(round(font_size * scale)), 1)}",
+        "PrimaryColour=&H00FFFFFF",
+        "OutlineColour=&H00000000",
+        "BorderStyle=1",
+        f"Outline={_fmt(stroke_width * scale)}",
+        "Shadow=0",
+        "Alignment=2",
+        f"MarginV={int(round(margin_px * scale))}",
+    ]
+    options = [f"filename={quote_filter_path(srt_path)}"]
+    if font_path:
+        family = _font_family(font_path)
+        if family:
+            style.insert(0, f"FontName={family}")
+        options.append(f"fontsdir={quote_filter_path(Path(font_path).parent)}")
+    options.append(f"force_style='{','.join(style)}'")
+    return "subtitles=" + ":".join(options)
+
+
+def ass_subtitle_filter(ass_path: Path, *, font_path: Optional[str] = None) -> str:
+    """Return an ``ass=`` filter burning a script written by ``ass_subtitles``."""
+    from .ffmpeg_tools import quote_filter_path
+
+    options = [f"filename={quote_filter_path(ass_path)}"]
+    if font_path:
+        options.append(f"fontsdir={quote_filter_path(Path(font_path).parent)}")
+    return "ass=" + ":".join(options)
+
+
+def _font_family(font_path: str) -> Optional[str]:
+    try:
+        from PIL import ImageFont
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    try:
+        return ImageFont.truetype(font_path, 12).getname()[0]
+    except (OSError, ValueError):
+        return None
+
+
+def render_filtergraph(
+    graph: FilterGraph,
+    output_path: Path,
+    *,
+    fps: int,
+    threads: Optional[int] = None,
+    preset: str = "medium",
+    crf: Optional[int] = None,
+) -> Path:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(
+        "Rendering %s with ffmpeg filtergraph (%d inputs, %.2fs)",
+        output_path.name,
+        len(graph.inputs),
+        graph.duration,
+    )
+    run_ffmpeg(
+        graph.command(output_path, fps=fps, threads=threads, preset=preset, crf=crf),
+        on_progress=ffmpeg_progress(graph.duration),
+    )
+    return output_path
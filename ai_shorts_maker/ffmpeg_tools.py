@@ -0,0 +1,152 @@
+"""Thin helpers for invoking the ffmpeg/ffprobe binaries directly."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def ffmpeg_binary() -> str:
+    """Return the ffmpeg executable, preferring the one MoviePy is configured with."""
+    configured = os.getenv("FFMPEG_BINARY")
+    if configured and configured not in {"auto-detect", "ffmpeg-imageio"}:
+        return configured
+    try:
+        import imageio_ffmpeg  # type: ignore
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:  # pragma: no cover - optional dependency
+        return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def ffprobe_binary() -> str:
+    configured = os.getenv("FFPROBE_BINARY")
+    if configured:
+        return configured
+    sibling = Path(ffmpeg_binary()).with_name("ffprobe")
+    if sibling.exists():
+        return str(sibling)
+    return shutil.which("ffprobe") or "ffprobe"
+
+
+def _check_ffmpeg(result: subprocess.CompletedProcess) -> None:
+    if result.returncode != 0:
+        tail = result.stderr.decode("utf-8", errors="ignore").strip().splitlines()[-15:]
+        raise RuntimeError("ffmpeg failed:\n" + "\n".join(tail))
+
+
+def run_ffmpeg(
+    args: Sequence[str],
+    *,
+    cwd: Optional[Path] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> None:
+    """Run ffmpeg with ``args`` and raise ``RuntimeError`` carrying the stderr tail on failure.
+
+    ``on_progress`` receives the output position in seconds from ffmpeg's
+    ``-progress`` stream; an exception it raises kills ffmpeg and propagates.
+    """
+    if on_progress is not None:
+        _run_ffmpeg_with_progress(args, cwd=cwd, on_progress=on_progress)
+        return
+    cmd = [ffmpeg_binary(), "-hide_banner", "-nostdin", "-y", *args]
+    logger.debug("Running ffmpeg: %s", " ".join(cmd))
+    result = subprocess.run(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    _check_ffmpeg(result)
+
+
+def _run_ffmpeg_with_progress(
+    args: Sequence[str],
+    *,
+    cwd: Optional[Path],
+    on_progress: Callable[[float], None],
+) -> None:
+    cmd = [ffmpeg_binary(), "-hide_banner", "-nostdin", "-y", "-progress", "pipe:1", "-nostats", *args]
+    logger.debug("Running ffmpeg: %s", " ".join(cmd))
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=str(cwd) if cwd else None,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+        )
+        try:
+            for line in proc.stdout:
+                key, _, value = line.decode("utf-8", errors="ignore").strip().partition("=")
+                # out_time_ms is in microseconds as well (a long-standing ffmpeg quirk).
+                if key in {"out_time_us", "out_time_ms"}:
+                    try:
+                        on_progress(int(value) / 1_000_000)
+                    except ValueError:
+                        continue
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        returncode = proc.wait()
+        stderr.seek(0)
+        _check_ffmpeg(subprocess.CompletedProcess(cmd, returncode, stderr=stderr.read()))
+
+
+def pipe_ffmpeg(args: Sequence[str], *, input_bytes: Optional[bytes] = None) -> bytes:
+    """Run ffmpeg feeding ``input_bytes`` on stdin and return its stdout."""
+    cmd = [ffmpeg_binary(), "-hide_banner", "-y", *args]
+    logger.debug("Running ffmpeg: %s", " ".join(cmd))
+    result = subprocess.run(
+        cmd,
+        input=input_bytes,
+        stdin=None if input_bytes is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    _check_ffmpeg(result)
+    return result.stdout
+
+
+def probe_media(path: Path) -> dict[str, Any]:
+    """Return ffprobe's JSON description (format + streams) of ``path``."""
+    cmd = [
+        ffprobe_binary(),
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        str(path),
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="ignore").strip()
+        raise RuntimeError(f"ffprobe failed for {path}: {message}")
+    return json.loads(result.stdout.decode("utf-8", errors="ignore") or "{}")
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    try:
+        info = probe_media(path)
+    except (RuntimeError, OSError, ValueError):
+        return None
+    try:
+        return float(info.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        return None
+
+
+def quote_filter_path(path: Path | str) -> str:
+    """Quote a filesystem path for use as a filter option value (e.g. ``subtitles=``)."""
+    value = str(path).replace("\\", "/").replace(":", "\\:")
+    value = value.replace("'", "'\\''")
+    return f"'{value}'"
@@ -0,0 +1,44 @@
+"""Stable hashing helpers for cache keys."""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+_CHUNK_SIZE = 1024 * 1024
+_digest_memo: dict[tuple[str, int, int], str] = {}
+_memo_lock = threading.Lock()
+
+
+def hash_payload(payload: Any) -> str:
+    """Return a SHA-256 hex digest of ``payload`` serialised as canonical JSON."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path | str) -> Optional[str]:
+    """Return the SHA-256 of a file's contents, memoised by (path, size, mtime)."""
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _memo_lock:
+        cached = _digest_memo.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    value = digest.hexdigest()
+    with _memo_lock:
+        _digest_memo[memo_key] = value
+    return value
@@ -3,11 +3,12 @@ from __future__ import annotations
 
 import json
 import logging
-import os
-from dataclasses import dataclass, field
+import random
+import shutil
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 try:
@@ -15,12 +16,23 @@ try:
 except ModuleNotFoundError:  # moviepy>=2.0 removes the editor module
     from moviepy import AudioFileClip
 
-from .models import AudioSettings, ProjectMetadata, SubtitleStyle, TimelineSegment
+from .broll_index import plan_broll
+from .checkpoints import RunCheckpoint, stage_key
+from .fingerprint import file_digest
+from .models import AudioSettings, ProjectMetadata, SubtitleLine, SubtitleStyle, TimelineSegment
 from .media import MediaFactory
 from .openai_client import OpenAIShortsClient
+from .prefetch import BrollPrefetcher, estimate_narration_seconds
 from .prompts import build_script_prompt
+from .resources import governor
+from .audio_mix import mux_audio
+from .sharding import render_sharded
+from .timings import record_timings, span, timed_pipeline
+from .sentence_tts import SENTENCE_GAP, TTS_CONCURRENCY, concat_sentence_audio, synthesize_sentences
 from .subtitles import (
+    CaptionLine,
     allocate_caption_timings,
+    captions_from_durations,
     split_script_into_sentences,
     subtitle_lines_from_captions,
     write_srt_from_subtitles,
@@ -28,6 +40,8 @@ from .subtitles import (
 
 logger = logging.getLogger(__name__)
 
+TTS_MODES = ("script", "sentence")
+
 
 @dataclass
 class GenerationOptions:
@@ -46,6 +60,16 @@ class GenerationOptions:
     script_model: str = "gpt-4o-mini"
     tts_model: str = "gpt-4o-mini-tts"
     output_name: Optional[str] = None
+    shards: int = 1
+    # Run id (output name) of an earlier run whose checkpointed stages to reuse.
+    resume: Optional[str] = None
+    # "script": one TTS request, captions timed by character share.
+    # "sentence": one request per sentence, captions timed by measured durations.
+    tts_mode: str = "script"
+    sentence_gap: float = SENTENCE_GAP
+    tts_concurrency: int = TTS_CONCURRENCY
+    # Warm b-roll and music caches while the OpenAI calls are in flight.
+    pipelined: bool = False
     assets_dir: Path = field(
         default_factory=lambda: Path(__file__).resolve().parent / "assets"
     )
@@ -70,70 +94,110 @@ def ensure_directories(options: GenerationOptions) -> None:
     options.output_dir.mkdir(parents=True, exist_ok=True)
 
 
-def generate_short(options: GenerationOptions) -> Dict[str, Any]:
-    ensure_directories(options)
+def _short_visual_builder(
+    assets_dir: Path,
+    factory_kwargs: Dict[str, Any],
+    duration: float,
+    captions: List[CaptionLine],
+    burn_subs: bool,
+    broll_seed: int,
+) -> Tuple[Any, Any]:
+    """Rebuild the short's visual track inside a shard worker process."""
+    factory = MediaFactory(assets_dir, **factory_kwargs)
+    background = factory.build_broll_clip(duration, seed=broll_seed)
+    visual = factory.burn_subtitles(background, captions) if burn_subs else background
 
-    openai_client = OpenAIShortsClient(
-        script_model=options.script_model,
-        tts_model=options.tts_model,
-    )
+    def cleanup() -> None:
+        for clip in (visual, background):
+            try:
+                clip.close()
+            except Exception:
+                continue
 
-    prompt = build_script_prompt(options.topic, options.style, options.lang, options.duration)
-    logger.info("Generating script...")
-    script_text = openai_client.generate_script(prompt)
-    sentences = split_script_into_sentences(script_text)
-
-    output_name = build_output_name(
-        options.topic,
-        options.style,
-        options.lang,
-        options.output_name,
+    return visual, cleanup
+
+
+def _render_short_sharded(
+    options: GenerationOptions,
+    media_factory: MediaFactory,
+    factory_kwargs: Dict[str, Any],
+    *,
+    narration_path: Path,
+    duration: float,
+    captions: List[CaptionLine],
+    output_path: Path,
+    broll_seed: int,
+    music_path: Optional[Path],
+) -> Optional[Path]:
+    """Mix the audio once, then render the visuals in parallel time shards."""
+    audio_path, selected_music = media_factory.mix_audio(
+        narration_path,
+        duration=duration,
+        music_volume=options.music_volume,
+        ducking=options.ducking,
+        use_music=music_path is not None,
+        music_path=music_path,
     )
+    logger.info("Rendering final video to %s in %d shards", output_path, options.shards)
+    with governor.lease(f"generate:{output_path.stem}") as threads:
+        render_sharded(
+            _short_visual_builder,
+            (
+                options.assets_dir,
+                factory_kwargs,
+                duration,
+                captions,
+                options.burn_subs,
+                broll_seed,
+            ),
+            duration=duration,
+            fps=options.fps,
+            shards=options.shards,
+            output_path=output_path,
+            audio_path=audio_path,
+            total_threads=threads,
+        )
+    return selected_music
 
-    script_path = options.output_dir / f"{output_name}.txt"
-    script_path.write_text(script_text, encoding="utf-8")
-    logger.info("Saved script to %s", script_path)
 
-    base_metadata: Dict[str, Any] = {
-        "topic": options.topic,
-        "style": options.style,
-        "language": options.lang,
-        "duration_target": options.duration,
-        "sentences": sentences,
-        "script": script_text,
-        "script_path": str(script_path),
-        "base_name": output_name,
-    }
+@dataclass
+class PreparedShort:
+    """Output of the network-bound stages (script, narration, caption timings).
 
-    if options.dry_run:
-        if options.save_json:
-            json_path = options.output_dir / f"{output_name}.json"
-            json_path.write_text(json.dumps(base_metadata, ensure_ascii=False, indent=2))
-            logger.info("Saved metadata to %s", json_path)
-            base_metadata["metadata_path"] = str(json_path)
-        return base_metadata
-
-    # Voice synthesis
-    narration_path = options.output_dir / f"{output_name}.mp3"
-    logger.info("Generating narration audio (%s)...", options.voice)
-    openai_client.synthesize_voice(
-        text=script_text,
-        voice=options.voice,
-        output_path=narration_path,
-    )
+    Everything here is picklable so the render half can run in another process.
+    """
 
-    narration_clip = AudioFileClip(str(narration_path))
-    voice_duration = narration_clip.duration
+    options: GenerationOptions
+    output_name: str
+    script_text: str
+    sentences: List[str]
+    script_path: Path
+    narration_path: Optional[Path] = None
+    srt_path: Optional[Path] = None
+    voice_duration: float = 0.0
+    captions: List[CaptionLine] = field(default_factory=list)
+    subtitle_lines: List[SubtitleLine] = field(default_factory=list)
+    # ``extra`` for the metadata; carries timings recorded while preparing.
+    extra: Dict[str, Any] = field(default_factory=dict)
 
-    captions = allocate_caption_timings(sentences, voice_duration)
-    subtitle_lines = subtitle_lines_from_captions(captions)
-    srt_path = options.output_dir / f"{output_name}.srt"
-    write_srt_from_subtitles(subtitle_lines, srt_path)
-    logger.info("Saved subtitles to %s", srt_path)
+    @property
+    def base_metadata(self) -> Dict[str, Any]:
+        options = self.options
+        return {
+            "topic": options.topic,
+            "style": options.style,
+            "language": options.lang,
+            "duration_target": options.duration,
+            "sentences": self.sentences,
+            "script": self.script_text,
+            "script_path": str(self.script_path),
+            "base_name": self.output_name,
+        }
 
+
+def _short_factory(options: GenerationOptions) -> Tuple[MediaFactory, Dict[str, Any], SubtitleStyle]:
     subtitle_style = SubtitleStyle()
-    media_factory = MediaFactory(
-        options.assets_dir,
+    factory_kwargs = dict(
         fps=options.fps,
         subtitle_font=subtitle_style.font_path,
         subtitle_fontsize=subtitle_style.font_size,
@@ -141,47 +205,332 @@ def generate_short(options: GenerationOptions) -> Dict[str, Any]:
         subtitle_stroke_width=subtitle_style.stroke_width,
         subtitle_animation=subtitle_style.animation,
     )
+    media_factory = MediaFactory(options.assets_dir, **factory_kwargs)
     subtitle_style.font_path = media_factory.subtitle_font
-    logger.info("Building background visuals (duration %.2fs)...", voice_duration)
-    background_clip = media_factory.build_broll_clip(voice_duration)
+    return media_factory, factory_kwargs, subtitle_style
 
-    video_with_audio, selected_music = media_factory.attach_audio(
-        background_clip,
-        narration_path,
-        music_volume=options.music_volume,
-        ducking=options.ducking,
-        use_music=options.music,
+
+def _broll_plan(checkpoint: RunCheckpoint, options: GenerationOptions, media_factory: MediaFactory) -> Dict[str, Any]:
+    """The b-roll shuffle seed and music track; neither depends on the narration."""
+    key = stage_key(options.music, options.assets_dir)
+    if checkpoint.cached("broll", key):
+        return json.loads(checkpoint.path("broll_plan.json").read_text(encoding="utf-8"))
+    music_track = media_factory.pick_music_track() if options.music else None
+    plan = {"seed": random.randrange(2**32), "music_track": str(music_track) if music_track else None}
+    checkpoint.path("broll_plan.json").write_text(json.dumps(plan), encoding="utf-8")
+    checkpoint.complete("broll", key, ["broll_plan.json"])
+    return plan
+
+
+def _planned_media(
+    media_factory: MediaFactory, duration: float, plan: Dict[str, Any]
+) -> Dict[str, Optional[str]]:
+    """Digests of the b-roll assets ``plan`` selects for ``duration`` and of its music track."""
+    entries = plan_broll(media_factory.broll_index().refresh(), duration, seed=plan["seed"])
+    media = {entry.name: file_digest(media_factory.broll_dir / entry.name) for entry, _ in entries}
+    if plan["music_track"]:
+        media["music"] = file_digest(plan["music_track"])
+    return media
+
+
+def prepare_short(
+    options: GenerationOptions,
+    openai_client: Optional[OpenAIShortsClient] = None,
+    prefetch: Optional[BrollPrefetcher] = None,
+) -> PreparedShort:
+    """Generate the script and (unless ``dry_run``) the narration and subtitles.
+
+    With ``prefetch`` the b-roll plan is fixed first and its assets are warmed
+    from duration estimates while the script and narration are requested.
+    """
+    ensure_directories(options)
+
+    if openai_client is None:
+        openai_client = OpenAIShortsClient(
+            script_model=options.script_model,
+            tts_model=options.tts_model,
+        )
+
+    if options.resume:
+        checkpoint = RunCheckpoint.load(options.output_dir, options.resume)
+        output_name = checkpoint.run_id
+    else:
+        output_name = build_output_name(
+            options.topic,
+            options.style,
+            options.lang,
+            options.output_name,
+        )
+        checkpoint = RunCheckpoint.create(options.output_dir, output_name, options)
+    if options.dry_run:
+        prefetch = None
+    if prefetch is not None:
+        media_factory = _short_factory(options)[0]
+        plan = _broll_plan(checkpoint, options, media_factory)
+        music_path = Path(plan["music_track"]) if plan["music_track"] else None
+        prefetch.start(media_factory, plan["seed"], music_path, estimate=float(options.duration))
+
+    prompt = build_script_prompt(options.topic, options.style, options.lang, options.duration)
+    key = stage_key(prompt, options.script_model)
+    if checkpoint.cached("script", key):
+        script_text = checkpoint.path("script.txt").read_text(encoding="utf-8")
+    else:
+        logger.info("Generating script...")
+        with span("script") as stage:
+            script_text = openai_client.generate_script(prompt)
+            stage.bytes = len(script_text.encode("utf-8"))
+        checkpoint.path("script.txt").write_text(script_text, encoding="utf-8")
+        checkpoint.complete("script", key, ["script.txt"])
+
+    key = stage_key(script_text)
+    if checkpoint.cached("sentences", key):
+        sentences = json.loads(checkpoint.path("sentences.json").read_text(encoding="utf-8"))
+    else:
+        sentences = split_script_into_sentences(script_text)
+        checkpoint.path("sentences.json").write_text(json.dumps(sentences, ensure_ascii=False), encoding="utf-8")
+        checkpoint.complete("sentences", key, ["sentences.json"])
+    if prefetch is not None:
+        prefetch.warm(estimate_narration_seconds(script_text, options.lang))
+
+    script_path = options.output_dir / f"{output_name}.txt"
+    script_path.write_text(script_text, encoding="utf-8")
+    logger.info("Saved script to %s", script_path)
+
+    prepared = PreparedShort(
+        options=options,
+        output_name=output_name,
+        script_text=script_text,
+        sentences=sentences,
+        script_path=script_path,
+        extra={"script_model": options.script_model, "tts_model": options.tts_model, "run_id": output_name},
     )
+    if options.dry_run:
+        return prepared
+
+    if options.tts_mode not in TTS_MODES:
+        raise ValueError(f"Unknown TTS mode: {options.tts_mode}")
+    per_sentence = options.tts_mode == "sentence"
+
+    # Voice synthesis, straight into the output: the checkpoint records that
+    # file as the stage's artifact instead of keeping a second copy.
+    narration_path = options.output_dir / f"{output_name}.mp3"
+    if per_sentence:
+        key = stage_key(sentences, options.voice, options.tts_model, options.tts_mode, options.sentence_gap)
+    else:
+        key = stage_key(script_text, options.voice, options.tts_model)
+    record = checkpoint.cached("tts", key)
+    if record:
+        voice_duration = record["duration"]
+        durations = record.get("durations")
+    elif per_sentence:
+        logger.info("Generating narration audio per sentence (%s)...", options.voice)
+        with span("tts", count=len(sentences)) as stage:
+            clips = synthesize_sentences(
+                openai_client,
+                sentences,
+                voice=options.voice,
+                work_dir=checkpoint.path("sentences"),
+                concurrency=options.tts_concurrency,
+            )
+            voice_duration = concat_sentence_audio(clips, narration_path, gap=options.sentence_gap)
+            stage.add_file(narration_path)
+        durations = [clip.duration for clip in clips]
+        shutil.rmtree(checkpoint.path("sentences"), ignore_errors=True)
+        checkpoint.complete("tts", key, [str(narration_path)], duration=voice_duration, durations=durations)
+    else:
+        logger.info("Generating narration audio (%s)...", options.voice)
+        with span("tts", count=len(sentences)) as stage:
+            openai_client.synthesize_voice(
+                text=script_text,
+                voice=options.voice,
+                output_path=narration_path,
+            )
+            stage.add_file(narration_path)
+
+        narration_clip = AudioFileClip(str(narration_path))
+        try:
+            voice_duration = narration_clip.duration
+        finally:
+            narration_clip.close()
+        durations = None
+        checkpoint.complete("tts", key, [str(narration_path)], duration=voice_duration)
+    if prefetch is not None:
+        prefetch.warm(voice_duration)
+
+    key = stage_key(sentences, voice_duration, durations, options.sentence_gap if durations else None)
+    if checkpoint.cached("captions", key):
+        captions = [
+            CaptionLine(**item)
+            for item in json.loads(checkpoint.path("captions.json").read_text(encoding="utf-8"))
+        ]
+    else:
+        with span("captions") as stage:
+            if durations:
+                captions = captions_from_durations(sentences, durations, options.sentence_gap)
+            else:
+                captions = allocate_caption_timings(sentences, voice_duration)
+            stage.count = len(captions)
+        checkpoint.path("captions.json").write_text(
+            json.dumps([asdict(caption) for caption in captions], ensure_ascii=False),
+            encoding="utf-8",
+        )
+        checkpoint.complete("captions", key, ["captions.json"])
+    subtitle_lines = subtitle_lines_from_captions(captions)
+    srt_path = options.output_dir / f"{output_name}.srt"
+    write_srt_from_subtitles(subtitle_lines, srt_path)
+    logger.info("Saved subtitles to %s", srt_path)
 
-    if options.burn_subs:
-        logger.info("Burning subtitles into the video")
-        video_with_audio = media_factory.burn_subtitles(video_with_audio, captions)
+    prepared.narration_path = narration_path
+    prepared.srt_path = srt_path
+    prepared.voice_duration = voice_duration
+    prepared.captions = captions
+    prepared.subtitle_lines = subtitle_lines
+    record_timings(prepared.extra)
+    return prepared
 
+
+def _write_dry_run(prepared: PreparedShort) -> Dict[str, Any]:
+    options = prepared.options
+    base_metadata = prepared.base_metadata
+    if options.save_json:
+        json_path = options.output_dir / f"{prepared.output_name}.json"
+        json_path.write_text(json.dumps(base_metadata, ensure_ascii=False, indent=2))
+        logger.info("Saved metadata to %s", json_path)
+        base_metadata["metadata_path"] = str(json_path)
+    return base_metadata
+
+
+def _encode_short(
+    options: GenerationOptions,
+    media_factory: MediaFactory,
+    factory_kwargs: Dict[str, Any],
+    *,
+    output_name: str,
+    narration_path: Path,
+    voice_duration: float,
+    captions: List[CaptionLine],
+    output_video_path: Path,
+    broll_seed: int,
+    music_path: Optional[Path],
+) -> Optional[Path]:
+    """Build the b-roll visuals from the plan, encode them and mux the mixed audio."""
+    if options.shards > 1:
+        with span("render_sharded", count=options.shards) as stage:
+            selected_music = _render_short_sharded(
+                options,
+                media_factory,
+                factory_kwargs,
+                narration_path=narration_path,
+                duration=voice_duration,
+                captions=captions,
+                output_path=output_video_path,
+                broll_seed=broll_seed,
+                music_path=music_path,
+            )
+            stage.add_file(output_video_path)
+    else:
+        logger.info("Building background visuals (duration %.2fs)...", voice_duration)
+        with span("broll"):
+            background_clip = media_factory.build_broll_clip(voice_duration, seed=broll_seed)
+        visual_clip = background_clip
+
+        with span("mix_audio") as stage:
+            audio_path, selected_music = media_factory.mix_audio(
+                narration_path,
+                duration=voice_duration,
+                music_volume=options.music_volume,
+                ducking=options.ducking,
+                use_music=music_path is not None,
+                music_path=music_path,
+            )
+            stage.add_file(audio_path)
+
+        if options.burn_subs:
+            logger.info("Burning subtitles into the video")
+            with span("burn_subtitles", count=len(captions)):
+                visual_clip = media_factory.burn_subtitles(visual_clip, captions)
+
+        logger.info("Rendering final video to %s", output_video_path)
+        silent_path = options.output_dir / f"{output_name}.video.mp4"
+        try:
+            with governor.lease(f"generate:{output_name}") as threads, span("encode") as stage:
+                visual_clip.write_videofile(
+                    str(silent_path),
+                    fps=options.fps,
+                    codec="libx264",
+                    audio=False,
+                    threads=threads,
+                )
+                stage.count = int(voice_duration * options.fps)
+                stage.add_file(silent_path)
+            with span("mux") as stage:
+                mux_audio(silent_path, audio_path, output_video_path, duration=voice_duration)
+                stage.add_file(output_video_path)
+        finally:
+            background_clip.close()
+            visual_clip.close()
+            silent_path.unlink(missing_ok=True)
+    return selected_music
+
+
+def render_short(prepared: PreparedShort) -> Dict[str, Any]:
+    """Render the video for ``prepared`` and write its metadata (CPU-bound half)."""
+    options = prepared.options
+    if options.dry_run:
+        return _write_dry_run(prepared)
+
+    output_name = prepared.output_name
+    narration_path = prepared.narration_path
+    srt_path = prepared.srt_path
+    voice_duration = prepared.voice_duration
+    captions = prepared.captions
+    subtitle_lines = prepared.subtitle_lines
+
+    media_factory, factory_kwargs, subtitle_style = _short_factory(options)
     output_video_path = options.output_dir / f"{output_name}.mp4"
-    logger.info("Rendering final video to %s", output_video_path)
-    try:
-        video_with_audio.write_videofile(
-            str(output_video_path),
-            fps=options.fps,
-            codec="libx264",
-            audio_codec="aac",
-            temp_audiofile=str(options.output_dir / f"{output_name}_temp_audio.m4a"),
-            remove_temp=True,
-            threads=os.cpu_count() or 4,
+
+    checkpoint = RunCheckpoint.load(options.output_dir, output_name)
+    plan = _broll_plan(checkpoint, options, media_factory)
+    music_path = Path(plan["music_track"]) if plan["music_track"] else None
+
+    key = stage_key(
+        file_digest(narration_path),
+        [asdict(caption) for caption in captions],
+        plan,
+        _planned_media(media_factory, voice_duration, plan),
+        options.fps,
+        options.burn_subs,
+        options.music_volume,
+        options.ducking,
+        subtitle_style.model_dump(),
+    )
+    if checkpoint.cached("encode", key):
+        selected_music = music_path
+    else:
+        selected_music = _encode_short(
+            options,
+            media_factory,
+            factory_kwargs,
+            output_name=output_name,
+            narration_path=narration_path,
+            voice_duration=voice_duration,
+            captions=captions,
+            output_video_path=output_video_path,
+            broll_seed=plan["seed"],
+            music_path=music_path,
         )
-    finally:
-        narration_clip.close()
-        background_clip.close()
-        video_with_audio.close()
+        checkpoint.complete("encode", key, [str(output_video_path)])
 
+    extra = dict(prepared.extra)
+    extra["timings"] = dict(extra.get("timings") or {})
     metadata_model = ProjectMetadata(
         base_name=output_name,
         topic=options.topic,
         style=options.style,
         language=options.lang,
         duration=voice_duration,
-        script_path=str(script_path),
-        script_text_path=str(script_path),
+        script_path=str(prepared.script_path),
+        script_text_path=str(prepared.script_path),
         audio_path=str(narration_path),
         subtitles_path=str(srt_path),
         video_path=str(output_video_path),
@@ -206,10 +555,11 @@ def generate_short(options: GenerationOptions) -> Dict[str, Any]:
         subtitle_style=subtitle_style,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
-        extra={"script_model": options.script_model, "tts_model": options.tts_model},
+        extra=extra,
     )
+    record_timings(metadata_model.extra)
 
-    metadata_dict = base_metadata | {
+    metadata_dict = prepared.base_metadata | {
         "audio_path": str(narration_path),
         "video_path": str(output_video_path),
         "subtitles_path": str(srt_path),
@@ -241,3 +591,11 @@ def generate_short(options: GenerationOptions) -> Dict[str, Any]:
         logger.info("Saved metadata snapshot to %s", json_path)
 
     return metadata_dict
+
+
+@timed_pipeline("generate")
+def generate_short(options: GenerationOptions) -> Dict[str, Any]:
+    if not options.pipelined:
+        return render_short(prepare_short(options))
+    with BrollPrefetcher() as prefetch:
+        return render_short(prepare_short(options, prefetch=prefetch))
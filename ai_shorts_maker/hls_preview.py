@@ -0,0 +1,180 @@
+"""Progressive HLS (fMP4) preview written alongside the final encode.
+
+Instead of MoviePy's ``write_videofile``, frames are piped into one ffmpeg
+process with two outputs: the full-quality video the render has always
+produced, and a low-bitrate, downscaled HLS event playlist with short fMP4
+segments. Segments appear as soon as they are encoded, so a player pointed at
+the playlist can start while the rest of the video is still rendering.
+"""
+from __future__ import annotations
+
+import logging
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from .ffmpeg_tools import ffmpeg_binary
+from .jobs import report_progress
+
+logger = logging.getLogger(__name__)
+
+HLS_PLAYLIST = "index.m3u8"
+HLS_SIZE = (540, 960)
+HLS_SEGMENT_SECONDS = 2
+HLS_VIDEO_BITRATE = "700k"
+HLS_AUDIO_BITRATE = "96k"
+
+
+def hls_dir_for(output_dir: Path, base_name: str) -> Path:
+    return output_dir / f"{base_name}_hls"
+
+
+def _command(
+    output_path: Path,
+    hls_dir: Path,
+    *,
+    size: tuple[int, int],
+    fps: int,
+    audio_path: Optional[Path],
+    video_filter: Optional[str],
+    preset: str,
+    crf: Optional[int],
+    threads: Optional[int],
+) -> List[str]:
+    width, height = size
+    hls_w, hls_h = HLS_SIZE
+    head = f"[0:v]{video_filter}," if video_filter else "[0:v]"
+    graph = (
+        f"{head}split=2[main][draft];"
+        f"[draft]scale={hls_w}:{hls_h}:force_original_aspect_ratio=decrease,"
+        f"pad=ceil(iw/2)*2:ceil(ih/2)*2[hls]"
+    )
+    cmd = [
+        ffmpeg_binary(),
+        "-hide_banner",
+        "-nostdin",
+        "-y",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-s",
+        f"{width}x{height}",
+        "-r",
+        str(fps),
+        "-i",
+        "pipe:0",
+    ]
+    if audio_path is not None:
+        cmd.extend(["-i", str(audio_path)])
+    cmd.extend(["-filter_complex", graph])
+
+    cmd.extend(["-map", "[main]", "-c:v", "libx264", "-preset", preset, "-pix_fmt", "yuv420p"])
+    if crf is not None:
+        cmd.extend(["-crf", str(crf)])
+    if threads:
+        cmd.extend(["-threads", str(threads)])
+    cmd.append(str(output_path))
+
+    gop = max(int(HLS_SEGMENT_SECONDS * fps), 1)
+    cmd.extend(
+        [
+            "-map",
+            "[hls]",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-b:v",
+            HLS_VIDEO_BITRATE,
+            "-maxrate",
+            HLS_VIDEO_BITRATE,
+            "-bufsize",
+            "1400k",
+            "-g",
+            str(gop),
+            "-keyint_min",
+            str(gop),
+            "-sc_threshold",
+            "0",
+            "-pix_fmt",
+            "yuv420p",
+        ]
+    )
+    if audio_path is not None:
+        cmd.extend(["-map", "1:a:0", "-c:a", "aac", "-b:a", HLS_AUDIO_BITRATE])
+    cmd.extend(
+        [
+            "-f",
+            "hls",
+            "-hls_time",
+            str(HLS_SEGMENT_SECONDS),
+            "-hls_playlist_type",
+            "event",
+            "-hls_segment_type",
+            "fmp4",
+            "-hls_fmp4_init_filename",
+            "init.mp4",
+            "-hls_segment_filename",
+            str(hls_dir / "seg_%05d.m4s"),
+            str(hls_dir / HLS_PLAYLIST),
+        ]
+    )
+    return cmd
+
+
+def write_with_hls(
+    clip,
+    output_path: Path,
+    *,
+    fps: int,
+    hls_dir: Path,
+    audio_path: Optional[Path] = None,
+    video_filter: Optional[str] = None,
+    preset: str = "medium",
+    crf: Optional[int] = None,
+    threads: Optional[int] = None,
+) -> Path:
+    """Encode ``clip`` (silent) to ``output_path`` while publishing ``hls_dir/index.m3u8``.
+
+    ``audio_path`` is only used for the HLS preview; the main output stays
+    video-only so it can be muxed with the cached mix as before.
+    """
+    if hls_dir.exists():
+        shutil.rmtree(hls_dir)
+    hls_dir.mkdir(parents=True)
+    size = (int(clip.size[0]), int(clip.size[1]))
+    cmd = _command(
+        output_path,
+        hls_dir,
+        size=size,
+        fps=fps,
+        audio_path=audio_path,
+        video_filter=video_filter,
+        preset=preset,
+        crf=crf,
+        threads=threads,
+    )
+    logger.info("Rendering %s with progressive HLS preview in %s", output_path.name, hls_dir)
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr)
+        try:
+            total = max(int((clip.duration or 0) * fps), 1)
+            for index, frame in enumerate(clip.iter_frames(fps=fps, dtype="uint8")):
+                proc.stdin.write(frame[:, :, :3].tobytes())
+                report_progress(index / total)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            tail = stderr.read().decode("utf-8", errors="ignore").strip().splitlines()[-15:]
+            raise RuntimeError("ffmpeg failed:\n" + "\n".join(tail))
+    return output_path
@@ -0,0 +1,484 @@
+"""Background job queue for long-running renders.
+
+Requests submit a job and get its id back immediately; a bounded pool of
+worker threads runs queued jobs highest priority first. Every job is a row in
+a local SQLite file, so status, progress and results survive a server
+restart: jobs that were running when the process died are queued again on the
+next :meth:`JobQueue.start`. Several processes may share one job file; a
+claimed job records its owner and a heartbeat, and only jobs whose owner is
+gone (or has stopped beating) are requeued.
+
+Handlers run with a :class:`JobContext` bound to the worker thread. Render
+code reports through :func:`report_progress`, :func:`moviepy_logger` and
+:func:`ffmpeg_progress`, which are no-ops outside a job; the same calls raise
+:class:`JobCancelled` once the job has been cancelled so the render unwinds
+through its usual cleanup.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+try:
+    from proglog import ProgressBarLogger
+except ImportError:  # pragma: no cover - proglog ships with MoviePy
+    ProgressBarLogger = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_FILENAME = ".jobs.sqlite3"
+JOB_WORKERS = int(os.getenv("SHORTS_JOB_WORKERS", "1"))
+# Minimum seconds between persisted progress updates of one job.
+PROGRESS_INTERVAL = 0.5
+# Running jobs are stamped this often; one not stamped for HEARTBEAT_TIMEOUT
+# seconds belongs to a process that is gone and is queued again.
+HEARTBEAT_INTERVAL = float(os.getenv("SHORTS_JOB_HEARTBEAT", "10"))
+HEARTBEAT_TIMEOUT = HEARTBEAT_INTERVAL * 6
+JOB_STATES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATES = frozenset({"succeeded", "failed", "cancelled"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    target TEXT,
+    params TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    updated_at TEXT NOT NULL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority DESC, created_at);
+"""
+
+
+class JobCancelled(RuntimeError):
+    """Raised inside a running job once it has been cancelled."""
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat(timespec="milliseconds")
+
+
+def _new_owner() -> str:
+    # The token tells a restarted process apart from an earlier one with the same pid.
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def _owner_alive(owner: Optional[str], heartbeat_at: Optional[float], current: str) -> bool:
+    """Whether the process that claimed a running job may still be running it."""
+    if owner == current:
+        return True
+    if not owner:
+        return False
+    host, _, rest = owner.partition(":")
+    pid_text = rest.partition(":")[0]
+    if host == socket.gethostname() and pid_text.isdigit():
+        pid = int(pid_text)
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+    return heartbeat_at is not None and time.time() - heartbeat_at < HEARTBEAT_TIMEOUT
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    target: Optional[str] = None
+    priority: int = 0
+    progress: float = 0.0
+    message: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    updated_at: str = field(default_factory=_now)
+    owner: Optional[str] = None
+    heartbeat_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        data = dict(row)
+        data["params"] = json.loads(data["params"] or "{}")
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        data["cancel_requested"] = bool(data["cancel_requested"])
+        return cls(**data)
+
+
+class JobStore:
+    """Job rows in a SQLite file shared by all worker threads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def _execute(self, sql: str, args: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, args)
+
+    def create(self, job: Job) -> Job:
+        self._execute(
+            "INSERT INTO jobs (id, kind, target, params, priority, status, progress, message, "
+            "cancel_requested, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+            (
+                job.id,
+                job.kind,
+                job.target,
+                json.dumps(job.params, ensure_ascii=False),
+                job.priority,
+                job.status,
+                job.progress,
+                job.message,
+                job.created_at,
+                job.updated_at,
+            ),
+        )
+        return job
+
+    def get(self, job_id: str) -> Job:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Job not found: {job_id}")
+        return Job.from_row(row)
+
+    def list(self, *, status: Optional[str] = None, target: Optional[str] = None, limit: int = 50) -> List[Job]:
+        clauses, args = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            args.append(status)
+        if target is not None:
+            clauses.append("target = ?")
+            args.append(target)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._execute(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?",
+            (*args, max(int(limit), 1)),
+        ).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False, default=str)
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id: str, owner: str) -> bool:
+        """Move a queued job to ``running`` for ``owner``; False if it was cancelled or claimed meanwhile."""
+        now = _now()
+        cursor = self._execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, updated_at = ?, owner = ?, heartbeat_at = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (now, now, owner, time.time(), job_id),
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, owner: str) -> None:
+        self._execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND owner = ?",
+            (time.time(), owner),
+        )
+
+    def cancel_queued(self, job_id: str) -> bool:
+        now = _now()
+        cursor = self._execute(
+            "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (now, now, job_id),
+        )
+        return cursor.rowcount == 1
+
+    def reclaim_orphans(self, owner: str) -> List[Job]:
+        """Requeue running jobs whose owner is gone (cancelling those asked to stop); return the requeued."""
+        rows = self._execute(
+            "SELECT id, owner, heartbeat_at, cancel_requested FROM jobs WHERE status = 'running'"
+        ).fetchall()
+        requeued = []
+        for row in rows:
+            if _owner_alive(row["owner"], row["heartbeat_at"], owner):
+                continue
+            now = _now()
+            # The owner guard skips rows another process reclaimed meanwhile.
+            if row["cancel_requested"]:
+                self._execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ?, updated_at = ? "
+                    "WHERE id = ? AND status = 'running' AND owner IS ?",
+                    (now, now, row["id"], row["owner"]),
+                )
+                continue
+            cursor = self._execute(
+                "UPDATE jobs SET status = 'queued', progress = 0, started_at = NULL, owner = NULL, "
+                "heartbeat_at = NULL, message = 'requeued after its worker stopped', updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND owner IS ?",
+                (now, row["id"], row["owner"]),
+            )
+            if cursor.rowcount == 1:
+                requeued.append(self.get(row["id"]))
+        return requeued
+
+    def recover(self, owner: str) -> List[Job]:
+        """Requeue jobs of stopped workers and return every queued job in run order."""
+        self.reclaim_orphans(owner)
+        rows = self._execute(
+            "SELECT * FROM jobs WHERE status = 'queued' ORDER BY priority DESC, created_at"
+        ).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+
+class JobContext:
+    """Progress and cancellation handle of the job running on the current thread."""
+
+    def __init__(self, store: JobStore, job_id: str) -> None:
+        self.store = store
+        self.job_id = job_id
+        self.cancel_event = threading.Event()
+        self.progress = 0.0
+        self.message: Optional[str] = None
+        self._last_write = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check(self) -> None:
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def report(self, progress: Optional[float] = None, message: Optional[str] = None) -> None:
+        """Record ``progress`` (0-1) and/or a stage ``message``; raises once cancelled."""
+        self.check()
+        changed = message is not None and message != self.message
+        if progress is not None:
+            self.progress = max(0.0, min(float(progress), 1.0))
+        if message is not None:
+            self.message = message
+        now = time.monotonic()
+        if changed or now - self._last_write >= PROGRESS_INTERVAL:
+            self._last_write = now
+            self.store.update(self.job_id, progress=round(self.progress, 4), message=self.message)
+
+
+_local = threading.local()
+
+
+def current_job() -> Optional[JobContext]:
+    return getattr(_local, "context", None)
+
+
+def report_progress(progress: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report progress of the current job, if any."""
+    context = current_job()
+    if context is not None:
+        context.report(progress, message)
+
+
+def ffmpeg_progress(duration: Optional[float]) -> Optional[Callable[[float], None]]:
+    """Callback for ``run_ffmpeg(on_progress=...)`` mapping encoded seconds to job progress."""
+    context = current_job()
+    if context is None or not duration or duration <= 0:
+        return None
+    return lambda seconds: context.report(seconds / duration)
+
+
+if ProgressBarLogger is not None:
+
+    class _JobBarLogger(ProgressBarLogger):
+        """proglog logger forwarding MoviePy's frame bar to a job."""
+
+        # MoviePy 1.x names the frame bar "t", 2.x "frame_index".
+        FRAME_BARS = ("t", "frame_index")
+
+        def __init__(self, context: JobContext) -> None:
+            super().__init__()
+            self.context = context
+
+        def bars_callback(self, bar, attr, value, old_value=None):
+            if attr != "index" or bar not in self.FRAME_BARS:
+                return
+            total = self.bars[bar].get("total")
+            if total:
+                self.context.report(value / total)
+
+
+def moviepy_logger() -> Any:
+    """``logger=`` for MoviePy writers: the job's progress logger, or MoviePy's default bar."""
+    context = current_job()
+    if context is None or ProgressBarLogger is None:
+        return "bar"
+    return _JobBarLogger(context)
+
+
+class JobQueue:
+    """Priority queue of jobs executed by ``workers`` daemon threads."""
+
+    def __init__(self, store: JobStore, *, workers: int = JOB_WORKERS) -> None:
+        self.store = store
+        self.workers = max(int(workers), 1)
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._running: Dict[str, JobContext] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self.owner = _new_owner()
+        self._stopping = threading.Event()
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+        """Run jobs of ``kind`` with ``handler(params)``; its JSON-serialisable return value is the result."""
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        recovered = self.store.recover(self.owner)
+        for job in recovered:
+            self._enqueue(job)
+        if recovered:
+            logger.info("Resuming %d queued jobs", len(recovered))
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        for _ in range(self.workers):
+            self._queue.put((float("inf"), next(self._order), None))
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        *,
+        target: Optional[str] = None,
+        priority: int = 0,
+    ) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.create(Job(id=uuid4().hex, kind=kind, params=params, target=target, priority=int(priority)))
+        self._enqueue(job)
+        logger.info("Queued %s job %s for %s (priority %d)", kind, job.id, target, job.priority)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued job at once, or ask a running one to stop at its next progress report."""
+        job = self.store.get(job_id)
+        if job.finished or self.store.cancel_queued(job_id):
+            return self.store.get(job_id)
+        self.store.update(job_id, cancel_requested=1)
+        with self._lock:
+            context = self._running.get(job_id)
+        if context is not None:
+            context.cancel_event.set()
+        return self.store.get(job_id)
+
+    def _enqueue(self, job: Job) -> None:
+        self._queue.put((-job.priority, next(self._order), job.id))
+
+    def _beat(self) -> None:
+        """Stamp this process's running jobs and pick up jobs of workers that stopped."""
+        while not self._stopping.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat(self.owner)
+                for job in self.store.reclaim_orphans(self.owner):
+                    logger.info("Requeued job %s of a stopped worker", job.id)
+                    self._enqueue(job)
+            except sqlite3.Error as exc:  # pragma: no cover - keep beating
+                logger.warning("Job heartbeat failed: %s", exc)
+
+    def _work(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                return
+            if not self.store.claim(job_id, self.owner):
+                continue
+            try:
+                self._run(self.store.get(job_id))
+            except Exception:  # pragma: no cover - keep the worker alive
+                logger.exception("Job worker failed on %s", job_id)
+
+    def _run(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        context = JobContext(self.store, job.id)
+        with self._lock:
+            self._running[job.id] = context
+        # A cancel between claim() and registration only reached the store.
+        if self.store.get(job.id).cancel_requested:
+            context.cancel_event.set()
+        _local.context = context
+        try:
+            context.check()
+            if handler is None:
+                raise RuntimeError(f"No handler registered for {job.kind} jobs")
+            result = handler(job.params)
+        except JobCancelled:
+            logger.info("Job %s cancelled", job.id)
+            self.store.update(job.id, status="cancelled", finished_at=_now())
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            self.store.update(job.id, status="failed", error=str(exc), finished_at=_now())
+        else:
+            self.store.update(job.id, status="succeeded", progress=1.0, result=result, finished_at=_now())
+        finally:
+            _local.context = None
+            with self._lock:
+                self._running.pop(job.id, None)
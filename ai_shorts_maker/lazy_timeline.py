@@ -0,0 +1,147 @@
+"""Long-form timeline mode: open segment clips only while they are on screen.
+
+The regular MoviePy path builds every segment clip before rendering, so each
+video segment holds an ffmpeg reader for the whole render. ``LazyTimelineClip``
+instead keeps only openers. The timeline is cut into elementary intervals at
+every segment start and end; a bisect over those boundaries finds the clips
+active at ``t`` in O(log n), clips are opened when their interval is first
+reached and closed as soon as the render moves past them. An interval showing
+a single full-canvas base clip is chained straight through without a
+compositor, so peak memory and open readers track the busiest moment of the
+timeline rather than its length.
+"""
+from __future__ import annotations
+
+import bisect
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from moviepy.editor import CompositeVideoClip, VideoClip
+except ModuleNotFoundError:  # moviepy>=2.0 removes the editor shim
+    from moviepy import CompositeVideoClip, VideoClip  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+_FRAME_PARAM = "frame_function" if "frame_function" in inspect.signature(VideoClip.__init__).parameters else "make_frame"
+
+
+@dataclass
+class LazyEntry:
+    """A timeline clip that is built by ``opener`` on first use.
+
+    ``opener`` must return a clip already placed at ``start`` in timeline time.
+    ``direct`` marks clips that cover the canvas at (0, 0) without a mask, so
+    they can be shown without compositing when nothing else is on screen.
+    """
+
+    start: float
+    end: float
+    opener: Callable[[], Any]
+    direct: bool = False
+
+
+class TimelineIndex:
+    """Active entries per elementary interval, looked up by bisect."""
+
+    def __init__(self, entries: Sequence[LazyEntry], duration: float) -> None:
+        points = {0.0, float(duration)}
+        for entry in entries:
+            points.add(max(0.0, min(entry.start, duration)))
+            points.add(max(0.0, min(entry.end, duration)))
+        self.boundaries: List[float] = sorted(points)
+        # Sweep the intervals once; the active tuple keeps entries in z-order.
+        order = sorted(range(len(entries)), key=lambda index: entries[index].start)
+        cursor = 0
+        active: set[int] = set()
+        self.active: List[Tuple[int, ...]] = []
+        for left, right in zip(self.boundaries, self.boundaries[1:]):
+            middle = (left + right) / 2.0
+            while cursor < len(order) and entries[order[cursor]].start <= middle:
+                active.add(order[cursor])
+                cursor += 1
+            active = {index for index in active if entries[index].end > middle}
+            self.active.append(tuple(sorted(active)))
+        if not self.active:
+            self.active.append(())
+
+    def interval_at(self, t: float) -> int:
+        position = bisect.bisect_right(self.boundaries, t) - 1
+        return max(0, min(position, len(self.active) - 1))
+
+
+class LazyTimelineClip(VideoClip):
+    """Canvas-sized clip composing ``entries`` (in z-order) on demand."""
+
+    def __init__(
+        self,
+        entries: Sequence[LazyEntry],
+        *,
+        size: Tuple[int, int],
+        duration: float,
+        fps: Optional[int] = None,
+        bg_color: Tuple[int, int, int] = (10, 12, 18),
+    ) -> None:
+        self.entries = list(entries)
+        self.canvas_size = (int(size[0]), int(size[1]))
+        self.index = TimelineIndex(self.entries, duration)
+        self.bg_color = bg_color
+        self._open: Dict[int, Any] = {}
+        self._interval: Optional[int] = None
+        self._frame_source: Optional[Callable[[float], Any]] = None
+        self.peak_open = 0
+        super().__init__(**{_FRAME_PARAM: self._frame}, duration=duration)
+        self.size = self.canvas_size
+        if fps:
+            self.fps = fps
+
+    def _enter(self, interval: int) -> None:
+        wanted = self.index.active[interval]
+        for position in list(self._open):
+            if position not in wanted:
+                self._close_entry(position)
+        clips = []
+        for position in wanted:
+            clip = self._open.get(position)
+            if clip is None:
+                clip = self._open[position] = self.entries[position].opener()
+            clips.append(clip)
+        self.peak_open = max(self.peak_open, len(self._open))
+
+        if not clips:
+            background = np.empty((self.canvas_size[1], self.canvas_size[0], 3), dtype=np.uint8)
+            background[:] = self.bg_color
+            self._frame_source = lambda t: background
+        elif len(clips) == 1 and self.entries[wanted[0]].direct and tuple(clips[0].size) == self.canvas_size:
+            clip = clips[0]
+            start = self.entries[wanted[0]].start
+            self._frame_source = lambda t: clip.get_frame(t - start)
+        else:
+            composite = CompositeVideoClip(clips, size=self.canvas_size, bg_color=self.bg_color)
+            self._frame_source = composite.get_frame
+        self._interval = interval
+
+    def _frame(self, t: float):
+        interval = self.index.interval_at(t)
+        if interval != self._interval:
+            self._enter(interval)
+        return self._frame_source(t)
+
+    def _close_entry(self, position: int) -> None:
+        clip = self._open.pop(position, None)
+        if clip is None:
+            return
+        try:
+            clip.close()
+        except Exception:
+            logger.debug("Could not close lazy timeline clip %d", position, exc_info=True)
+
+    def close(self) -> None:
+        for position in list(self._open):
+            self._close_entry(position)
+        self._interval = None
+        self._frame_source = None
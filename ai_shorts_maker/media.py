@@ -31,7 +31,6 @@ try:
         ImageClip,
         TextClip,
         VideoClip,
-        VideoFileClip,
         concatenate_videoclips,
     )
 except ModuleNotFoundError:  # moviepy>=2.0 removes the editor shim
@@ -43,7 +42,6 @@ except ModuleNotFoundError:  # moviepy>=2.0 removes the editor shim
         ImageClip,
         TextClip,
         VideoClip,
-        VideoFileClip,
         concatenate_videoclips,
     )
 
@@ -62,7 +60,11 @@ except ImportError:
     MultiplyVolume = None
 from moviepy.video.tools.subtitles import SubtitlesClip
 
+from .audio_mix import mix_to_file
+from .broll_index import BrollIndex, get_index, plan_broll
+from .media_reader import open_image_clip, open_video_clip
 from .subtitles import CaptionLine
+from .text_render import TextStyle, available as text_render_available, compose_rgba, rasterize_text
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +75,10 @@ _FONT_SIZE_PARAM = "font_size" if "font_size" in _TEXTCLIP_SIGNATURE.parameters
 SUPPORTED_BROLL_EXTENSIONS = {".mp4", ".mov", ".mkv", ".webm", ".jpg", ".jpeg", ".png"}
 SUPPORTED_MUSIC_EXTENSIONS = {".mp3", ".wav", ".m4a", ".flac"}
 
+# Subtitle/banner sizes and offsets are specified in pixels of this canvas and
+# scaled with the actual canvas (e.g. for draft previews).
+REFERENCE_CANVAS = (1080, 1920)
+
 DEFAULT_FONT_CANDIDATES = [
     os.getenv("SHORTS_SUBTITLE_FONT"),
     "/usr/share/fonts/truetype/nanum/NanumSquareRoundR.ttf",
@@ -259,7 +265,8 @@ def _resize_clip(clip, size: tuple[int, int]):
     new_w = max(1, int(math.ceil(clip_w * scale)))
     new_h = max(1, int(math.ceil(clip_h * scale)))
 
-    resized = _resize_to_size(clip, (new_w, new_h))
+    # Decoder-framed clips already match; a same-size resize would still resample every frame.
+    resized = clip if (new_w, new_h) == (int(clip_w), int(clip_h)) else _resize_to_size(clip, (new_w, new_h))
     return _crop_to_size(resized, size)
 
 
@@ -317,7 +324,7 @@ class MediaFactory:
     def __init__(
         self,
         assets_dir: Path,
-        canvas_size: tuple[int, int] = (1080, 1920),
+        canvas_size: tuple[int, int] = REFERENCE_CANVAS,
         fps: int = 24,
         subtitle_font: Optional[str] = None,
         subtitle_fontsize: int = 62,
@@ -335,47 +342,65 @@ class MediaFactory:
         self.broll_dir = assets_dir / "broll"
         self.music_dir = assets_dir / "music"
         self.canvas_size = canvas_size
+        self.geometry_scale = canvas_size[1] / REFERENCE_CANVAS[1]
         self.fps = fps
         self.subtitle_font = _resolve_font_path(subtitle_font)
-        self.subtitle_fontsize = subtitle_fontsize
-        self.subtitle_y_offset = subtitle_y_offset
-        self.subtitle_stroke_width = subtitle_stroke_width
+        self.subtitle_fontsize = max(self.px(subtitle_fontsize), 1)
+        self.subtitle_y_offset = self.px(subtitle_y_offset)
+        self.subtitle_stroke_width = self.px(subtitle_stroke_width, minimum=1 if subtitle_stroke_width > 0 else 0)
         self.subtitle_animation = (subtitle_animation or "none").lower()
         self.layout_template = (layout_template or "classic").lower()
         self.banner_primary_text = banner_primary
         self.banner_secondary_text = banner_secondary
-        self.banner_primary_font_size = banner_primary_font_size
-        self.banner_secondary_font_size = banner_secondary_font_size
-        self.banner_line_spacing = banner_line_spacing
+        self.banner_primary_font_size = self.px(banner_primary_font_size) if banner_primary_font_size else None
+        self.banner_secondary_font_size = self.px(banner_secondary_font_size) if banner_secondary_font_size else None
+        self.banner_line_spacing = self.px(banner_line_spacing) if banner_line_spacing is not None else None
+
+    def px(self, value: float, *, minimum: Optional[int] = None) -> int:
+        """Convert a length given for ``REFERENCE_CANVAS`` to pixels of this canvas."""
+        scaled = int(round(value * self.geometry_scale))
+        return scaled if minimum is None else max(scaled, minimum)
+
+    @property
+    def layout_canvas(self) -> tuple[int, int]:
+        """The canvas that unscaled style values (and ASS scripts) are expressed in."""
+        return (
+            int(round(self.canvas_size[0] / self.geometry_scale)),
+            int(round(self.canvas_size[1] / self.geometry_scale)),
+        )
 
     # -------------------- B-roll --------------------
-    def build_broll_clip(self, duration: float):
-        candidates = list(self.iter_broll_files())
-        if not candidates:
+    def build_broll_clip(self, duration: float, seed: Optional[int] = None):
+        """Assemble a background of shuffled b-roll; ``seed`` makes the selection reproducible.
+
+        The selection is planned from the b-roll index, so only the assets
+        that end up in the background are opened.
+        """
+        plan = plan_broll(self.broll_index().refresh(), duration, seed=seed)
+        if not plan:
             logger.info("No b-roll assets found; using a solid color background")
             return _set_fps(
                 ColorClip(size=self.canvas_size, color=(15, 15, 20), duration=duration),
                 self.fps,
             )
 
-        random.shuffle(candidates)
         clips: List = []
         remaining = duration
-        for path in candidates:
-            clip = self._load_broll_clip(path)
+        for entry, seconds in plan:
+            try:
+                clip = self._load_broll_clip(self.broll_dir / entry.name)
+            except OSError as exc:
+                logger.warning("Skipping unreadable b-roll asset %s: %s", entry.name, exc)
+                continue
             if clip is None:
                 continue
-            clip_duration = getattr(clip, "duration", None)
-            if clip_duration is not None and clip_duration >= remaining:
-                trimmed = _subclip(clip, 0, remaining)
-                resized = _resize_clip(trimmed, self.canvas_size)
-                clips.append(_set_fps(resized, self.fps))
-                remaining = 0
-                break
+            clip_duration = getattr(clip, "duration", None) or seconds
+            take = min(seconds, clip_duration)
+            if take < clip_duration:
+                clip = _subclip(clip, 0, take)
             resized = _resize_clip(clip, self.canvas_size)
             clips.append(_set_fps(resized, self.fps))
-            if clip_duration is not None:
-                remaining = max(0.0, remaining - clip_duration)
+            remaining = max(0.0, remaining - take)
 
         if remaining > 0 and clips:
             filler = _video_loop(clips[-1], duration=remaining)
@@ -396,6 +421,9 @@ class MediaFactory:
         combined = _set_duration(combined, duration)
         return _set_fps(combined, self.fps)
 
+    def broll_index(self) -> BrollIndex:
+        return get_index(self.broll_dir)
+
     def iter_broll_files(self) -> Iterable[Path]:
         if not self.broll_dir.exists():
             return []
@@ -404,9 +432,9 @@ class MediaFactory:
     def _load_broll_clip(self, path: Path):
         logger.debug("Loading b-roll asset %s", path)
         if path.suffix.lower() in {".mp4", ".mov", ".mkv", ".webm"}:
-            return VideoFileClip(str(path))
+            return open_video_clip(path, self.canvas_size, self.fps)
         if path.suffix.lower() in {".jpg", ".jpeg", ".png"}:
-            clip = ImageClip(str(path), duration=6)
+            clip = _set_duration(open_image_clip(path, self.canvas_size), 6)
             return _set_fps(clip, self.fps)
         return None
 
@@ -457,6 +485,33 @@ class MediaFactory:
             final_audio = base_audio
         return _set_audio(video_clip, final_audio), selected_track
 
+    def mix_audio(
+        self,
+        narration_audio: Path,
+        *,
+        duration: float,
+        music_volume: float = 0.12,
+        ducking: float = 0.35,
+        use_music: bool = True,
+        music_path: Optional[Path] = None,
+    ) -> tuple[Path, Optional[Path]]:
+        """Mix narration and background music into one cached AAC track of ``duration`` seconds.
+
+        Unlike ``attach_audio`` the music is ducked only while the narration is
+        audible. Returns the track path and the music file used.
+        """
+        selected_track: Optional[Path] = None
+        if use_music:
+            selected_track = music_path if music_path is not None else self.pick_music_track()
+        mixed = mix_to_file(
+            narration_audio,
+            selected_track,
+            duration=duration,
+            music_volume=music_volume,
+            ducking=ducking,
+        )
+        return mixed, selected_track
+
     def pick_music_track(self) -> Optional[Path]:
         tracks = [p for p in self.music_dir.glob("*") if p.suffix.lower() in SUPPORTED_MUSIC_EXTENSIONS]
         if not tracks:
@@ -483,11 +538,11 @@ class MediaFactory:
         else:
             default_duration = 1.5
             default_start, default_end = 0.0, 1.5
-        base_y = self.canvas_size[1] - 250 - self.subtitle_y_offset
+        base_y = self.canvas_size[1] - self.px(250) - self.subtitle_y_offset
         banner_enabled = self.layout_template == "banner"
         banner_height = int(self.canvas_size[1] * 0.21) if banner_enabled else 0
         if banner_enabled:
-            base_y = self.canvas_size[1] - 300 - self.subtitle_y_offset
+            base_y = self.canvas_size[1] - self.px(300) - self.subtitle_y_offset
         slide_modes = {"slide_up", "slide_down", "slide_left", "slide_right"}
 
         def _caption_meta(text: str) -> tuple[float, float, float]:
@@ -500,10 +555,24 @@ class MediaFactory:
             return default_duration, default_start, default_end
 
         def _create_text_clip(txt: str):
+            bitmap = rasterize_text(
+                txt,
+                TextStyle(
+                    font_path=self.subtitle_font,
+                    font_size=self.subtitle_fontsize,
+                    color="white",
+                    stroke_color="black",
+                    stroke_width=self.subtitle_stroke_width,
+                    max_width=self.canvas_size[0] - self.px(120),
+                ),
+            )
+            if bitmap is not None:
+                return ImageClip(bitmap)
+
             base_kwargs = dict(
                 color="white",
                 method="caption",
-                size=(self.canvas_size[0] - 120, None),
+                size=(self.canvas_size[0] - self.px(120), None),
                 stroke_color="black",
                 stroke_width=self.subtitle_stroke_width,
             )
@@ -526,7 +595,7 @@ class MediaFactory:
             raw_duration, start_time, _ = _caption_meta(txt)
             duration = max(raw_duration, 0.1)
             clip = _set_duration(_create_text_clip(txt), duration + 0.05)
-            if hasattr(clip, "with_mask"):
+            if hasattr(clip, "with_mask") and getattr(clip, "mask", None) is None:
                 clip = clip.with_mask()
 
             base_frame = None
@@ -649,7 +718,12 @@ class MediaFactory:
             subtitles_clip = _set_duration(subtitles_clip, video_duration)
         layers = [video_clip, subtitles_clip]
 
-        if banner_enabled:
+        banner_overlay = self._banner_overlay(banner_height) if banner_enabled else None
+        if banner_overlay is not None:
+            duration_target = video_duration or subtitles_clip.duration
+            banner_clip = _set_duration(ImageClip(banner_overlay), duration_target)
+            layers.append(_with_position(banner_clip, ("center", 0)))
+        elif banner_enabled:
             duration_target = video_duration or subtitles_clip.duration
             banner_bg = ColorClip(size=(self.canvas_size[0], banner_height), color=(0, 0, 0))
             banner_bg = _set_duration(banner_bg, duration_target)
@@ -670,15 +744,15 @@ class MediaFactory:
                 base_kwargs = dict(
                     color=color,
                     method="caption",
-                    size=(self.canvas_size[0] - 160, None),
+                    size=(self.canvas_size[0] - self.px(160), None),
                     stroke_color="black",
-                    stroke_width=max(2, self.subtitle_stroke_width + 1),
+                    stroke_width=max(self.px(2, minimum=1), self.subtitle_stroke_width + self.px(1, minimum=1)),
                 )
 
                 def _make_kwargs(include_font: bool):
                     kwargs = dict(base_kwargs)
                     kwargs[_TEXT_PARAM] = text
-                    size_value = font_size_override or max(int(self.subtitle_fontsize * 1.05), 48)
+                    size_value = font_size_override or max(int(self.subtitle_fontsize * 1.05), self.px(48))
                     kwargs[_FONT_SIZE_PARAM] = max(size_value, 1)
                     if include_font and self.subtitle_font:
                         kwargs["font"] = self.subtitle_font
@@ -689,7 +763,7 @@ class MediaFactory:
                 except Exception:
                     clip = TextClip(**_make_kwargs(include_font=False))
                 clip = _set_duration(clip, duration_target)
-                y_pos = max(8, int(banner_height * y_factor) - clip.h // 2 + int(y_adjust))
+                y_pos = max(self.px(8), int(banner_height * y_factor) - clip.h // 2 + int(y_adjust))
                 return _with_position(clip, ("center", y_pos))
 
             spacing_adjust = int(self.banner_line_spacing or 0)
@@ -719,3 +793,40 @@ class MediaFactory:
 
         composite = CompositeVideoClip(layers, size=self.canvas_size)
         return _set_duration(composite, video_duration or subtitles_clip.duration)
+
+    def _banner_overlay(self, banner_height: int) -> Optional[np.ndarray]:
+        """Precompose the banner background and both banner texts into one RGBA bitmap."""
+        if not text_render_available():
+            return None
+        width = self.canvas_size[0]
+        spacing_adjust = int(self.banner_line_spacing or 0)
+        lines = (
+            (self.banner_primary_text, "white", 0.35, self.banner_primary_font_size, -math.floor(spacing_adjust / 2)),
+            (self.banner_secondary_text, "#ffd400", 0.72, self.banner_secondary_font_size, math.ceil(spacing_adjust / 2)),
+        )
+        layers = []
+        bottom = banner_height
+        for text, color, y_factor, font_size_override, y_adjust in lines:
+            if not text:
+                continue
+            size_value = font_size_override or max(int(self.subtitle_fontsize * 1.05), self.px(48))
+            bitmap = rasterize_text(
+                text,
+                TextStyle(
+                    font_path=self.subtitle_font,
+                    font_size=max(size_value, 1),
+                    color=color,
+                    stroke_color="black",
+                    stroke_width=max(self.px(2, minimum=1), self.subtitle_stroke_width + self.px(1, minimum=1)),
+                    max_width=width - self.px(160),
+                ),
+            )
+            height, text_width = bitmap.shape[:2]
+            y_pos = max(self.px(8), int(banner_height * y_factor) - height // 2 + int(y_adjust))
+            layers.append((bitmap, ((width - text_width) // 2, y_pos)))
+            bottom = max(bottom, y_pos + height)
+        return compose_rgba(
+            (width, min(bottom, self.canvas_size[1])),
+            rects=[((0, 0, width - 1, banner_height - 1), (0, 0, 0, round(0.92 * 255)))],
+            layers=layers,
+        )
@@ -0,0 +1,315 @@
+"""Lean readers for timeline and b-roll media.
+
+MoviePy's ``VideoFileClip`` hands every frame to Python at the source
+resolution, opens an audio reader even when the sound is discarded, and
+leaves the cover-and-crop of ``media._resize_clip`` to per-frame Python
+resizes. The readers here give the canvas size and fps to ffmpeg instead, so
+4K phone footage leaves the decoder already framed for the canvas (same
+framing as ``_resize_clip``), with audio decoding disabled. Still images are
+framed once with Pillow at load time and kept in a byte-bounded LRU shared by
+timeline segments, b-roll and successive renders in the same process.
+"""
+from __future__ import annotations
+
+import inspect
+import logging
+import math
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from moviepy.editor import ImageClip, VideoClip, VideoFileClip
+except ModuleNotFoundError:  # moviepy>=2.0 removes the editor shim
+    from moviepy import ImageClip, VideoClip, VideoFileClip  # type: ignore
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional at import time
+    Image = None  # type: ignore
+
+from .broll_index import _parse_rate, _stream_rotation
+from .ffmpeg_render import _cover_filter
+from .ffmpeg_tools import ffmpeg_binary, probe_media
+
+logger = logging.getLogger(__name__)
+
+# Crop to the canvas inside ffmpeg; set SHORTS_DECODER_CROP=0 to only scale there.
+DECODER_CROP = os.getenv("SHORTS_DECODER_CROP", "1") != "0"
+# Forward jumps shorter than this are decoded through instead of restarting ffmpeg.
+MAX_SKIP_SECONDS = 2.0
+IMAGE_CACHE_BYTES = int(os.getenv("SHORTS_IMAGE_CACHE_MB", "512")) * 1024 * 1024
+
+_FRAME_PARAM = "frame_function" if "frame_function" in inspect.signature(VideoClip.__init__).parameters else "make_frame"
+
+
+def cover_size(source: Tuple[int, int], target: Tuple[int, int]) -> Tuple[int, int]:
+    """Size ``media._resize_clip`` scales ``source`` to before cropping: cover ``target``, never shrink."""
+    src_w, src_h = source
+    target_w, target_h = target
+    scale = max(target_w / src_w, target_h / src_h, 1.0)
+    return max(1, int(math.ceil(src_w * scale))), max(1, int(math.ceil(src_h * scale)))
+
+
+VideoInfo = Tuple[Optional[Tuple[int, int]], Optional[float], Optional[float]]
+_info_memo: Dict[Tuple[str, int, int], VideoInfo] = {}
+_info_lock = threading.Lock()
+
+
+def video_info(path: Path) -> VideoInfo:
+    """``_video_info`` memoised by (path, size, mtime), so b-roll can be probed ahead of a render."""
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _info_lock:
+        cached = _info_memo.get(memo_key)
+    if cached is None:
+        cached = _video_info(path)
+        with _info_lock:
+            _info_memo[memo_key] = cached
+    return cached
+
+
+def _video_info(path: Path) -> VideoInfo:
+    """Return (display size, duration, fps) of the first video stream."""
+    info = probe_media(path)
+    stream = next((s for s in info.get("streams", []) if s.get("codec_type") == "video"), None)
+    if stream is None:
+        return None, None, None
+    size = None
+    if stream.get("width") and stream.get("height"):
+        size = (int(stream["width"]), int(stream["height"]))
+        if _stream_rotation(stream) % 180:
+            size = (size[1], size[0])
+    duration = None
+    for source in (info.get("format", {}), stream):
+        try:
+            duration = float(source.get("duration"))
+            break
+        except (TypeError, ValueError):
+            continue
+    fps = _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate"))
+    return size, duration, fps
+
+
+class _PipeReader:
+    """Sequential raw-RGB frame reader over an ffmpeg subprocess."""
+
+    def __init__(self, path: Path, size: Tuple[int, int], fps: float, video_filter: str) -> None:
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.video_filter = video_filter
+        self.frame_bytes = size[0] * size[1] * 3
+        self.proc: Optional[subprocess.Popen] = None
+        self.position = 0  # index of the next frame the pipe will yield
+        self.last_index = -1
+        self.last_frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+
+    def _start(self, index: int) -> None:
+        self.close()
+        cmd = [ffmpeg_binary(), "-v", "error", "-nostdin"]
+        if index:
+            cmd.extend(["-ss", f"{index / self.fps:.6f}"])
+        cmd.extend(
+            [
+                "-i",
+                str(self.path),
+                "-an",
+                "-sn",
+                "-vf",
+                self.video_filter,
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "pipe:1",
+            ]
+        )
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=self.frame_bytes)
+        self.position = index
+
+    def _read(self) -> Optional[np.ndarray]:
+        raw = self.proc.stdout.read(self.frame_bytes) if self.proc else b""
+        if len(raw) < self.frame_bytes:
+            return None
+        self.position += 1
+        return np.frombuffer(raw, dtype=np.uint8).reshape(self.size[1], self.size[0], 3)
+
+    def get_frame(self, t: float) -> np.ndarray:
+        index = max(int(t * self.fps + 1e-6), 0)
+        if index == self.last_index:
+            return self.last_frame
+        if self.proc is None or index < self.position or index - self.position > MAX_SKIP_SECONDS * self.fps:
+            self._start(index)
+        while self.position <= index:
+            frame = self._read()
+            if frame is None:
+                # Past the last decodable frame: hold the final image.
+                break
+            self.last_frame = frame
+        self.last_index = index
+        return self.last_frame
+
+    def close(self) -> None:
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdout.close()
+            self.proc.terminate()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+        self.proc = None
+
+
+class DecodedVideoClip(VideoClip):
+    """Video-only clip whose frames are scaled and cropped by ffmpeg."""
+
+    def __init__(self, path: Path, size: Tuple[int, int], fps: float, duration: float, video_filter: str) -> None:
+        self.reader = _PipeReader(path, size, fps, video_filter)
+        super().__init__(**{_FRAME_PARAM: self.reader.get_frame}, duration=duration)
+        self.filename = str(path)
+        self.fps = fps
+        self.size = size
+
+    def close(self) -> None:
+        self.reader.close()
+        super_close = getattr(super(), "close", None)
+        if super_close is not None:
+            super_close()
+
+
+def open_video_clip(path: Path, size: Tuple[int, int], fps: Optional[float] = None, *, crop: bool = DECODER_CROP):
+    """Open ``path`` without audio, decoded directly at (or covering) ``size``.
+
+    With ``crop`` the clip is exactly ``size`` and needs no further resizing;
+    otherwise it is scaled by the decoder to cover ``size`` and the caller's
+    ``_resize_clip`` only has to crop.
+    """
+    try:
+        source_size, duration, source_fps = video_info(path)
+    except (RuntimeError, OSError, ValueError) as exc:
+        raise OSError(f"Could not probe {path}: {exc}") from exc
+    if source_size is None or not duration:
+        raise OSError(f"No decodable video stream in {path}")
+
+    width, height = int(size[0]), int(size[1])
+    if not crop:
+        cover_w, cover_h = cover_size(source_size, (width, height))
+        return VideoFileClip(str(path), audio=False, target_resolution=(cover_h, cover_w))
+
+    out_fps = float(fps or source_fps or 30)
+    video_filter = f"{_cover_filter((width, height))},fps={out_fps:g}"
+    logger.debug("Opening %s via decoder scale to %dx%d@%g", path.name, width, height, out_fps)
+    return DecodedVideoClip(path, (width, height), out_fps, duration, video_filter)
+
+
+@dataclass
+class ImageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ImageCache:
+    """LRU of decoded, canvas-framed images keyed by (path, size, mtime, target size)."""
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ImageCacheStats()
+
+    @staticmethod
+    def key_for(path: Path, size: Tuple[int, int]) -> Optional[tuple]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (str(path.resolve()), stat.st_size, stat.st_mtime_ns, int(size[0]), int(size[1]))
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            array = self._entries.get(key)
+            if array is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return array
+
+    def put(self, key: tuple, array: np.ndarray) -> np.ndarray:
+        array.setflags(write=False)
+        if array.nbytes > self.max_bytes:
+            return array
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stats.bytes -= previous.nbytes
+            self._entries[key] = array
+            self._stats.bytes += array.nbytes
+            while self._stats.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._stats.bytes -= evicted.nbytes
+                self._stats.evictions += 1
+            self._stats.entries = len(self._entries)
+        return array
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(asdict(self._stats), max_bytes=self.max_bytes)
+
+
+image_cache = ImageCache()
+
+
+def load_image_array(path: Path, size: Tuple[int, int]) -> np.ndarray:
+    """Decode an image and frame it for ``size`` like ``_resize_clip`` as an RGB(A) array.
+
+    Only the canvas-sized window is kept, so a 12-megapixel photo is not
+    carried through the render at full size. Results come from ``image_cache``
+    when the file is unchanged and are read-only.
+    """
+    key = ImageCache.key_for(path, size)
+    if key is not None:
+        cached = image_cache.get(key)
+        if cached is not None:
+            return cached
+    array = _decode_image(path, size)
+    return image_cache.put(key, array) if key is not None else array
+
+
+def _decode_image(path: Path, size: Tuple[int, int]) -> np.ndarray:
+    if Image is None:
+        raise OSError("Pillow is required to decode images at the target size")
+    width, height = int(size[0]), int(size[1])
+    with Image.open(path) as img:
+        # Keep transparency so ImageClip still builds a mask for overlay PNGs.
+        mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+        if img.mode != mode:
+            img = img.convert(mode)
+        cover_w, cover_h = cover_size(img.size, (width, height))
+        if (cover_w, cover_h) != img.size:
+            img = img.resize((cover_w, cover_h), Image.BICUBIC)
+        left = (cover_w - width) // 2
+        top = (cover_h - height) // 2
+        framed = img.crop((left, top, left + width, top + height))
+    return np.asarray(framed, dtype=np.uint8)
+
+
+def open_image_clip(path: Path, size: Tuple[int, int]):
+    return ImageClip(load_image_array(path, size))
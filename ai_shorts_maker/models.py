@@ -73,6 +73,7 @@ class SubtitleStyle(BaseModel):
     banner_primary_font_size: Optional[int] = None
     banner_secondary_font_size: Optional[int] = None
     banner_line_spacing: Optional[int] = None
+    renderer: Literal["moviepy", "ass"] = "moviepy"
 
 
 class ProjectMetadata(BaseModel):
@@ -0,0 +1,118 @@
+"""Fast Ken Burns / auto-motion renderer for still-image segments.
+
+The generic path scales the whole image through MoviePy's resize on every
+frame and then lets the compositor place it. Here the image is upscaled once
+to the largest scale the motion reaches, and each output frame is a single
+sub-pixel crop-and-resample of that master straight to the canvas size.
+Parameters are the ones produced by ``services._auto_motion_parameters``.
+"""
+from __future__ import annotations
+
+import inspect
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from moviepy.editor import VideoClip
+except ModuleNotFoundError:  # moviepy>=2.0 removes the editor shim
+    from moviepy import VideoClip  # type: ignore
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional at import time
+    Image = None  # type: ignore
+
+_VIDEOCLIP_PARAMS = inspect.signature(VideoClip.__init__).parameters
+_FRAME_PARAM = "frame_function" if "frame_function" in _VIDEOCLIP_PARAMS else "make_frame"
+_MASK_PARAM = "is_mask" if "is_mask" in _VIDEOCLIP_PARAMS else "ismask"
+
+
+def available() -> bool:
+    return Image is not None
+
+
+class KenBurnsRenderer:
+    """Frames of a canvas-sized image zoomed and panned between two states.
+
+    ``center_*`` are offsets of the zoomed image's centre from the canvas
+    centre in canvas pixels, clamped so the image always covers the canvas.
+    """
+
+    def __init__(
+        self,
+        image: np.ndarray,
+        *,
+        duration: float,
+        scale_start: float,
+        scale_end: float,
+        center_start: Optional[Tuple[float, float]] = None,
+        center_end: Optional[Tuple[float, float]] = None,
+    ) -> None:
+        self.height, self.width = image.shape[:2]
+        self.duration = duration
+        self.scale_start = max(float(scale_start), 1.0)
+        self.scale_end = max(float(scale_end), 1.0)
+        self.center_start = center_start or (0.0, 0.0)
+        self.center_end = center_end or self.center_start
+
+        peak = max(self.scale_start, self.scale_end)
+        master = Image.fromarray(np.ascontiguousarray(image))
+        master_size = (int(math.ceil(self.width * peak)), int(math.ceil(self.height * peak)))
+        if master_size != master.size:
+            master = master.resize(master_size, Image.LANCZOS)
+        self.master = master
+        self.kx = master.size[0] / self.width
+        self.ky = master.size[1] / self.height
+        self._last_box: Optional[Tuple[float, float, float, float]] = None
+        self._last_frame: Optional[np.ndarray] = None
+
+    def box_at(self, t: float) -> Tuple[float, float, float, float]:
+        """Source window in master-image pixels that fills the canvas at ``t``."""
+        ratio = 1.0 if self.duration <= 0 else max(0.0, min(t / self.duration, 1.0))
+        scale = self.scale_start + (self.scale_end - self.scale_start) * ratio
+        margin_x = self.width * (scale - 1.0) / 2.0
+        margin_y = self.height * (scale - 1.0) / 2.0
+        cx = self.center_start[0] + (self.center_end[0] - self.center_start[0]) * ratio
+        cy = self.center_start[1] + (self.center_end[1] - self.center_start[1]) * ratio
+        cx = max(min(cx, margin_x), -margin_x)
+        cy = max(min(cy, margin_y), -margin_y)
+        left = (margin_x - cx) / scale
+        top = (margin_y - cy) / scale
+        return (
+            left * self.kx,
+            top * self.ky,
+            (left + self.width / scale) * self.kx,
+            (top + self.height / scale) * self.ky,
+        )
+
+    def frame_at(self, t: float) -> np.ndarray:
+        """RGB or RGBA ``(H, W, C)`` frame; identical consecutive windows reuse the last frame."""
+        box = tuple(round(value, 3) for value in self.box_at(t))
+        if box != self._last_box:
+            frame = self.master.resize((self.width, self.height), Image.BILINEAR, box=box)
+            self._last_frame = np.asarray(frame)
+            self._last_box = box
+        return self._last_frame
+
+
+def kenburns_clip(renderer: KenBurnsRenderer, fps: Optional[int] = None):
+    """Canvas-sized MoviePy clip (with a mask for RGBA sources) driven by ``renderer``."""
+    has_alpha = renderer.master.mode == "RGBA"
+
+    def rgb(t):
+        frame = renderer.frame_at(t)
+        return frame[:, :, :3] if has_alpha else frame
+
+    clip = VideoClip(**{_FRAME_PARAM: rgb}, duration=renderer.duration)
+    if has_alpha:
+        mask = VideoClip(
+            **{_FRAME_PARAM: lambda t: renderer.frame_at(t)[:, :, 3] / 255.0},
+            duration=renderer.duration,
+            **{_MASK_PARAM: True},
+        )
+        clip.mask = mask
+    if fps:
+        clip.fps = fps
+    return clip
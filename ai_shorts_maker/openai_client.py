@@ -1,6 +1,13 @@
-"""OpenAI helper utilities."""
+"""OpenAI helper utilities.
+
+Every call has a blocking and an ``*_async`` form. The async ones share the
+pooled ``AsyncOpenAI`` of ``async_openai`` (keep-alive, bounded concurrency,
+retries with backoff) and are what the web app awaits; both forms share
+prompts and the on-disk ``response_cache``.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -8,6 +15,10 @@ from typing import Optional
 
 from openai import OpenAI
 
+from . import async_openai
+from .response_cache import response_cache, response_key
+from .timings import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,25 +37,84 @@ class OpenAIShortsClient:
                 "OPENAI_API_KEY is not set. Export it or add it to a .env file."
             )
 
+        self.api_key = key
         self.client = OpenAI(api_key=key)
         self.script_model = script_model
         self.tts_model = tts_model
 
-    def generate_script(self, prompt: str, temperature: float = 0.8) -> str:
-        """Generate a script using the configured chat completion model."""
+    def _chat_key(self, messages: list[dict], temperature: float) -> str:
+        return response_key("chat", model=self.script_model, messages=messages, temperature=temperature)
+
+    def _speech_key(self, text: str, voice: str, audio_format: str) -> str:
+        return response_key("speech", model=self.tts_model, voice=voice, input=text, format=audio_format)
+
+    def _chat(self, messages: list[dict], temperature: float, cache: bool) -> str:
+        """Run a chat completion, answering from ``response_cache`` unless ``cache`` is False."""
+        key = self._chat_key(messages, temperature)
+        if cache:
+            cached = response_cache.get_text(key, kind="chat")
+            if cached is not None:
+                return cached
+        with span("openai.chat", count=1) as stage:
+            response = self.client.chat.completions.create(
+                model=self.script_model,
+                messages=messages,
+                temperature=temperature,
+            )
+            text = response.choices[0].message.content.strip()
+            stage.bytes = len(text.encode("utf-8"))
+        if cache:
+            response_cache.put_text(key, text, kind="chat")
+        return text
+
+    async def _chat_async(self, messages: list[dict], temperature: float, cache: bool) -> str:
+        """Async :meth:`_chat` over the shared connection pool."""
+        key = self._chat_key(messages, temperature)
+        # The cache is SQLite behind a lock; keep it off the event loop.
+        if cache:
+            cached = await asyncio.to_thread(response_cache.get_text, key, "chat")
+            if cached is not None:
+                return cached
+        with span("openai.chat", count=1) as stage:
+            response = await async_openai.request(
+                self.api_key,
+                lambda client: client.chat.completions.create(
+                    model=self.script_model,
+                    messages=messages,
+                    temperature=temperature,
+                ),
+                kind="chat",
+            )
+            text = response.choices[0].message.content.strip()
+            stage.bytes = len(text.encode("utf-8"))
+        if cache:
+            await asyncio.to_thread(response_cache.put_text, key, text, "chat")
+        return text
+
+    @staticmethod
+    def _script_messages(prompt: str) -> list[dict]:
+        return [
+            {
+                "role": "system",
+                "content": "You write concise, high-conversion short video scripts.",
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    def generate_script(self, prompt: str, temperature: float = 0.8, *, cache: bool = False) -> str:
+        """Generate a script using the configured chat completion model.
+
+        Scripts are sampled, so a repeated prompt gets a fresh take; pass
+        ``cache=True`` for deterministic uses (e.g. translation prompts).
+        """
         logger.debug("Requesting script from OpenAI model %s", self.script_model)
-        response = self.client.chat.completions.create(
-            model=self.script_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You write concise, high-conversion short video scripts.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=temperature,
-        )
-        script = response.choices[0].message.content.strip()
+        script = self._chat(self._script_messages(prompt), temperature, cache)
+        logger.debug("Received script with %d characters", len(script))
+        return script
+
+    async def generate_script_async(self, prompt: str, temperature: float = 0.8, *, cache: bool = False) -> str:
+        logger.debug("Requesting script from OpenAI model %s", self.script_model)
+        script = await self._chat_async(self._script_messages(prompt), temperature, cache)
         logger.debug("Received script with %d characters", len(script))
         return script
 
@@ -55,10 +125,45 @@ class OpenAIShortsClient:
         translation_mode: str,
         tone_hint: Optional[str] = None,
         prompt_hint: Optional[str] = None,
+        *,
+        cache: bool = True,
     ) -> str:
         """Translate text using the chat completion model."""
         logger.debug("Requesting translation to %s from model %s", target_lang, self.script_model)
+        messages = self._translation_messages(text_to_translate, target_lang, translation_mode, tone_hint, prompt_hint)
+        translated_text = self._chat(messages, 0.3, cache)  # Lower temperature for more consistent output
+
+        # Clean up common patterns that appear in responses
+        translated_text = self._clean_translation_response(translated_text, target_lang)
+
+        logger.debug("Received translation with %d characters", len(translated_text))
+        return translated_text
 
+    async def translate_text_async(
+        self,
+        text_to_translate: str,
+        target_lang: str,
+        translation_mode: str,
+        tone_hint: Optional[str] = None,
+        prompt_hint: Optional[str] = None,
+        *,
+        cache: bool = True,
+    ) -> str:
+        logger.debug("Requesting translation to %s from model %s", target_lang, self.script_model)
+        messages = self._translation_messages(text_to_translate, target_lang, translation_mode, tone_hint, prompt_hint)
+        translated_text = await self._chat_async(messages, 0.3, cache)
+        translated_text = self._clean_translation_response(translated_text, target_lang)
+        logger.debug("Received translation with %d characters", len(translated_text))
+        return translated_text
+
+    @staticmethod
+    def _translation_messages(
+        text_to_translate: str,
+        target_lang: str,
+        translation_mode: str,
+        tone_hint: Optional[str],
+        prompt_hint: Optional[str],
+    ) -> list[dict]:
         mode_map = {
             "literal": "Translate literally.",
             "adaptive": "Translate adaptively for a modern, natural-sounding video script.",
@@ -91,24 +196,13 @@ Original text: {text_to_translate}"""
         if prompt_hint:
             prompt += f"\n\nConsider this hint: {prompt_hint}"
 
-        response = self.client.chat.completions.create(
-            model=self.script_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a translator. Reply ONLY with the {target_lang_name} text. NO explanations. NO English. NO commentary. NO formatting.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,  # Lower temperature for more consistent output
-        )
-        translated_text = response.choices[0].message.content.strip()
-
-        # Clean up common patterns that appear in responses
-        translated_text = self._clean_translation_response(translated_text, target_lang)
-
-        logger.debug("Received translation with %d characters", len(translated_text))
-        return translated_text
+        return [
+            {
+                "role": "system",
+                "content": f"You are a translator. Reply ONLY with the {target_lang_name} text. NO explanations. NO English. NO commentary. NO formatting.",
+            },
+            {"role": "user", "content": prompt},
+        ]
 
     def _clean_translation_response(self, text: str, target_lang: str) -> str:
         """Clean up translation response to remove unwanted English explanations."""
@@ -177,26 +271,77 @@ Original text: {text_to_translate}"""
         voice: str,
         output_path: Path,
         audio_format: str = "mp3",
+        *,
+        cache: bool = True,
     ) -> Path:
         """Generate an audio narration using the TTS model."""
+        key = self._speech_key(text, voice, audio_format)
+        if cache and response_cache.copy_file(key, output_path, kind="speech"):
+            logger.debug("Reused cached narration for %s", output_path)
+            return output_path
+
         logger.debug(
             "Requesting TTS via model %s (voice=%s, format=%s)",
             self.tts_model,
             voice,
             audio_format,
         )
-        response = self.client.audio.speech.create(
-            model=self.tts_model,
-            voice=voice,
-            input=text,
-            response_format=audio_format,
-        )
+        with span("openai.tts", count=len(text)) as stage:
+            response = self.client.audio.speech.create(
+                model=self.tts_model,
+                voice=voice,
+                input=text,
+                response_format=audio_format,
+            )
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "wb") as fh:
+                for chunk in response.iter_bytes():
+                    fh.write(chunk)
+            stage.add_file(output_path)
+        if cache:
+            response_cache.put_file(key, output_path, kind="speech")
+
+        logger.debug("Saved narration to %s", output_path)
+        return output_path
 
-        with open(output_path, "wb") as fh:
-            for chunk in response.iter_bytes():
-                fh.write(chunk)
+    async def synthesize_voice_async(
+        self,
+        text: str,
+        voice: str,
+        output_path: Path,
+        audio_format: str = "mp3",
+        *,
+        cache: bool = True,
+    ) -> Path:
+        key = self._speech_key(text, voice, audio_format)
+        if cache and await asyncio.to_thread(response_cache.copy_file, key, output_path, "speech"):
+            logger.debug("Reused cached narration for %s", output_path)
+            return output_path
+
+        logger.debug(
+            "Requesting TTS via model %s (voice=%s, format=%s)",
+            self.tts_model,
+            voice,
+            audio_format,
+        )
+        with span("openai.tts", count=len(text)) as stage:
+            response = await async_openai.request(
+                self.api_key,
+                lambda client: client.audio.speech.create(
+                    model=self.tts_model,
+                    voice=voice,
+                    input=text,
+                    response_format=audio_format,
+                ),
+                kind="speech",
+            )
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(output_path.write_bytes, response.content)
+            stage.add_file(output_path)
+        if cache:
+            await asyncio.to_thread(response_cache.put_file, key, output_path, "speech")
 
         logger.debug("Saved narration to %s", output_path)
         return output_path
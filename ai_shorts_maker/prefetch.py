@@ -0,0 +1,98 @@
+"""Background warm-up of b-roll and music while a short's OpenAI calls run.
+
+In the pipelined generation mode the b-roll plan (shuffle seed and music
+track) is fixed before the script is requested. Only the length of the
+background depends on the narration, and ``plan_broll`` with one seed yields
+a prefix of the same order for any duration, so the assets a render will use
+can be prepared from a duration estimate: the target duration at first, the
+script length next, and the measured narration last. The worker refreshes the
+b-roll index, probes the planned videos (``media_reader.video_info``), frames
+the planned images into ``image_cache`` and decodes the music track for
+``audio_mix``. It only fills caches the render reads anyway, so the output is
+the same as without it.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Set
+
+from .audio_mix import prefetch_music
+from .broll_index import plan_broll
+from .media import MediaFactory
+from .media_reader import load_image_array, video_info
+
+logger = logging.getLogger(__name__)
+
+# Plan this much more than the estimate so a slightly longer narration is covered.
+ESTIMATE_MARGIN = 1.25
+# Rough narration speed used to turn a script into a duration estimate.
+CHARS_PER_SECOND = {"ko": 7.0, "ja": 7.0, "zh": 5.0}
+DEFAULT_CHARS_PER_SECOND = 15.0
+
+
+def estimate_narration_seconds(script_text: str, lang: str) -> float:
+    chars = len("".join(script_text.split()))
+    return chars / CHARS_PER_SECOND.get(lang, DEFAULT_CHARS_PER_SECOND)
+
+
+class BrollPrefetcher:
+    """Single background worker that warms the caches of one short's render."""
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broll-prefetch")
+        self._futures: List[Future] = []
+        self._warmed: Set[str] = set()
+        self._planned = 0.0
+        self._factory: Optional[MediaFactory] = None
+        self._seed: Optional[int] = None
+
+    def start(self, factory: MediaFactory, seed: int, music_path: Optional[Path], estimate: float) -> None:
+        self._factory = factory
+        self._seed = seed
+        if music_path is not None:
+            self._submit(prefetch_music, music_path)
+        self.warm(estimate)
+
+    def warm(self, duration: float) -> None:
+        """Prepare the b-roll planned for ``duration`` seconds (plus a margin)."""
+        if self._factory is None:
+            return
+        self._submit(self._warm_broll, duration * ESTIMATE_MARGIN)
+
+    def _submit(self, func, *args) -> None:
+        self._futures.append(self._executor.submit(func, *args))
+
+    def _warm_broll(self, duration: float) -> None:
+        if duration <= self._planned:
+            return
+        self._planned = duration
+        factory = self._factory
+        for entry, _ in plan_broll(factory.broll_index().refresh(), duration, seed=self._seed):
+            if entry.name in self._warmed:
+                continue
+            self._warmed.add(entry.name)
+            path = factory.broll_dir / entry.name
+            try:
+                if entry.kind == "image":
+                    load_image_array(path, factory.canvas_size)
+                else:
+                    video_info(path)
+            except (OSError, RuntimeError, ValueError) as exc:
+                logger.debug("Could not prefetch %s: %s", entry.name, exc)
+        logger.debug("Prefetched %d b-roll assets for %.1fs", len(self._warmed), duration)
+
+    def close(self) -> None:
+        """Wait for queued work; failures only cost the render the time they would have saved."""
+        for future in self._futures:
+            exc = future.exception()
+            if exc is not None:
+                logger.debug("B-roll prefetch failed: %s", exc)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BrollPrefetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
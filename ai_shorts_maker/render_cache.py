@@ -0,0 +1,115 @@
+"""Content-addressed cache of finished project renders.
+
+A render key hashes everything that determines the output file: the project
+metadata without bookkeeping fields, digests of every media file it reads and
+the renderer settings. Outputs are stored as ``{base_name}-render-{key}.mp4``
+so an unchanged project resolves to an existing file instead of re-rendering.
+Older outputs of the same project are garbage-collected least-recently-used
+first, bounded by a count and a byte budget.
+"""
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from .fingerprint import hash_payload
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a renderer change alters output for identical inputs.
+RENDER_CACHE_VERSION = 1
+KEY_LENGTH = 16
+DEFAULT_KEEP = int(os.getenv("SHORTS_RENDER_KEEP", "5"))
+DEFAULT_MAX_BYTES = int(os.getenv("SHORTS_RENDER_CACHE_MB", "4096")) * 1024 * 1024
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def render_key(payload: dict[str, Any]) -> str:
+    return hash_payload({"renderer": RENDER_CACHE_VERSION, **payload})[:KEY_LENGTH]
+
+
+@contextmanager
+def render_lock(key: str) -> Iterator[None]:
+    """Serialise renders of the same key so a double-submitted render waits and hits the cache."""
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        yield
+
+
+class RenderOutputCache:
+    """Finished renders of one project inside its output directory."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        base_name: str,
+        *,
+        keep: int = DEFAULT_KEEP,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.output_dir = output_dir
+        self.base_name = base_name
+        self.keep = max(keep, 1)
+        self.max_bytes = max_bytes
+
+    def path_for(self, key: str) -> Path:
+        return self.output_dir / f"{self.base_name}-render-{key}.mp4"
+
+    def partial_path(self, key: str) -> Path:
+        return self.output_dir / f"{self.base_name}-render-{key}.partial.mp4"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        try:
+            if path.stat().st_size <= 0:
+                return None
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def commit(self, key: str, partial: Path) -> Path:
+        path = self.path_for(key)
+        os.replace(partial, path)
+        return path
+
+    def evict(self, keep: Iterable[Path] = ()) -> int:
+        """Drop old renders beyond ``self.keep`` files or ``self.max_bytes``, oldest use first."""
+        protected = {Path(path).resolve() for path in keep}
+        pattern = str(self.output_dir / f"{glob.escape(self.base_name)}-render-*.mp4")
+        entries = []
+        for name in glob.glob(pattern):
+            path = Path(name)
+            if path.name.endswith(".partial.mp4"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort(reverse=True)
+        removed = 0
+        kept = 0
+        total = 0
+        for _mtime, size, path in entries:
+            if path.resolve() in protected or (kept < self.keep and total + size <= self.max_bytes):
+                kept += 1
+                total += size
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+        if removed:
+            logger.info("Removed %d old renders of %s", removed, self.base_name)
+        return removed
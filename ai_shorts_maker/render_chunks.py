@@ -0,0 +1,183 @@
+"""Incremental re-rendering backed by a per-project cache of encoded chunks.
+
+The visual track is cut into fixed, GOP-aligned chunks. Each chunk's cache key
+hashes every input that can affect its frames: the timeline entries and
+captions overlapping the chunk, the subtitle style and the global render
+settings. On a re-render only chunks whose key changed are encoded; the rest
+are stream-copied from the cache by the concat demuxer.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+from .fingerprint import hash_payload
+from .sharding import ClipBuilder, ShardSpec, concat_with_audio, plan_chunks, render_specs
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the MoviePy composition changes so stale chunks stop matching.
+RENDERER_VERSION = 1
+CHUNK_GOPS = 2
+DEFAULT_CACHE_BYTES = int(os.getenv("SHORTS_CHUNK_CACHE_MB", "2048")) * 1024 * 1024
+
+
+@dataclass
+class LayoutEntry:
+    """Something visible during ``[start, end)`` described by a JSON-able payload."""
+
+    start: float
+    end: float
+    payload: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class IncrementalStats:
+    chunks: int = 0
+    rendered: int = 0
+    reused: int = 0
+
+
+class ChunkCache:
+    """Directory of encoded files named by cache key, evicted least-recently-used first."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_BYTES, *, suffix: str = ".mp4") -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def partial_path(self, key: str) -> Path:
+        """A temp name for encoding ``key`` that no other process or thread shares."""
+        return self.directory / f"{key}.{os.getpid()}-{threading.get_ident()}.partial{self.suffix}"
+
+    def lookup(self, key: str) -> Optional[Path]:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def evict(self, keep: Iterable[str] = ()) -> int:
+        keep_names = {f"{key}{self.suffix}" for key in keep}
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{self.suffix}"):
+            # In-flight encodes share the suffix; their writers rename or remove them.
+            if path.name.endswith(f".partial{self.suffix}"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            total += stat.st_size
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path.name in keep_names:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Evicted %d cached files from %s", removed, self.directory)
+        return removed
+
+
+def chunk_keys(
+    specs: Sequence[ShardSpec],
+    entries: Sequence[LayoutEntry],
+    global_payload: dict[str, Any],
+) -> List[str]:
+    keys: List[str] = []
+    for spec in specs:
+        start, end = spec.start, spec.end
+        overlapping = [entry.payload for entry in entries if entry.start < end and entry.end > start]
+        keys.append(
+            hash_payload(
+                {
+                    "renderer": RENDERER_VERSION,
+                    "global": global_payload,
+                    "frames": [spec.start_frame, spec.frame_count, spec.fps],
+                    "entries": overlapping,
+                }
+            )
+        )
+    return keys
+
+
+def render_incremental(
+    builder: ClipBuilder,
+    builder_args: tuple,
+    *,
+    duration: float,
+    fps: int,
+    entries: Sequence[LayoutEntry],
+    global_payload: dict[str, Any],
+    cache: ChunkCache,
+    output_path: Path,
+    audio_path: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    video_filter: Optional[str] = None,
+    total_threads: Optional[int] = None,
+) -> IncrementalStats:
+    """Encode only the chunks missing from ``cache`` and join all chunks into ``output_path``."""
+    specs = plan_chunks(duration, fps, chunk_gops=CHUNK_GOPS)
+    keys = chunk_keys(specs, entries, global_payload)
+
+    jobs = []
+    pending: dict[str, Path] = {}
+    for spec, key in zip(specs, keys):
+        if key in pending or cache.lookup(key) is not None:
+            continue
+        partial = cache.partial_path(key)
+        pending[key] = partial
+        jobs.append((spec, partial))
+
+    try:
+        render_specs(
+            builder,
+            builder_args,
+            jobs,
+            max_workers=max_workers,
+            video_filter=video_filter,
+            total_threads=total_threads,
+        )
+        for key, partial in pending.items():
+            os.replace(partial, cache.path_for(key))
+    finally:
+        for partial in pending.values():
+            partial.unlink(missing_ok=True)
+
+    stats = IncrementalStats(chunks=len(specs), rendered=len(jobs), reused=len(specs) - len(jobs))
+    logger.info(
+        "Incremental render of %s: %d chunks, %d re-encoded, %d reused",
+        output_path.name,
+        stats.chunks,
+        stats.rendered,
+        stats.reused,
+    )
+    concat_with_audio(
+        [cache.path_for(key) for key in keys],
+        output_path,
+        audio_path=audio_path,
+        duration=duration,
+    )
+    cache.evict(keep=keys)
+    return stats
@@ -3,10 +3,14 @@ from __future__ import annotations
 
 import json
 import logging
+import shutil
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Optional
 
+from .checkpoints import run_dir
 from .models import ProjectMetadata, ProjectSummary, ProjectVersionInfo
 from .subtitles import write_srt_from_subtitles
 
@@ -16,6 +20,9 @@ OUTPUT_DIR = Path(__file__).resolve().parent / "outputs"
 METADATA_SUFFIX = ".metadata.json"
 LEGACY_SUFFIX = ".json"
 
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
 
 def metadata_path(base_name: str, output_dir: Optional[Path] = None) -> Path:
     directory = output_dir or OUTPUT_DIR
@@ -59,6 +66,15 @@ def list_projects(output_dir: Optional[Path] = None) -> List[ProjectSummary]:
     return summaries
 
 
+@contextmanager
+def project_lock(base_name: str) -> Iterator[None]:
+    """Serialise load-modify-save cycles on one project within this process."""
+    with _locks_guard:
+        lock = _locks.setdefault(base_name, threading.Lock())
+    with lock:
+        yield
+
+
 def load_project(base_name: str, output_dir: Optional[Path] = None) -> ProjectMetadata:
     directory = output_dir or OUTPUT_DIR
     file_path = metadata_path(base_name, directory)
@@ -175,6 +191,8 @@ def delete_project(base_name: str, output_dir: Optional[Path] = None) -> None:
         except OSError as exc:
             logger.warning("Failed to remove metadata file %s: %s", metadata_file, exc)
 
+    shutil.rmtree(run_dir(directory, base_name), ignore_errors=True)
+
 
 def list_versions(base_name: str, output_dir: Optional[Path] = None) -> List[ProjectVersionInfo]:
     directory = output_dir or OUTPUT_DIR
@@ -210,6 +228,22 @@ def list_versions(base_name: str, output_dir: Optional[Path] = None) -> List[Pro
     return versions
 
 
+def referenced_video_paths(base_name: str, output_dir: Optional[Path] = None) -> List[Path]:
+    """``video_path`` of the current metadata and every saved version of a project."""
+    directory = output_dir or OUTPUT_DIR
+    files = [metadata_path(base_name, directory)]
+    files.extend(sorted((directory / f"{base_name}_versions").glob("v*.metadata.json")))
+    paths: List[Path] = []
+    for file in files:
+        try:
+            data = json.loads(file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if isinstance(data, dict) and data.get("video_path"):
+            paths.append(Path(data["video_path"]))
+    return paths
+
+
 def load_project_version(base_name: str, version: int, output_dir: Optional[Path] = None) -> ProjectMetadata:
     directory = output_dir or OUTPUT_DIR
     version_path = directory / f"{base_name}_versions" / f"v{version}.metadata.json"
@@ -0,0 +1,121 @@
+"""Process-wide CPU budget shared by concurrent renders and analyses.
+
+Every x264 encode used to ask for ``os.cpu_count()`` threads and librosa /
+scikit-learn let their BLAS and OpenMP pools take every core, so a few jobs at
+once oversubscribed the machine several times over. Work that spins up thread
+pools now takes a lease from ``governor``: the configured cores
+(``SHORTS_CPU_CORES``, default all) are split between the active leases when
+each one starts, and what a lease gets is passed on as x264/ffmpeg
+``-threads`` or applied to native pools through threadpoolctl.
+
+A lease's budget is fixed when it starts (an encoder cannot change its thread
+count mid-stream), so a lease never gets more than the cores still free. So
+that the first job does not take every core and leave later ones a single
+thread for their whole encode, a lease is also capped at its share of the
+expected concurrency (``SHORTS_JOB_WORKERS``, the number of jobs the queue runs
+at once) even when it is the only one active.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # pragma: no cover - threadpoolctl ships with scikit-learn
+    threadpool_limits = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CPU_CORES = int(os.getenv("SHORTS_CPU_CORES", "0")) or os.cpu_count() or 4
+EXPECTED_CONCURRENCY = max(int(os.getenv("SHORTS_JOB_WORKERS", "1")), 1)
+
+
+@dataclass
+class Lease:
+    id: int
+    name: str
+    threads: int
+    weight: int = 1
+
+
+class ResourceGovernor:
+    """Hands out thread budgets so the active leases together stay within ``cores``."""
+
+    def __init__(self, cores: int = CPU_CORES, *, expected_concurrency: int = EXPECTED_CONCURRENCY) -> None:
+        self.cores = max(int(cores), 1)
+        self.expected_concurrency = max(int(expected_concurrency), 1)
+        self._leases: Dict[int, Lease] = {}
+        self._ids = count(1)
+        self._lock = threading.Lock()
+
+    def _grant(self, name: str, weight: int) -> Lease:
+        with self._lock:
+            allocated = sum(lease.threads for lease in self._leases.values())
+            total_weight = weight + sum(lease.weight for lease in self._leases.values())
+            fair = self.cores * weight // max(total_weight, self.expected_concurrency)
+            threads = max(min(fair, self.cores - allocated), 1)
+            lease = Lease(next(self._ids), name, threads, weight)
+            self._leases[lease.id] = lease
+        logger.debug("CPU lease %s: %d of %d threads (%d active)", name, threads, self.cores, len(self._leases))
+        return lease
+
+    def _release(self, lease: Lease) -> None:
+        with self._lock:
+            self._leases.pop(lease.id, None)
+
+    @contextmanager
+    def lease(self, name: str, *, weight: int = 1, blas: bool = False) -> Iterator[int]:
+        """Hold a thread budget for ``name`` and yield its size.
+
+        ``weight`` asks for a proportionally larger share (e.g. a render
+        running several encoder processes). With ``blas`` the BLAS/OpenMP
+        pools are limited to the budget while the lease is held; those limits
+        are process-wide, so concurrent ``blas`` leases share the smallest
+        recent limit rather than each getting their own.
+        """
+        lease = self._grant(name, max(int(weight), 1))
+        try:
+            limits = threadpool_limits(limits=lease.threads) if blas and threadpool_limits else nullcontext()
+            with limits:
+                yield lease.threads
+        finally:
+            self._release(lease)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            leases: List[Dict[str, Any]] = [asdict(lease) for lease in self._leases.values()]
+        return {
+            "cores": self.cores,
+            "expected_concurrency": self.expected_concurrency,
+            "allocated": sum(lease["threads"] for lease in leases),
+            "leases": leases,
+        }
+
+
+governor = ResourceGovernor()
+
+
+def governed(name: str, *, blas: bool = True) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator running the function under a ``governor`` lease (BLAS pools limited by default)."""
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with governor.lease(name, blas=blas):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def split_threads(total: Optional[int], workers: int) -> int:
+    """Threads per worker when ``workers`` processes share ``total`` (default: all cores)."""
+    return max(1, (total or CPU_CORES) // max(int(workers), 1))
@@ -0,0 +1,245 @@
+"""Content-addressed on-disk cache of OpenAI responses.
+
+Editors re-run translations and regenerate narration for unchanged text all
+the time, and every call used to go to the API. Responses are now keyed by a
+hash of everything that determines them (endpoint, model, voice, sampling
+parameters and the prompt/messages): text is stored in an SQLite table and
+audio as files named by key. Entries expire after ``SHORTS_OPENAI_CACHE_TTL_DAYS``
+and the least recently used ones are evicted above ``SHORTS_OPENAI_CACHE_MB``.
+Only reproducible calls (translation, TTS) use the cache by default; sampled
+scripts, lists, commentary and image stories are requested fresh unless the
+caller passes ``cache=True``.
+
+The database runs in WAL mode with a busy timeout and audio files are
+published with an atomic rename, so web workers, batch renderers and the
+keyword story app can share one cache directory. Hits and misses are counted
+in ``timings.registry`` (``openai_cache_requests_total``).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .fingerprint import hash_payload
+from .timings import registry
+
+logger = logging.getLogger(__name__)
+
+# Bump when the meaning of stored values changes so old entries stop matching.
+CACHE_VERSION = 1
+CACHE_DIR = Path(
+    os.getenv("SHORTS_OPENAI_CACHE_DIR", Path(__file__).resolve().parent / "outputs" / ".openai_cache")
+).expanduser()
+CACHE_TTL = float(os.getenv("SHORTS_OPENAI_CACHE_TTL_DAYS", "30")) * 86400
+CACHE_BYTES = int(os.getenv("SHORTS_OPENAI_CACHE_MB", "1024")) * 1024 * 1024
+CACHE_ENABLED = os.getenv("SHORTS_OPENAI_CACHE", "1") != "0"
+DB_FILENAME = "responses.sqlite3"
+# Eviction scans the whole table, so a process runs it at most every this many
+# stores or seconds; expired rows are also dropped when looked up.
+EVICT_EVERY_WRITES = 64
+EVICT_EVERY_SECONDS = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    text TEXT,
+    file TEXT,
+    bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def response_key(kind: str, **parts: Any) -> str:
+    """Key for a request; ``parts`` are everything that determines the response."""
+    return hash_payload({"version": CACHE_VERSION, "kind": kind, **parts})
+
+
+class ResponseCache:
+    """Text responses in SQLite, audio bodies as files, shared between processes."""
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        *,
+        ttl: float = CACHE_TTL,
+        max_bytes: int = CACHE_BYTES,
+        enabled: bool = CACHE_ENABLED,
+    ) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._last_evict = 0.0
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so each process opens its own.
+        if self._conn is None or self._pid != os.getpid():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.directory / DB_FILENAME),
+                timeout=30,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def _lookup(self, key: str, kind: str) -> Optional[tuple]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT text, file, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[2] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        registry.increment("openai_cache_requests_total", kind=kind, result="hit" if row is not None else "miss")
+        return row
+
+    def _store(self, key: str, kind: str, *, text: Optional[str] = None, file: Optional[str] = None, size: int) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, text, file, bytes, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, text, file, size, now, now),
+            )
+            self._writes += 1
+            due = self._writes >= EVICT_EVERY_WRITES or now - self._last_evict >= EVICT_EVERY_SECONDS
+            if due:
+                self._writes, self._last_evict = 0, now
+        if due:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the least recently used ones above ``max_bytes``."""
+        with self._lock:
+            conn = self._connection()
+            stale = conn.execute(
+                "SELECT key, file FROM responses WHERE created < ?", (time.time() - self.ttl,)
+            ).fetchall()
+            total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, file, size in conn.execute("SELECT key, file, bytes FROM responses ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key, file))
+                    total -= size
+            for key, _ in stale:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        for _, file in stale:
+            if file:
+                (self.directory / file).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+    def get_text(self, key: str, kind: str = "text") -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            row = self._lookup(key, kind)
+        except sqlite3.Error as exc:
+            logger.warning("OpenAI response cache lookup failed: %s", exc)
+            return None
+        return row[0] if row is not None else None
+
+    def put_text(self, key: str, text: str, kind: str = "text") -> None:
+        if not self.enabled:
+            return
+        try:
+            self._store(key, kind, text=text, size=len(text.encode("utf-8")))
+        except sqlite3.Error as exc:
+            logger.warning("Could not cache OpenAI response: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Audio
+    # ------------------------------------------------------------------
+    def get_file(self, key: str, kind: str = "audio") -> Optional[Path]:
+        if not self.enabled:
+            return None
+        try:
+            row = self._lookup(key, kind)
+        except sqlite3.Error as exc:
+            logger.warning("OpenAI response cache lookup failed: %s", exc)
+            return None
+        if row is None or not row[1]:
+            return None
+        path = self.directory / row[1]
+        # Another process may have evicted the file since the lookup.
+        return path if path.exists() else None
+
+    def read_bytes(self, key: str, kind: str = "audio") -> Optional[bytes]:
+        path = self.get_file(key, kind)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except OSError:  # evicted by another process after the lookup
+            return None
+
+    def copy_file(self, key: str, destination: Path, kind: str = "audio") -> bool:
+        """Copy the cached file for ``key`` to ``destination``; False on a miss."""
+        path = self.get_file(key, kind)
+        if path is None:
+            return False
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(path, destination)
+        except OSError:  # evicted by another process after the lookup
+            return False
+        return True
+
+    def put_file(self, key: str, source: Path, kind: str = "audio") -> None:
+        self._publish(key, source.suffix, kind, lambda partial: shutil.copyfile(source, partial))
+
+    def put_bytes(self, key: str, data: bytes, suffix: str, kind: str = "audio") -> None:
+        self._publish(key, suffix, kind, lambda partial: partial.write_bytes(data))
+
+    def _publish(self, key: str, suffix: str, kind: str, write: Callable[[Path], Any]) -> None:
+        """Write a body under a process-private name, rename it into place, then index it."""
+        if not self.enabled:
+            return
+        name = f"{key}{suffix}"
+        target = self.directory / name
+        partial = self.directory / f"{name}.{os.getpid()}.partial"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write(partial)
+            os.replace(partial, target)
+            self._store(key, kind, file=name, size=target.stat().st_size)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Could not cache OpenAI response: %s", exc)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses"
+            ).fetchone()
+        return {"enabled": self.enabled, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+
+response_cache = ResponseCache()
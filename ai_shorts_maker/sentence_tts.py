@@ -0,0 +1,73 @@
+"""Per-sentence narration: concurrent TTS requests joined with fixed gaps.
+
+Synthesising the whole script in one request makes narration latency grow
+with the script and leaves caption timing to a guess proportional to
+character counts. Here every sentence is requested on its own (at most
+``concurrency`` at a time) as raw PCM, so each clip's duration is exact
+(``bytes / (2 * TTS_PCM_RATE)``), and the clips are joined with silent gaps in
+one ffmpeg pass. The measured durations give the caption start/end times.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence
+
+from .ffmpeg_tools import run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+# OpenAI's ``pcm`` response format: 24 kHz, signed 16-bit little-endian, mono.
+TTS_PCM_RATE = 24000
+TTS_CONCURRENCY = int(os.getenv("SHORTS_TTS_CONCURRENCY", "4"))
+SENTENCE_GAP = 0.15
+
+
+@dataclass
+class SentenceClip:
+    text: str
+    path: Path
+    duration: float
+
+
+def synthesize_sentences(
+    client,
+    sentences: Sequence[str],
+    *,
+    voice: str,
+    work_dir: Path,
+    concurrency: int = TTS_CONCURRENCY,
+) -> List[SentenceClip]:
+    """Request every sentence's narration concurrently; clips come back in sentence order."""
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    def synthesize(index: int, text: str) -> SentenceClip:
+        path = work_dir / f"sentence_{index:04d}.pcm"
+        client.synthesize_voice(text=text, voice=voice, output_path=path, audio_format="pcm")
+        return SentenceClip(text, path, path.stat().st_size / (2 * TTS_PCM_RATE))
+
+    workers = max(1, min(int(concurrency), len(sentences)))
+    logger.info("Synthesizing %d sentences with %d concurrent requests", len(sentences), workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sentence-tts") as pool:
+        return list(pool.map(synthesize, range(len(sentences)), sentences))
+
+
+def concat_sentence_audio(clips: Sequence[SentenceClip], output_path: Path, *, gap: float = SENTENCE_GAP) -> float:
+    """Join ``clips`` with ``gap`` seconds of silence into ``output_path``; returns its duration."""
+    if not clips:
+        raise ValueError("No sentence audio to concatenate")
+    gap = max(float(gap), 0.0)
+    args: List[str] = []
+    chains: List[str] = []
+    for index, clip in enumerate(clips):
+        args.extend(["-f", "s16le", "-ar", str(TTS_PCM_RATE), "-ac", "1", "-i", str(clip.path)])
+        pad = f"apad=pad_dur={gap:.3f}" if gap and index < len(clips) - 1 else "anull"
+        chains.append(f"[{index}:a]{pad}[a{index}]")
+    labels = "".join(f"[a{index}]" for index in range(len(clips)))
+    graph = ";".join(chains) + f";{labels}concat=n={len(clips)}:v=0:a=1[out]"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    run_ffmpeg(args + ["-filter_complex", graph, "-map", "[out]", "-c:a", "libmp3lame", "-q:a", "2", str(output_path)])
+    return sum(clip.duration for clip in clips) + gap * (len(clips) - 1)
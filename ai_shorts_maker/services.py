@@ -1,10 +1,14 @@
 """Service layer for project editing operations."""
 from __future__ import annotations
 
+import io
+import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial, wraps
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 from uuid import uuid4
 
 import moviepy
@@ -78,7 +82,29 @@ def _with_opacity(clip, opacity: float):
         return clip.set_opacity(opacity)
     return clip
 
-from .media import MediaFactory, _resize_clip, _set_duration, _set_fps, _video_loop
+from .ass_subtitles import AssLayout, write_ass_file
+from .audio_mix import mux_audio
+from .clip_graph_cache import ClipGraphCache
+from .ffmpeg_render import (
+    FilterGraphUnsupported,
+    GraphSource,
+    ass_subtitle_filter,
+    compile_filtergraph,
+    render_filtergraph,
+    srt_subtitle_filter,
+)
+from .lazy_timeline import LazyEntry, LazyTimelineClip
+from .media import REFERENCE_CANVAS, MediaFactory, _resize_clip, _set_duration, _set_fps, _video_loop
+from .media_reader import image_cache, load_image_array, open_image_clip, open_video_clip
+from .motion import KenBurnsRenderer, available as motion_available, kenburns_clip
+from .fingerprint import file_digest
+from .hls_preview import HLS_PLAYLIST, hls_dir_for, write_with_hls
+from .jobs import moviepy_logger, report_progress
+from .render_cache import RenderOutputCache, render_key, render_lock
+from .resources import CPU_CORES, governor
+from .render_chunks import ChunkCache, LayoutEntry, render_incremental
+from .sharding import render_sharded
+from .timings import record_timings, span, timed_pipeline
 from .models import (
     ProjectMetadata,
     ProjectVersionInfo,
@@ -93,18 +119,81 @@ from .repository import (
     list_versions as repository_list_versions,
     load_project,
     load_project_version,
+    project_lock,
+    referenced_video_paths,
     save_project,
 )
 from .subtitles import captions_from_subtitle_lines, write_srt_from_subtitles
 
+logger = logging.getLogger(__name__)
+
 ASSETS_DIR = Path(__file__).resolve().parent / "assets"
 OUTPUT_DIR = Path(__file__).resolve().parent / "outputs"
 UNSET = object()
+RENDER_ENGINES = ("moviepy", "ffmpeg")
+SUBTITLE_RENDERERS = ("moviepy", "ass")
+# Timelines with at least this many segments render in long-form (lazy) mode; 0 keeps it opt-in.
+LAZY_TIMELINE_SEGMENTS = int(os.getenv("SHORTS_LAZY_TIMELINE_SEGMENTS", "0"))
+# Draft previews: quarter-area canvas, capped fps and a fast, low-quality encode.
+PREVIEW_CANVAS = (540, 960)
+PREVIEW_FPS = 15
+PREVIEW_PRESET = "ultrafast"
+PREVIEW_CRF = 30
+FRAME_GRAPH_PROJECTS = int(os.getenv("SHORTS_FRAME_GRAPH_PROJECTS", "4"))
+FRAME_JPEG_QUALITY = 85
+# The only ``extra`` entries a render writes; everything else belongs to the editor.
+RENDER_EXTRA_KEYS = ("timings", "hls_playlist")
+
+frame_graphs = ClipGraphCache(FRAME_GRAPH_PROJECTS)
 
 
 def _touch(metadata: ProjectMetadata) -> None:
     metadata.version += 1
     metadata.updated_at = datetime.utcnow()
+    frame_graphs.invalidate(metadata.base_name)
+
+
+def _edits_project(func: Callable[..., ProjectMetadata]) -> Callable[..., ProjectMetadata]:
+    """Run an editor operation on ``base_name`` under its project lock."""
+
+    @wraps(func)
+    def wrapper(base_name: str, *args: Any, **kwargs: Any) -> ProjectMetadata:
+        with project_lock(base_name):
+            return func(base_name, *args, **kwargs)
+
+    return wrapper
+
+
+def _update_latest(
+    base_name: str, apply: Callable[[ProjectMetadata], None], *, touch: bool = True
+) -> ProjectMetadata:
+    """Apply ``apply`` to the latest saved project under its lock and save it.
+
+    Renders run as background jobs; reloading keeps caption and timeline
+    edits saved while they ran.
+    """
+    with project_lock(base_name):
+        metadata = load_project(base_name)
+        apply(metadata)
+        if touch:
+            _touch(metadata)
+        return save_project(metadata)
+
+
+def _copy_render_outputs(
+    rendered: ProjectMetadata, target: ProjectMetadata, subtitle_renderer: Optional[str] = None
+) -> None:
+    """Copy the fields a render owns from the copy it rendered onto ``target``."""
+    target.video_path = rendered.video_path
+    target.duration = rendered.duration
+    target.audio_settings.music_track = rendered.audio_settings.music_track
+    if subtitle_renderer is not None:
+        target.subtitle_style.renderer = subtitle_renderer
+    for key in RENDER_EXTRA_KEYS:
+        if key in rendered.extra:
+            target.extra[key] = rendered.extra[key]
+        else:
+            target.extra.pop(key, None)
 
 
 def _round_time(value: Optional[float], *, digits: int = 1) -> Optional[float]:
@@ -116,6 +205,7 @@ def _round_time(value: Optional[float], *, digits: int = 1) -> Optional[float]:
         return None
 
 
+@_edits_project
 def add_subtitle(base_name: str, payload: SubtitleCreate) -> ProjectMetadata:
     metadata = load_project(base_name)
     start = _round_time(payload.start)
@@ -136,6 +226,7 @@ def add_subtitle(base_name: str, payload: SubtitleCreate) -> ProjectMetadata:
     return save_project(metadata)
 
 
+@_edits_project
 def update_subtitle(base_name: str, subtitle_id: str, payload: SubtitleUpdate) -> ProjectMetadata:
     metadata = load_project(base_name)
     target = next((sub for sub in metadata.captions if sub.id == subtitle_id), None)
@@ -160,6 +251,7 @@ def update_subtitle(base_name: str, subtitle_id: str, payload: SubtitleUpdate) -
     return save_project(metadata)
 
 
+@_edits_project
 def delete_subtitle_line(base_name: str, subtitle_id: str) -> ProjectMetadata:
     metadata = load_project(base_name)
     before = len(metadata.captions)
@@ -170,6 +262,7 @@ def delete_subtitle_line(base_name: str, subtitle_id: str) -> ProjectMetadata:
     return save_project(metadata)
 
 
+@_edits_project
 def replace_timeline(base_name: str, payload: TimelineUpdate) -> ProjectMetadata:
     metadata = load_project(base_name)
     metadata.timeline = payload.segments
@@ -177,6 +270,7 @@ def replace_timeline(base_name: str, payload: TimelineUpdate) -> ProjectMetadata
     return save_project(metadata)
 
 
+@_edits_project
 def update_audio_settings(
     base_name: str,
     *,
@@ -199,6 +293,7 @@ def update_audio_settings(
     return save_project(metadata)
 
 
+@_edits_project
 def update_subtitle_style(
     base_name: str,
     *,
@@ -213,7 +308,10 @@ def update_subtitle_style(
     banner_primary_font_size: Optional[int] | object = UNSET,
     banner_secondary_font_size: Optional[int] | object = UNSET,
     banner_line_spacing: Optional[int] | object = UNSET,
+    renderer: Optional[str] = None,
 ) -> ProjectMetadata:
+    if renderer is not None and renderer not in SUBTITLE_RENDERERS:
+        raise ValueError(f"Unknown subtitle renderer: {renderer}")
     metadata = load_project(base_name)
     style = metadata.subtitle_style
     if font_size is not None:
@@ -238,6 +336,8 @@ def update_subtitle_style(
         style.banner_secondary_font_size = banner_secondary_font_size
     if banner_line_spacing is not UNSET:
         style.banner_line_spacing = banner_line_spacing
+    if renderer is not None:
+        style.renderer = renderer
     _touch(metadata)
     return save_project(metadata)
 
@@ -380,9 +480,17 @@ def _auto_motion_parameters(
     }
 
 
-def _load_image_clip(path: Path) -> ImageClip:
-    """Load an image clip from disk with a Pillow fallback."""
+def _load_image_clip(path: Path, size: Optional[tuple[int, int]] = None) -> ImageClip:
+    """Load an image clip from disk with a Pillow fallback.
 
+    With ``size`` the image is framed for the canvas once at load time.
+    """
+
+    if size is not None and Image is not None:
+        try:
+            return open_image_clip(path, size)
+        except (OSError, ValueError):
+            pass
     try:
         return ImageClip(str(path))
     except (OSError, ValueError, RuntimeError) as original_exc:
@@ -404,47 +512,97 @@ def _load_image_clip(path: Path) -> ImageClip:
         return ImageClip(frame)
 
 
-def _segment_to_clip(
-    segment: TimelineSegment,
-    factory: MediaFactory,
-    fps: int,
-    fallback_color: tuple[int, int, int] = (15, 15, 20),
-) -> VideoFileClip:
-    duration = max(segment.end - segment.start, 0.1)
-    path = _resolve_media_path(segment.source)
-    is_auto_source = segment.source in {None, "", "auto"}
+@dataclass
+class SegmentMotion:
+    """Resolved scale/position animation of a timeline segment on the canvas."""
+
+    duration: float
+    canvas_size: tuple[int, int]
+    scale_start: float = 1.0
+    scale_end: float = 1.0
+    apply_scale: bool = False
+    pos_start: Any = None
+    pos_end: Any = None
+    center_start: Optional[tuple[float, float]] = None
+    center_end: Optional[tuple[float, float]] = None
+    use_auto: bool = False
+    alpha: Optional[float] = None
+
+    @property
+    def scale_animated(self) -> bool:
+        return self.apply_scale and abs(self.scale_end - self.scale_start) >= 1e-3
+
+    @property
+    def position_animated(self) -> bool:
+        return (
+            isinstance(self.pos_start, tuple)
+            and isinstance(self.pos_end, tuple)
+            and any(abs(a - b) > 1e-3 for a, b in zip(self.pos_start, self.pos_end))
+        )
 
-    clip = None
-    if path:
-        try:
-            if path.suffix.lower() in {".mp4", ".mov", ".mkv", ".webm"}:
-                clip = VideoFileClip(str(path))
-            elif path.suffix.lower() in {".jpg", ".jpeg", ".png"}:
-                clip = _load_image_clip(path)
-        except (OSError, ValueError, RuntimeError):
-            clip = None
+    def ratio(self, t: float) -> float:
+        if self.duration <= 0:
+            return 1.0
+        return max(0.0, min(t / self.duration, 1.0))
 
-    if clip is None:
-        if not is_auto_source:
-            raise RuntimeError(f"Media source not found or unreadable: {segment.source}")
-        clip = ColorClip(size=factory.canvas_size, color=fallback_color, duration=duration)
+    def scale_at(self, t: float) -> float:
+        if self.duration <= 0:
+            return self.scale_end
+        return self.scale_start + (self.scale_end - self.scale_start) * self.ratio(t)
 
-    clip = _resize_clip(clip, factory.canvas_size)
-    clip = _set_fps(clip, fps)
+    def center_to_top_left(self, scale_value: float, center_offset: tuple[float, float]) -> tuple[float, float]:
+        scale_value = max(scale_value, 1.0)
+        margin_x = self.canvas_size[0] * (scale_value - 1.0) / 2.0
+        margin_y = self.canvas_size[1] * (scale_value - 1.0) / 2.0
+        cx = max(min(center_offset[0], margin_x), -margin_x)
+        cy = max(min(center_offset[1], margin_y), -margin_y)
+        return (-margin_x + cx, -margin_y + cy)
 
-    clip_duration = getattr(clip, "duration", None)
-    if clip_duration is None:
-        if USE_WITH_DURATION and hasattr(clip, "with_duration"):
-            clip = clip.with_duration(duration)
-        else:
-            clip = _set_duration(clip, duration)
-    elif clip_duration > duration + 0.02:
-        clip = clip.subclip(0, duration)
-    elif clip_duration < duration - 0.02:
-        clip = _video_loop(clip, duration=duration)
+    def position_at(self, t: float):
+        if not self.position_animated:
+            return self.pos_start
+        if self.use_auto:
+            start_center = self.center_start or (0.0, 0.0)
+            end_center = self.center_end or start_center
+            ratio = self.ratio(t)
+            current_center = (
+                start_center[0] + (end_center[0] - start_center[0]) * ratio,
+                start_center[1] + (end_center[1] - start_center[1]) * ratio,
+            )
+            return self.center_to_top_left(self.scale_at(t), current_center)
+        if self.duration <= 0:
+            return self.pos_end
+        ratio = self.ratio(t)
+        x = self.pos_start[0] + (self.pos_end[0] - self.pos_start[0]) * ratio
+        y = self.pos_start[1] + (self.pos_end[1] - self.pos_start[1]) * ratio
+        return (x, y)
+
+
+def _as_float(value, default=None):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
 
-    clip = _set_duration(clip, duration)
 
+def _scale_position(position: Any, scale: float) -> Any:
+    """Scale numeric coordinates of a manual position; keywords like ``"center"`` stay as-is."""
+    if scale == 1.0 or not isinstance(position, tuple):
+        return position
+    return tuple(value * scale if isinstance(value, (int, float)) else value for value in position)
+
+
+def _segment_motion(
+    segment: TimelineSegment,
+    canvas_size: tuple[int, int],
+    geometry_scale: float = 1.0,
+) -> SegmentMotion:
+    """Resolve scale, position and opacity of ``segment`` from its extras.
+
+    Manual positions are stored in reference-canvas pixels and multiplied by
+    ``geometry_scale`` for smaller (preview) canvases.
+    """
+    duration = max(segment.end - segment.start, 0.1)
     extras = segment.extras if isinstance(segment.extras, dict) else {}
 
     position = extras.get("position")
@@ -453,6 +611,8 @@ def _segment_to_clip(
         position = tuple(position)
     if isinstance(position_end, list):
         position_end = tuple(position_end)
+    position = _scale_position(position, geometry_scale)
+    position_end = _scale_position(position_end, geometry_scale)
     is_image_segment = segment.media_type in {"image", "image_overlay"}
     auto_motion_enabled = extras.get("auto_motion", True)
     auto_mode = str(extras.get("auto_motion_mode", "kenburns") or "kenburns")
@@ -460,12 +620,6 @@ def _segment_to_clip(
     auto_base_scale = extras.get("auto_motion_base_scale", 1.1)
     auto_shift = extras.get("auto_motion_shift", None)
 
-    def _as_float(value, default=None):
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return default
-
     scale_start = extras.get("scale_start")
     scale_end = extras.get("scale_end")
     center_start = None
@@ -482,7 +636,7 @@ def _segment_to_clip(
         and not manual_position
     ):
         params = _auto_motion_parameters(
-            factory.canvas_size,
+            canvas_size,
             auto_mode,
             _as_float(auto_base_scale, 1.1) or 1.1,
             _as_float(auto_strength, 0.12) or 0.12,
@@ -493,50 +647,6 @@ def _segment_to_clip(
         scale_start = params.get("scale_start", scale_start)
         scale_end = params.get("scale_end", scale_end)
 
-    def _apply_scale_effect(target_clip, scale):
-        def _sanitize(value):
-            if callable(value):
-                def wrapper(t: float):
-                    result = value(t)
-                    try:
-                        return max(float(result), 1.0)
-                    except (TypeError, ValueError):
-                        return result
-
-                return wrapper
-            try:
-                return max(float(value), 1.0)
-            except (TypeError, ValueError):
-                return value
-
-        scale_clamped = _sanitize(scale)
-        if hasattr(target_clip, "with_effects") and ResizeEffect is not None:
-            try:
-                return target_clip.with_effects([ResizeEffect(new_size=scale_clamped)])
-            except Exception:
-                pass
-        if hasattr(target_clip, "resize"):
-            try:
-                return target_clip.resize(scale_clamped)
-            except Exception:
-                pass
-        if hasattr(target_clip, "resized"):
-            try:
-                return target_clip.resized(new_size=scale_clamped)
-            except Exception:
-                pass
-        if vfx is not None and hasattr(target_clip, "fx") and hasattr(vfx, "resize"):
-            try:
-                return target_clip.fx(vfx.resize, scale_clamped)
-            except Exception:
-                pass
-        return target_clip
-
-    if scale_start is None:
-        scale_start = extras.get("scale_start")
-    if scale_end is None:
-        scale_end = extras.get("scale_end")
-
     scale_start_val = _as_float(scale_start, None)
     scale_end_val = _as_float(scale_end, None)
     if scale_start_val is None and scale_end_val is None:
@@ -555,90 +665,156 @@ def _segment_to_clip(
         or scale_end_val != 1.0
     )
 
-    if apply_scale_effect:
+    motion = SegmentMotion(
+        duration=duration,
+        canvas_size=canvas_size,
+        scale_start=scale_start_val,
+        scale_end=scale_end_val,
+        apply_scale=apply_scale_effect,
+        center_start=center_start,
+        center_end=center_end,
+    )
+
+    if position is not None:
+        motion.pos_start = position
+        motion.pos_end = position_end if position_end is not None else position
+    elif center_start is not None or center_end is not None:
+        start_center = center_start or (0.0, 0.0)
+        end_center = center_end or start_center
+        motion.pos_start = motion.center_to_top_left(scale_start_val, start_center)
+        motion.pos_end = motion.center_to_top_left(scale_end_val, end_center)
+        motion.use_auto = True
+    else:
+        motion.pos_start = "center" if _is_overlay(segment) else (0.0, 0.0)
+        motion.pos_end = motion.pos_start
+
+    alpha = extras.get("alpha")
+    if alpha is not None:
+        motion.alpha = _as_float(alpha, None)
+
+    return motion
+
+
+def _apply_scale_effect(target_clip, scale):
+    def _sanitize(value):
+        if callable(value):
+            def wrapper(t: float):
+                result = value(t)
+                try:
+                    return max(float(result), 1.0)
+                except (TypeError, ValueError):
+                    return result
+
+            return wrapper
         try:
-            if abs(scale_end_val - scale_start_val) < 1e-3:
-                clip = _apply_scale_effect(clip, scale_start_val)
-            else:
-                def scale_func(t: float):
-                    if duration <= 0:
-                        return scale_end_val
-                    ratio = max(0.0, min(t / duration, 1.0))
-                    return scale_start_val + (scale_end_val - scale_start_val) * ratio
+            return max(float(value), 1.0)
+        except (TypeError, ValueError):
+            return value
 
-                clip = _apply_scale_effect(clip, scale_func)
+    scale_clamped = _sanitize(scale)
+    if hasattr(target_clip, "with_effects") and ResizeEffect is not None:
+        try:
+            return target_clip.with_effects([ResizeEffect(new_size=scale_clamped)])
         except Exception:
             pass
+    if hasattr(target_clip, "resize"):
+        try:
+            return target_clip.resize(scale_clamped)
+        except Exception:
+            pass
+    if hasattr(target_clip, "resized"):
+        try:
+            return target_clip.resized(new_size=scale_clamped)
+        except Exception:
+            pass
+    if vfx is not None and hasattr(target_clip, "fx") and hasattr(vfx, "resize"):
+        try:
+            return target_clip.fx(vfx.resize, scale_clamped)
+        except Exception:
+            pass
+    return target_clip
+
+
+def _auto_motion_clip(path: Path, motion: SegmentMotion, factory: MediaFactory, fps: int):
+    """Ken Burns clip of a still image rendered by ``KenBurnsRenderer`` instead of per-frame resizes."""
+    renderer = KenBurnsRenderer(
+        load_image_array(path, factory.canvas_size),
+        duration=motion.duration,
+        scale_start=motion.scale_start,
+        scale_end=motion.scale_end,
+        center_start=motion.center_start,
+        center_end=motion.center_end,
+    )
+    clip = _with_position(kenburns_clip(renderer, fps), (0, 0))
+    if motion.alpha is not None:
+        clip = _with_opacity(clip, motion.alpha)
+    return clip
 
-    def _center_to_top_left(scale_value: float, center_offset: tuple[float, float]):
-        scale_value = max(scale_value, 1.0)
-        margin_x = factory.canvas_size[0] * (scale_value - 1.0) / 2.0
-        margin_y = factory.canvas_size[1] * (scale_value - 1.0) / 2.0
-        cx = max(min(center_offset[0], margin_x), -margin_x)
-        cy = max(min(center_offset[1], margin_y), -margin_y)
-        return (-margin_x + cx, -margin_y + cy)
 
-    pos_start = None
-    pos_end = None
-    use_auto = False
+def _segment_to_clip(
+    segment: TimelineSegment,
+    factory: MediaFactory,
+    fps: int,
+    fallback_color: tuple[int, int, int] = (15, 15, 20),
+) -> VideoFileClip:
+    duration = max(segment.end - segment.start, 0.1)
+    path = _resolve_media_path(segment.source)
+    is_auto_source = segment.source in {None, "", "auto"}
 
-    if position is not None:
-        pos_start = position
-        pos_end = position_end if position_end is not None else pos_start
-    elif center_start is not None or center_end is not None:
-        start_center = center_start or (0.0, 0.0)
-        end_center = center_end or start_center
-        pos_start = _center_to_top_left(scale_start_val, start_center)
-        pos_end = _center_to_top_left(scale_end_val, end_center)
-        use_auto = True
-    else:
-        pos_start = "center" if _is_overlay(segment) else (0.0, 0.0)
-        pos_end = pos_start
+    motion = _segment_motion(segment, factory.canvas_size, factory.geometry_scale)
 
-    if isinstance(pos_start, tuple) and isinstance(pos_end, tuple) and any(abs(a - b) > 1e-3 for a, b in zip(pos_start, pos_end)):
-        if use_auto:
-            start_center = center_start or (0.0, 0.0)
-            end_center = center_end or start_center
+    clip = None
+    if path:
+        try:
+            if path.suffix.lower() in {".mp4", ".mov", ".mkv", ".webm"}:
+                clip = open_video_clip(path, factory.canvas_size, fps)
+            elif path.suffix.lower() in {".jpg", ".jpeg", ".png"}:
+                if motion.use_auto and motion_available():
+                    return _auto_motion_clip(path, motion, factory, fps)
+                clip = _load_image_clip(path, factory.canvas_size)
+        except (OSError, ValueError, RuntimeError):
+            clip = None
 
-            def pos_func(t: float):
-                if duration <= 0:
-                    ratio = 1.0
-                else:
-                    ratio = max(0.0, min(t / duration, 1.0))
-                scale_value = scale_start_val + (scale_end_val - scale_start_val) * ratio
-                current_center = (
-                    start_center[0] + (end_center[0] - start_center[0]) * ratio,
-                    start_center[1] + (end_center[1] - start_center[1]) * ratio,
-                )
-                return _center_to_top_left(scale_value, current_center)
+    if clip is None:
+        if not is_auto_source:
+            raise RuntimeError(f"Media source not found or unreadable: {segment.source}")
+        clip = ColorClip(size=factory.canvas_size, color=fallback_color, duration=duration)
 
-            clip = _with_position(clip, pos_func)
-        else:
-            def pos_func(t: float):
-                if duration <= 0:
-                    return pos_end
-                ratio = max(0.0, min(t / duration, 1.0))
-                x = pos_start[0] + (pos_end[0] - pos_start[0]) * ratio
-                y = pos_start[1] + (pos_end[1] - pos_start[1]) * ratio
-                return (x, y)
-
-            clip = _with_position(clip, pos_func)
-    else:
-        if isinstance(pos_start, tuple):
-            clip = _with_position(clip, tuple(pos_start))
+    clip = _resize_clip(clip, factory.canvas_size)
+    clip = _set_fps(clip, fps)
+
+    clip_duration = getattr(clip, "duration", None)
+    if clip_duration is None:
+        if USE_WITH_DURATION and hasattr(clip, "with_duration"):
+            clip = clip.with_duration(duration)
         else:
-            clip = _with_position(clip, pos_start)
+            clip = _set_duration(clip, duration)
+    elif clip_duration > duration + 0.02:
+        clip = clip.subclip(0, duration)
+    elif clip_duration < duration - 0.02:
+        clip = _video_loop(clip, duration=duration)
 
-    if pos_start is None and _is_overlay(segment):
-        clip = _with_position(clip, "center")
+    clip = _set_duration(clip, duration)
 
-    alpha = extras.get("alpha")
-    if alpha is not None:
+    if motion.apply_scale:
         try:
-            clip = _with_opacity(clip, float(alpha))
-        except (ValueError, TypeError):
+            if not motion.scale_animated:
+                clip = _apply_scale_effect(clip, motion.scale_start)
+            else:
+                clip = _apply_scale_effect(clip, motion.scale_at)
+        except Exception:
             pass
 
+    if motion.position_animated:
+        clip = _with_position(clip, motion.position_at)
+    elif isinstance(motion.pos_start, tuple):
+        clip = _with_position(clip, tuple(motion.pos_start))
+    else:
+        clip = _with_position(clip, motion.pos_start)
+
+    if motion.alpha is not None:
+        clip = _with_opacity(clip, motion.alpha)
+
     return clip
 
 
@@ -649,10 +825,7 @@ def _gap_clip(gap: float, factory: MediaFactory, fps: int) -> VideoFileClip:
     return _set_duration(filler, gap)
 
 
-def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadata:
-    metadata = load_project(base_name)
-    timeline_segments = sorted(metadata.timeline, key=lambda seg: seg.start)
-
+def _project_duration(metadata: ProjectMetadata, timeline_segments: List[TimelineSegment]) -> float:
     base_duration = metadata.duration
     if base_duration is None and timeline_segments:
         base_duration = max(seg.end for seg in timeline_segments)
@@ -660,7 +833,10 @@ def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadat
         base_duration = max(sub.end for sub in metadata.captions)
     if base_duration is None:
         base_duration = 1.0
+    return base_duration
+
 
+def _project_fps(metadata: ProjectMetadata, timeline_segments: List[TimelineSegment]) -> int:
     fps_candidates: List[int] = []
     for seg in timeline_segments:
         if isinstance(seg.extras, dict) and "fps" in seg.extras:
@@ -672,11 +848,18 @@ def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadat
         fps_hint = metadata.extra.get("fps")
         if isinstance(fps_hint, (int, float)):
             fps_candidates.append(int(fps_hint))
-    fps = fps_candidates[0] if fps_candidates else 24
+    return fps_candidates[0] if fps_candidates else 24
+
 
+def _project_factory(
+    metadata: ProjectMetadata,
+    fps: int,
+    canvas_size: tuple[int, int] = REFERENCE_CANVAS,
+) -> MediaFactory:
     style = metadata.subtitle_style
     factory = MediaFactory(
         ASSETS_DIR,
+        canvas_size=canvas_size,
         fps=fps,
         subtitle_font=style.font_path,
         subtitle_fontsize=style.font_size,
@@ -694,7 +877,43 @@ def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadat
         style.font_path = factory.subtitle_font
     if style.template != factory.layout_template:
         style.template = factory.layout_template
+    return factory
+
 
+def _music_override(metadata: ProjectMetadata) -> Optional[Path]:
+    if metadata.audio_settings.music_track:
+        return _resolve_media_path(metadata.audio_settings.music_track)
+    return None
+
+
+def _close_clips(clips) -> None:
+    for clip in clips:
+        try:
+            clip.close()
+        except Exception:
+            continue
+
+
+def _build_moviepy_visual(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    base_duration: float,
+    timeline_segments: List[TimelineSegment],
+    burn_subs: bool,
+    lazy: bool = False,
+) -> tuple[Any, List[Any]]:
+    """Compose the silent visual track; returns the clip and every clip to close afterwards."""
+    if lazy:
+        return _build_lazy_visual(
+            metadata,
+            factory=factory,
+            fps=fps,
+            base_duration=base_duration,
+            timeline_segments=timeline_segments,
+            burn_subs=burn_subs,
+        )
     base_segments = [seg for seg in timeline_segments if not _is_overlay(seg)]
     overlay_segments = [seg for seg in timeline_segments if _is_overlay(seg)]
 
@@ -731,6 +950,7 @@ def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadat
             timeline_clip = _set_fps(timeline_clip, fps)
 
         timeline_clip = _set_duration(timeline_clip, base_duration)
+        clip_pool.append(timeline_clip)
 
         for segment in overlay_segments:
             seg_duration = max(segment.end - segment.start, 0.0)
@@ -741,97 +961,792 @@ def render_project(base_name: str, *, burn_subs: bool = False) -> ProjectMetadat
             clip = _with_end(clip, segment.end)
             overlay_clips.append(clip)
             clip_pool.append(clip)
+
+        visual_clip = timeline_clip
+        if overlay_clips:
+            visual_clip = CompositeVideoClip([timeline_clip, *overlay_clips], size=factory.canvas_size)
+            clip_pool.append(visual_clip)
+
+        if burn_subs:
+            subtitles_iter = list(captions_from_subtitle_lines(metadata.captions))
+            visual_clip = factory.burn_subtitles(visual_clip, subtitles_iter)
+            clip_pool.append(visual_clip)
     except Exception:
-        for clip in clip_pool:
-            try:
-                clip.close()
-            except Exception:
-                pass
+        _close_clips(reversed(clip_pool))
         raise
 
-    voice_path = metadata.audio_settings.voice_path or metadata.audio_path
-    if not voice_path:
-        timeline_clip.close()
-        raise RuntimeError("Voice audio path is not defined in metadata")
+    return visual_clip, clip_pool
 
-    music_override = None
-    if metadata.audio_settings.music_track:
-        music_override = _resolve_media_path(metadata.audio_settings.music_track)
 
-    clip_with_audio = None
-    render_clip = None
-    composite_clip = None
-    try:
-        visual_clip = timeline_clip
-        if overlay_clips:
-            composite_clip = CompositeVideoClip([timeline_clip, *overlay_clips], size=factory.canvas_size)
-            visual_clip = composite_clip
-
-        clip_with_audio, selected_music = factory.attach_audio(
-            visual_clip,
-            Path(voice_path),
-            music_volume=metadata.audio_settings.music_volume,
-            ducking=metadata.audio_settings.ducking,
-            use_music=metadata.audio_settings.music_enabled,
-            music_path=music_override,
+def _use_lazy(timeline_segments: List[TimelineSegment]) -> bool:
+    return 0 < LAZY_TIMELINE_SEGMENTS <= len(timeline_segments)
+
+
+def _open_timeline_clip(
+    segment: TimelineSegment, factory: MediaFactory, fps: int, start: float, end: float, centered: bool
+):
+    clip = _segment_to_clip(segment, factory, fps)
+    if centered:
+        # concatenate_videoclips(method="compose") centres every base clip.
+        clip = _with_position(clip, "center")
+    clip = _with_start(clip, start)
+    return _with_end(clip, end)
+
+
+def _base_track_layout(
+    base_segments: List[TimelineSegment], base_duration: float
+) -> List[tuple[TimelineSegment, float, float]]:
+    """Where the concatenated base track shows each segment, as ``(segment, start, end)``.
+
+    Mirrors the cursor and ``_gap_clip`` logic of ``_build_moviepy_visual``:
+    clips run back to back, gaps are only filled up to a segment's start, and
+    each clip lasts ``max(end - start, 0.1)`` seconds, so overlapping segments
+    push later ones back exactly as the concatenation does.
+    """
+    layout: List[tuple[TimelineSegment, float, float]] = []
+    cursor = 0.0
+    position = 0.0
+    for segment in base_segments:
+        seg_duration = max(segment.end - segment.start, 0.0)
+        if seg_duration <= 0:
+            continue
+        if segment.start > cursor + 1e-3:
+            gap = segment.start - cursor
+            position += gap
+            cursor += gap
+        clip_duration = max(seg_duration, 0.1)
+        if position < base_duration:
+            layout.append((segment, position, position + clip_duration))
+        position += clip_duration
+        cursor = max(cursor, segment.end)
+    return layout
+
+
+def _fills_canvas(segment: TimelineSegment, factory: MediaFactory) -> bool:
+    """Whether a base segment shows as an unmoved, opaque, canvas-sized frame."""
+    motion = _segment_motion(segment, factory.canvas_size, factory.geometry_scale)
+    return (
+        not motion.apply_scale
+        and not motion.position_animated
+        and isinstance(motion.pos_start, tuple)
+        and all(abs(value) < 1e-6 for value in motion.pos_start)
+        and motion.alpha is None
+    )
+
+
+def _build_lazy_visual(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    base_duration: float,
+    timeline_segments: List[TimelineSegment],
+    burn_subs: bool,
+) -> tuple[Any, List[Any]]:
+    """Long-form variant of ``_build_moviepy_visual`` that opens segments only while on screen."""
+    base_segments = [seg for seg in timeline_segments if not _is_overlay(seg)]
+    overlay_segments = [seg for seg in timeline_segments if _is_overlay(seg)]
+    entries: List[LazyEntry] = []
+    layout = _base_track_layout(base_segments, base_duration)
+    for segment, start, end in layout:
+        entries.append(
+            LazyEntry(
+                start=start,
+                end=end,
+                opener=partial(_open_timeline_clip, segment, factory, fps, start, end, True),
+                direct=_fills_canvas(segment, factory),
+            )
+        )
+    for segment in overlay_segments:
+        if segment.end - segment.start <= 0:
+            continue
+        entries.append(
+            LazyEntry(
+                start=segment.start,
+                end=segment.end,
+                opener=partial(_open_timeline_clip, segment, factory, fps, segment.start, segment.end, False),
+            )
         )
+    # Gap fillers and the empty timeline use the same colours as the concat path.
+    has_base = any(seg.end - seg.start > 0 for seg in base_segments)
+    bg_color = (10, 12, 18) if has_base else (15, 15, 20)
+    visual_clip = LazyTimelineClip(
+        entries,
+        size=factory.canvas_size,
+        duration=base_duration,
+        fps=fps,
+        bg_color=bg_color,
+    )
+    clip_pool: List[Any] = [visual_clip]
+    if burn_subs:
+        try:
+            subtitles_iter = list(captions_from_subtitle_lines(metadata.captions))
+            visual_clip = factory.burn_subtitles(visual_clip, subtitles_iter)
+        except Exception:
+            _close_clips(reversed(clip_pool))
+            raise
+        clip_pool.append(visual_clip)
+    return visual_clip, clip_pool
+
+
+def _project_visual_builder(project: dict[str, Any], burn_subs: bool, lazy: bool = False) -> tuple[Any, Any]:
+    """Rebuild a project's visual track inside a shard worker process.
+
+    ``project`` is the metadata the render was keyed on, serialised; reading
+    the project from disk here could pick up an edit saved mid-render.
+    """
+    metadata = ProjectMetadata.model_validate(project)
+    timeline_segments = sorted(metadata.timeline, key=lambda seg: seg.start)
+    fps = _project_fps(metadata, timeline_segments)
+    visual_clip, clip_pool = _build_moviepy_visual(
+        metadata,
+        factory=_project_factory(metadata, fps),
+        fps=fps,
+        base_duration=_project_duration(metadata, timeline_segments),
+        timeline_segments=timeline_segments,
+        burn_subs=burn_subs,
+        lazy=lazy,
+    )
+    return visual_clip, lambda: _close_clips(reversed(clip_pool))
+
 
-        subtitles_iter = list(captions_from_subtitle_lines(metadata.captions))
-        render_clip = (
-            factory.burn_subtitles(clip_with_audio, subtitles_iter) if burn_subs else clip_with_audio
+def _chunk_layout(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    base_duration: float,
+    timeline_segments: List[TimelineSegment],
+    burn_subs: bool,
+) -> tuple[List[LayoutEntry], dict[str, Any]]:
+    """Describe every input by where it lands in the output, for chunk cache keys.
+
+    Placement mirrors ``_build_moviepy_visual``: base clips are concatenated
+    back to back, so a clip's effective start is the running sum of the clips
+    before it rather than its own ``start``.
+    """
+
+    def describe(segment: TimelineSegment) -> dict[str, Any]:
+        path = _resolve_media_path(segment.source)
+        return {
+            "segment": segment.model_dump(mode="json"),
+            "digest": file_digest(path) if path else None,
+        }
+
+    entries: List[LayoutEntry] = []
+    cursor = 0.0
+    placed = 0.0
+    for segment in timeline_segments:
+        seg_duration = max(segment.end - segment.start, 0.0)
+        if seg_duration <= 0:
+            continue
+        if _is_overlay(segment):
+            entries.append(LayoutEntry(segment.start, segment.end, {"overlay": describe(segment)}))
+            continue
+        if segment.start > cursor + 1e-3:
+            gap = segment.start - cursor
+            entries.append(LayoutEntry(placed, placed + gap, {"gap": [round(placed, 6), round(gap, 6)]}))
+            placed += gap
+            cursor += gap
+        clip_duration = max(seg_duration, 0.1)
+        entries.append(
+            LayoutEntry(placed, placed + clip_duration, {"base": describe(segment), "at": round(placed, 6)})
         )
+        placed += clip_duration
+        cursor = max(cursor, segment.end)
+
+    if cursor < base_duration - 1e-3:
+        tail = base_duration - placed
+        entries.append(LayoutEntry(placed, base_duration, {"gap": [round(placed, 6), round(tail, 6)]}))
+
+    global_payload: dict[str, Any] = {
+        "canvas": list(factory.canvas_size),
+        "fps": fps,
+        "burn_subs": burn_subs,
+    }
+    if burn_subs:
+        global_payload["subtitles"] = {
+            "style": metadata.subtitle_style.model_dump(mode="json"),
+            "font": file_digest(factory.subtitle_font) if factory.subtitle_font else None,
+            "banner": [factory.banner_primary_text, factory.banner_secondary_text],
+        }
+        for caption in metadata.captions:
+            entries.append(
+                LayoutEntry(caption.start, caption.end, {"caption": [caption.start, caption.end, caption.text]})
+            )
+    return entries, global_payload
 
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        video_filename = f"{metadata.base_name}-render-{timestamp}.mp4"
-        output_dir = Path(metadata.video_path).parent if metadata.video_path else OUTPUT_DIR
-        output_dir.mkdir(parents=True, exist_ok=True)
-        video_path = output_dir / video_filename
 
-        render_clip.write_videofile(
-            str(video_path),
+def _mix_project_audio(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    base_duration: float,
+    voice_path: Path,
+) -> tuple[Path, Optional[Path]]:
+    """Mix voice and music once for the full duration; returns the cached track and music used."""
+    audio_settings = metadata.audio_settings
+    with span("mix_audio") as stage:
+        audio_path, selected_music = factory.mix_audio(
+            voice_path,
+            duration=base_duration,
+            music_volume=audio_settings.music_volume,
+            ducking=audio_settings.ducking,
+            use_music=audio_settings.music_enabled,
+            music_path=_music_override(metadata),
+        )
+        stage.add_file(audio_path)
+    return audio_path, selected_music
+
+
+def _render_with_moviepy(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    base_duration: float,
+    timeline_segments: List[TimelineSegment],
+    voice_path: Path,
+    burn_subs: bool,
+    video_path: Path,
+    shards: int = 1,
+    incremental: bool = False,
+    lazy: bool = False,
+    video_filter: Optional[str] = None,
+    preset: str = "medium",
+    crf: Optional[int] = None,
+    hls_dir: Optional[Path] = None,
+    threads: int = CPU_CORES,
+) -> tuple[float, Optional[Path]]:
+    """Render with MoviePy; ``video_filter`` (e.g. burned ASS subtitles) runs in the encode pass.
+
+    MoviePy only produces the silent picture. The soundtrack is mixed once
+    (and cached) by ``MediaFactory.mix_audio`` and muxed with ``-c copy``.
+    With ``hls_dir`` the single-process encode also publishes a progressive
+    HLS preview there.
+    """
+    output_dir = video_path.parent
+    # Subtitles are composited in Python only when no encode-pass filter burns them.
+    burn_visual = burn_subs and video_filter is None
+    audio_path, selected_music = _mix_project_audio(
+        metadata,
+        factory=factory,
+        base_duration=base_duration,
+        voice_path=voice_path,
+    )
+
+    if shards > 1 or incremental:
+        if hls_dir is not None:
+            logger.info("HLS preview needs a single-process render; skipped for %s", metadata.base_name)
+        # Workers rebuild the visual track themselves, from this exact metadata.
+        builder_args = (metadata.model_dump(mode="json"), burn_visual, lazy)
+        if incremental:
+            entries, global_payload = _chunk_layout(
+                metadata,
+                factory=factory,
+                fps=fps,
+                base_duration=base_duration,
+                timeline_segments=timeline_segments,
+                burn_subs=burn_subs,
+            )
+            global_payload["video_filter"] = "ass" if video_filter else None
+            with span("encode", count=len(entries)) as stage:
+                render_incremental(
+                    _project_visual_builder,
+                    builder_args,
+                    duration=base_duration,
+                    fps=fps,
+                    entries=entries,
+                    global_payload=global_payload,
+                    cache=ChunkCache(output_dir / f"{metadata.base_name}_chunks"),
+                    output_path=video_path,
+                    audio_path=audio_path,
+                    max_workers=shards,
+                    video_filter=video_filter,
+                    total_threads=threads,
+                )
+                stage.add_file(video_path)
+        else:
+            with span("encode", count=shards) as stage:
+                render_sharded(
+                    _project_visual_builder,
+                    builder_args,
+                    duration=base_duration,
+                    fps=fps,
+                    shards=shards,
+                    output_path=video_path,
+                    audio_path=audio_path,
+                    preset=preset,
+                    video_filter=video_filter,
+                    total_threads=threads,
+                )
+                stage.add_file(video_path)
+        return base_duration, selected_music
+
+    with span("build_visual", count=len(timeline_segments)):
+        visual_clip, clip_pool = _build_moviepy_visual(
+            metadata,
+            factory=factory,
             fps=fps,
-            codec="libx264",
-            audio_codec="aac",
-            temp_audiofile=str(output_dir / f"{metadata.base_name}_temp_audio.m4a"),
-            remove_temp=True,
-            threads=os.cpu_count() or 4,
+            base_duration=base_duration,
+            timeline_segments=timeline_segments,
+            burn_subs=burn_visual,
+            lazy=lazy,
         )
+    silent_path = video_path.with_name(f"{video_path.stem}.video.mp4")
+    ffmpeg_params = ["-vf", video_filter] if video_filter else []
+    if crf is not None:
+        ffmpeg_params.extend(["-crf", str(crf)])
+    try:
+        with span("encode", count=int(base_duration * fps)) as stage:
+            if hls_dir is not None:
+                write_with_hls(
+                    visual_clip,
+                    silent_path,
+                    fps=fps,
+                    hls_dir=hls_dir,
+                    audio_path=audio_path,
+                    video_filter=video_filter,
+                    preset=preset,
+                    crf=crf,
+                    threads=threads,
+                )
+            else:
+                visual_clip.write_videofile(
+                    str(silent_path),
+                    fps=fps,
+                    codec="libx264",
+                    audio=False,
+                    preset=preset,
+                    threads=threads,
+                    ffmpeg_params=ffmpeg_params or None,
+                    logger=moviepy_logger(),
+                )
+            stage.add_file(silent_path)
+        report_progress(message="muxing audio")
+        with span("mux") as stage:
+            mux_audio(silent_path, audio_path, video_path, duration=base_duration)
+            stage.add_file(video_path)
+        return visual_clip.duration or base_duration, selected_music
+    finally:
+        _close_clips(reversed(clip_pool))
+        silent_path.unlink(missing_ok=True)
 
-        metadata.video_path = str(video_path)
-        metadata.duration = render_clip.duration or base_duration
-        metadata.audio_settings.music_track = (
-            str(selected_music) if selected_music else metadata.audio_settings.music_track
+
+def _graph_source(segment: TimelineSegment, factory: MediaFactory) -> GraphSource:
+    path = _resolve_media_path(segment.source)
+    motion = _segment_motion(segment, factory.canvas_size, factory.geometry_scale)
+    if path is not None:
+        suffix = path.suffix.lower()
+        if suffix in {".mp4", ".mov", ".mkv", ".webm"}:
+            return GraphSource("video", segment.start, segment.end, path=path, motion=motion)
+        if suffix in {".jpg", ".jpeg", ".png"}:
+            return GraphSource("image", segment.start, segment.end, path=path, motion=motion)
+    if segment.source not in {None, "", "auto"}:
+        raise RuntimeError(f"Media source not found or unreadable: {segment.source}")
+    return GraphSource("color", segment.start, segment.end, color=(15, 15, 20), motion=motion)
+
+
+def _render_with_ffmpeg(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    base_duration: float,
+    timeline_segments: List[TimelineSegment],
+    voice_path: Path,
+    burn_subs: bool,
+    video_path: Path,
+    video_filter: Optional[str] = None,
+    preset: str = "medium",
+    crf: Optional[int] = None,
+    threads: int = CPU_CORES,
+) -> tuple[float, Optional[Path]]:
+    if video_filter is None and burn_subs and metadata.captions and (
+        factory.subtitle_animation != "none" or factory.layout_template != "classic"
+    ):
+        raise FilterGraphUnsupported("Animated or banner subtitles")
+
+    base_sources: List[GraphSource] = []
+    overlay_sources: List[GraphSource] = []
+    cursor = 0.0
+    for segment in timeline_segments:
+        if max(segment.end - segment.start, 0.0) <= 0:
+            continue
+        if _is_overlay(segment):
+            overlay_sources.append(_graph_source(segment, factory))
+            continue
+        if segment.start > cursor + 1e-3:
+            base_sources.append(GraphSource("color", cursor, segment.start, color=(10, 12, 18)))
+            cursor = segment.start
+        base_sources.append(_graph_source(segment, factory))
+        cursor = max(cursor, segment.end)
+    if cursor < base_duration - 1e-3:
+        base_sources.append(GraphSource("color", cursor, base_duration, color=(10, 12, 18)))
+
+    # The graph only carries the premixed (cached) soundtrack so both engines
+    # duck the music identically.
+    audio_path, selected_music = _mix_project_audio(
+        metadata,
+        factory=factory,
+        base_duration=base_duration,
+        voice_path=voice_path,
+    )
+
+    video_filters: List[str] = [video_filter] if video_filter else []
+    srt_path: Optional[Path] = None
+    if video_filter is None and burn_subs and metadata.captions:
+        srt_path = video_path.parent / f"{metadata.base_name}_ffmpeg_subs.srt"
+        write_srt_from_subtitles(metadata.captions, srt_path)
+        video_filters.append(
+            srt_subtitle_filter(
+                srt_path,
+                canvas_size=factory.canvas_size,
+                font_path=factory.subtitle_font,
+                font_size=factory.subtitle_fontsize,
+                stroke_width=factory.subtitle_stroke_width,
+                y_offset=factory.subtitle_y_offset,
+                bottom_margin=factory.px(250),
+            )
         )
-        write_srt_from_subtitles(metadata.captions, Path(metadata.subtitles_path))
-        _touch(metadata)
-        return save_project(metadata)
+
+    with span("build_visual", count=len(base_sources) + len(overlay_sources)):
+        graph = compile_filtergraph(
+            canvas_size=factory.canvas_size,
+            fps=fps,
+            duration=base_duration,
+            base_sources=base_sources,
+            overlay_sources=overlay_sources,
+            audio_path=audio_path,
+            video_filters=video_filters,
+        )
+    try:
+        with span("encode", count=int(base_duration * fps)) as stage:
+            render_filtergraph(graph, video_path, fps=fps, threads=threads, preset=preset, crf=crf)
+            stage.add_file(video_path)
     finally:
-        if render_clip is not None:
-            try:
-                render_clip.close()
-            except Exception:
-                pass
-        if clip_with_audio is not None and clip_with_audio is not render_clip:
-            try:
-                clip_with_audio.close()
-            except Exception:
-                pass
-        if composite_clip is not None:
-            try:
-                composite_clip.close()
-            except Exception:
-                pass
+        if srt_path is not None:
+            srt_path.unlink(missing_ok=True)
+    return base_duration, selected_music
+
+
+def write_project_ass(
+    metadata: ProjectMetadata,
+    output_path: Optional[Path] = None,
+    *,
+    factory: Optional[MediaFactory] = None,
+) -> Path:
+    """Export the project's captions and subtitle style as an ``.ass`` script."""
+    timeline_segments = sorted(metadata.timeline, key=lambda seg: seg.start)
+    if factory is None:
+        factory = _project_factory(metadata, _project_fps(metadata, timeline_segments))
+    layout = AssLayout.from_style(
+        metadata.subtitle_style,
+        canvas_size=factory.layout_canvas,
+        font_path=factory.subtitle_font,
+        banner_primary=factory.banner_primary_text,
+        banner_secondary=factory.banner_secondary_text,
+    )
+    output_path = output_path or Path(metadata.subtitles_path).with_suffix(".ass")
+    return write_ass_file(
+        captions_from_subtitle_lines(metadata.captions),
+        layout,
+        output_path,
+        duration=_project_duration(metadata, timeline_segments),
+    )
+
+
+def _render_key(
+    metadata: ProjectMetadata,
+    *,
+    factory: MediaFactory,
+    fps: int,
+    timeline_segments: List[TimelineSegment],
+    voice_path: Path,
+    engine: str,
+    burn_subs: bool,
+    preview: bool = False,
+) -> str:
+    """Hash the full render input: metadata minus bookkeeping plus media file digests."""
+    exclude: dict[str, Any] = {
+        "version": True,
+        "created_at": True,
+        "updated_at": True,
+        "video_path": True,
+        "subtitles_path": True,
+        "script_path": True,
+        "script_text_path": True,
+        "extra": True,
+        "captions": {"__all__": {"created_at", "updated_at"}},
+    }
+    if not burn_subs:
+        exclude["captions"] = True
+        exclude["subtitle_style"] = True
+    media = {"voice": file_digest(voice_path)}
+    for segment in timeline_segments:
+        path = _resolve_media_path(segment.source)
+        if path is not None:
+            media[segment.source] = file_digest(path)
+    music_path = _music_override(metadata)
+    if music_path is not None:
+        media["music"] = file_digest(music_path)
+    if burn_subs and factory.subtitle_font:
+        media["font"] = file_digest(factory.subtitle_font)
+    extra_payload = {"preview": [PREVIEW_PRESET, PREVIEW_CRF]} if preview else {}
+    return render_key(
+        {
+            **extra_payload,
+            "engine": engine,
+            "burn_subs": burn_subs,
+            "fps": fps,
+            "canvas": list(factory.canvas_size),
+            "metadata": metadata.model_dump(mode="json", exclude=exclude),
+            "media": media,
+        }
+    )
+
+
+@timed_pipeline("render")
+def render_project(
+    base_name: str,
+    *,
+    burn_subs: bool = False,
+    engine: str = "moviepy",
+    shards: int = 1,
+    incremental: bool = False,
+    subtitle_renderer: Optional[str] = None,
+    lazy: Optional[bool] = None,
+    preview: bool = False,
+    hls: bool = False,
+) -> ProjectMetadata:
+    """Render the project video.
+
+    ``engine="ffmpeg"`` compiles the timeline into a single ffmpeg filtergraph
+    and falls back to MoviePy for features the compiler cannot express.
+    ``shards > 1`` renders the MoviePy path in parallel time ranges.
+    ``incremental=True`` reuses encoded chunks from earlier MoviePy renders and
+    only re-encodes the time ranges whose inputs changed.
+    ``subtitle_renderer="ass"`` (or ``subtitle_style.renderer``) burns captions
+    with libass in the encode pass instead of compositing them in MoviePy; an
+    explicit value is stored on the project.
+    ``lazy=True`` uses the long-form MoviePy timeline that opens segment clips
+    only while they are on screen; by default it is only used when
+    ``LAZY_TIMELINE_SEGMENTS`` is set and the timeline has that many segments.
+    ``preview=True`` renders a draft at ``PREVIEW_CANVAS`` and at most
+    ``PREVIEW_FPS`` with a fast x264 preset into a separate file recorded in
+    ``extra["preview_path"]``; ``video_path`` and the project version are left
+    untouched.
+    ``hls=True`` makes a MoviePy render also write a low-bitrate HLS (fMP4)
+    event playlist to ``outputs/{base_name}_hls/index.m3u8`` while encoding, so
+    the editor can start playback before the MP4 is finished.
+    ``extra["hls_playlist"]`` names it only while ``video_path`` is that render:
+    ffmpeg, sharded and incremental renders and cache hits of another render
+    clear it. Preview renders publish no playlist.
+
+    Outputs are content-addressed: when nothing that affects the video changed
+    since an earlier render, ``video_path`` is pointed at that file and no
+    rendering happens.
+    """
+    engine = (engine or "moviepy").lower()
+    if engine not in RENDER_ENGINES:
+        raise ValueError(f"Unknown render engine: {engine}")
+    if subtitle_renderer is not None and subtitle_renderer not in SUBTITLE_RENDERERS:
+        raise ValueError(f"Unknown subtitle renderer: {subtitle_renderer}")
+
+    metadata = load_project(base_name)
+    timeline_segments = sorted(metadata.timeline, key=lambda seg: seg.start)
+    base_duration = _project_duration(metadata, timeline_segments)
+    fps = _project_fps(metadata, timeline_segments)
+    if preview:
+        fps = min(fps, PREVIEW_FPS)
+        shards, incremental, hls = 1, False, False
+    factory = _project_factory(metadata, fps, PREVIEW_CANVAS if preview else REFERENCE_CANVAS)
+    if subtitle_renderer is not None:
+        metadata.subtitle_style.renderer = subtitle_renderer
+
+    voice_path = metadata.audio_settings.voice_path or metadata.audio_path
+    if not voice_path:
+        raise RuntimeError("Voice audio path is not defined in metadata")
+
+    # Pin the background track before hashing so a random pick does not make
+    # every render look different.
+    if metadata.audio_settings.music_enabled and not metadata.audio_settings.music_track:
+        picked = factory.pick_music_track()
+        if picked is not None:
+            metadata.audio_settings.music_track = str(picked)
+
+    output_dir = Path(metadata.video_path).parent if metadata.video_path else OUTPUT_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if preview:
+        cache = RenderOutputCache(output_dir, f"{metadata.base_name}-preview", keep=1)
+    else:
+        cache = RenderOutputCache(output_dir, metadata.base_name)
+    with span("render_key", count=len(timeline_segments)):
+        key = _render_key(
+            metadata,
+            factory=factory,
+            fps=fps,
+            timeline_segments=timeline_segments,
+            voice_path=Path(voice_path),
+            engine=engine,
+            burn_subs=burn_subs,
+            preview=preview,
+        )
+
+    def publish(latest: ProjectMetadata) -> None:
+        _copy_render_outputs(metadata, latest, subtitle_renderer)
+
+    with render_lock(key):
+        cached = cache.lookup(key)
+        if cached is not None:
+            logger.info("Render of %s is unchanged; reusing %s", base_name, cached.name)
+            if preview:
+                return _record_preview(metadata, cached)
+            # Captions are not part of the key without burn_subs; the sidecar SRT still follows them.
+            write_srt_from_subtitles(metadata.captions, Path(metadata.subtitles_path))
+            if metadata.video_path == str(cached):
+                return metadata
+            metadata.video_path = str(cached)
+            # The playlist on disk belongs to whichever render last published one.
+            metadata.extra.pop("hls_playlist", None)
+            record_timings(metadata.extra)
+            return _update_latest(base_name, publish)
+
+        video_filter = None
+        if burn_subs and metadata.captions and metadata.subtitle_style.renderer == "ass":
+            with span("ass_subtitles", count=len(metadata.captions)):
+                ass_path = write_project_ass(metadata, factory=factory)
+            video_filter = ass_subtitle_filter(ass_path, font_path=factory.subtitle_font)
+
+        report_progress(0.0, "rendering")
+        if not preview:
+            # Only a single-process MoviePy encode publishes a playlist; it is set again below.
+            metadata.extra.pop("hls_playlist", None)
+        partial_path = cache.partial_path(key)
+        render_kwargs = dict(
+            factory=factory,
+            fps=fps,
+            base_duration=base_duration,
+            timeline_segments=timeline_segments,
+            voice_path=Path(voice_path),
+            burn_subs=burn_subs,
+            video_path=partial_path,
+            video_filter=video_filter,
+            preset=PREVIEW_PRESET if preview else "medium",
+            crf=PREVIEW_CRF if preview else None,
+        )
         try:
-            timeline_clip.close()
-        except Exception:
-            pass
-        for clip in clip_pool:
-            try:
-                clip.close()
-            except Exception:
+            rendered = None
+            with governor.lease(f"render:{base_name}") as threads:
+                render_kwargs["threads"] = threads
+                if engine == "ffmpeg":
+                    try:
+                        rendered = _render_with_ffmpeg(metadata, **render_kwargs)
+                    except FilterGraphUnsupported as exc:
+                        logger.info("ffmpeg engine cannot render %s (%s); falling back to moviepy", base_name, exc)
+                if rendered is None:
+                    hls_dir = hls_dir_for(output_dir, cache.base_name) if hls else None
+                    if hls_dir is not None and shards <= 1 and not incremental:
+                        metadata.extra["hls_playlist"] = str(hls_dir / HLS_PLAYLIST)
+                    rendered = _render_with_moviepy(
+                        metadata,
+                        shards=max(int(shards or 1), 1),
+                        incremental=incremental,
+                        hls_dir=hls_dir,
+                        lazy=_use_lazy(timeline_segments) if lazy is None else lazy,
+                        **render_kwargs,
+                    )
+            video_path = cache.commit(key, partial_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+        duration, selected_music = rendered
+
+    if preview:
+        saved = _record_preview(metadata, video_path)
+        cache.evict(keep=[video_path])
+        return saved
+
+    metadata.video_path = str(video_path)
+    metadata.duration = duration
+    metadata.audio_settings.music_track = (
+        str(selected_music) if selected_music else metadata.audio_settings.music_track
+    )
+    record_timings(metadata.extra)
+    # Saving writes the sidecar SRT from the latest captions.
+    saved = _update_latest(base_name, publish)
+    # Saved versions may still point at older renders; keep those for restore.
+    cache.evict(keep=[video_path, *referenced_video_paths(metadata.base_name)])
+    logger.debug("Decoded image cache after %s: %s", base_name, image_cache.stats())
+    return saved
+
+
+def _frame_graph(metadata: ProjectMetadata, scale: float) -> tuple[Any, Any, float]:
+    """Build the captioned visual track at ``scale`` of the reference canvas for frame grabs."""
+    timeline_segments = sorted(metadata.timeline, key=lambda seg: seg.start)
+    fps = _project_fps(metadata, timeline_segments)
+    canvas = (
+        max(int(round(REFERENCE_CANVAS[0] * scale)), 2),
+        max(int(round(REFERENCE_CANVAS[1] * scale)), 2),
+    )
+    base_duration = _project_duration(metadata, timeline_segments)
+    visual_clip, clip_pool = _build_moviepy_visual(
+        metadata,
+        factory=_project_factory(metadata, fps, canvas),
+        fps=fps,
+        base_duration=base_duration,
+        timeline_segments=timeline_segments,
+        burn_subs=bool(metadata.captions),
+        lazy=_use_lazy(timeline_segments),
+    )
+    return visual_clip, lambda: _close_clips(reversed(clip_pool)), base_duration
+
+
+def render_frame(base_name: str, t: float, *, scale: float = 0.5, quality: int = FRAME_JPEG_QUALITY) -> bytes:
+    """Return a JPEG of the composed frame at ``t`` seconds.
+
+    The clip graph is built once per project version and scale and kept in
+    ``frame_graphs``; later frames only seek and encode. Captions are drawn by
+    the MoviePy compositor even for projects that burn them with libass.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to render preview frames")
+    if not 0 < scale <= 1:
+        raise ValueError("scale must be in (0, 1]")
+    scale = round(scale, 3)
+    for _attempt in range(2):
+        metadata = load_project(base_name)
+        graph = frame_graphs.get(
+            (base_name, scale),
+            (metadata.version, str(metadata.updated_at)),
+            lambda: _frame_graph(metadata, scale),
+        )
+        with graph.lock:
+            if graph.closed:
+                # Invalidated between lookup and use; rebuild from the new version.
                 continue
+            position = min(max(float(t), 0.0), max(graph.duration - 1e-3, 0.0))
+            frame = graph.clip.get_frame(position)
+        break
+    else:
+        raise RuntimeError(f"Project {base_name} changed while rendering a frame; retry")
+
+    buffer = io.BytesIO()
+    Image.fromarray(frame[:, :, :3].astype("uint8", copy=False)).save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _record_preview(metadata: ProjectMetadata, preview_path: Path) -> ProjectMetadata:
+    """Remember the draft render without bumping the project version."""
+    if metadata.extra.get("preview_path") == str(preview_path):
+        return metadata
+
+    def apply(latest: ProjectMetadata) -> None:
+        latest.extra["preview_path"] = str(preview_path)
+
+    return _update_latest(metadata.base_name, apply, touch=False)
 
 
+@_edits_project
 def restore_project_version(base_name: str, version: int) -> ProjectMetadata:
     metadata = load_project_version(base_name, version, OUTPUT_DIR)
     _touch(metadata)
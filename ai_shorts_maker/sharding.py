@@ -0,0 +1,245 @@
+"""Time-sharded parallel rendering joined with the ffmpeg concat demuxer.
+
+MoviePy generates frames in a single Python thread, so one render cannot use
+more than a core or two no matter how many x264 threads are configured. The
+helpers here split the output duration into frame-aligned ranges, render each
+range in its own process with identical encoder parameters, and join the
+pieces with ``-c copy``. Audio is mixed once for the whole duration by the
+caller and muxed in the final concat so shard boundaries never click.
+"""
+from __future__ import annotations
+
+import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .ffmpeg_tools import run_ffmpeg
+from .jobs import report_progress
+from .resources import split_threads
+
+logger = logging.getLogger(__name__)
+
+# Keyframe interval in seconds. Shard boundaries are rounded to multiples of
+# it so the concatenated stream keeps a regular GOP structure.
+GOP_SECONDS = 2
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    index: int
+    start_frame: int
+    frame_count: int
+    fps: int
+
+    @property
+    def start(self) -> float:
+        return self.start_frame / self.fps
+
+    @property
+    def end(self) -> float:
+        return (self.start_frame + self.frame_count) / self.fps
+
+
+# A builder returns ``(clip, cleanup)`` for the full-length visual track. It
+# must be a module-level function so worker processes can unpickle it.
+ClipBuilder = Callable[..., Tuple[Any, Callable[[], None]]]
+
+
+@dataclass
+class ShardTask:
+    builder: ClipBuilder
+    builder_args: tuple
+    spec: ShardSpec
+    output_path: Path
+    threads: int
+    preset: str = "medium"
+    video_filter: Optional[str] = None
+
+
+def plan_shards(duration: float, fps: int, shards: int, *, gop_seconds: int = GOP_SECONDS) -> List[ShardSpec]:
+    """Split ``duration`` into at most ``shards`` GOP-aligned frame ranges."""
+    total_frames = max(int(round(duration * fps)), 1)
+    gop = max(int(gop_seconds * fps), 1)
+    gops_total = -(-total_frames // gop)
+    shards = max(1, min(shards, gops_total))
+    gops_per_shard = -(-gops_total // shards)
+
+    specs: List[ShardSpec] = []
+    start = 0
+    while start < total_frames:
+        count = min(gops_per_shard * gop, total_frames - start)
+        specs.append(ShardSpec(index=len(specs), start_frame=start, frame_count=count, fps=fps))
+        start += count
+    return specs
+
+
+def plan_chunks(duration: float, fps: int, *, chunk_gops: int, gop_seconds: int = GOP_SECONDS) -> List[ShardSpec]:
+    """Split ``duration`` into fixed-size ranges of ``chunk_gops`` GOPs (the last one may be shorter)."""
+    total_frames = max(int(round(duration * fps)), 1)
+    chunk_frames = max(int(gop_seconds * fps), 1) * max(chunk_gops, 1)
+    return [
+        ShardSpec(index=idx, start_frame=start, frame_count=min(chunk_frames, total_frames - start), fps=fps)
+        for idx, start in enumerate(range(0, total_frames, chunk_frames))
+    ]
+
+
+def encoder_params(fps: int, *, gop_seconds: int = GOP_SECONDS) -> List[str]:
+    """x264 options shared by every shard so the pieces can be stream-copied together."""
+    gop = max(int(gop_seconds * fps), 1)
+    return [
+        "-g",
+        str(gop),
+        "-keyint_min",
+        str(gop),
+        "-sc_threshold",
+        "0",
+        "-pix_fmt",
+        "yuv420p",
+    ]
+
+
+def _render_shard(task: ShardTask) -> Path:
+    from .media import _subclip
+
+    clip, cleanup = task.builder(*task.builder_args)
+    spec = task.spec
+    ffmpeg_params = encoder_params(spec.fps)
+    if task.video_filter:
+        # Shift to timeline time so time-based filters (e.g. burned ASS
+        # subtitles) line up, then restore zero-based timestamps for concat.
+        ffmpeg_params += ["-vf", f"setpts=PTS+{spec.start:.6f}/TB,{task.video_filter},setpts=PTS-STARTPTS"]
+    try:
+        # MoviePy emits frames at t = start + i/fps while t < end; ending half a
+        # frame early yields exactly ``frame_count`` frames despite float error.
+        piece = _subclip(clip, spec.start, spec.start + (spec.frame_count - 0.5) / spec.fps)
+        piece.write_videofile(
+            str(task.output_path),
+            fps=spec.fps,
+            codec="libx264",
+            audio=False,
+            preset=task.preset,
+            threads=task.threads,
+            ffmpeg_params=ffmpeg_params,
+            logger=None,
+        )
+    finally:
+        cleanup()
+    return task.output_path
+
+
+def concat_with_audio(
+    pieces: Sequence[Path],
+    output_path: Path,
+    *,
+    audio_path: Optional[Path] = None,
+    duration: Optional[float] = None,
+) -> Path:
+    """Join encoded pieces with the concat demuxer and mux ``audio_path`` without re-encoding video."""
+    list_path = output_path.with_suffix(".concat.txt")
+    lines = []
+    for piece in pieces:
+        escaped = str(Path(piece).resolve()).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    args: List[str] = ["-f", "concat", "-safe", "0", "-i", str(list_path)]
+    if audio_path is not None:
+        args.extend(["-i", str(audio_path), "-map", "0:v:0", "-map", "1:a:0"])
+    args.extend(["-c", "copy"])
+    if duration is not None:
+        args.extend(["-t", f"{duration:.3f}"])
+    args.extend(["-movflags", "+faststart", str(output_path)])
+    try:
+        run_ffmpeg(args)
+    finally:
+        list_path.unlink(missing_ok=True)
+    return output_path
+
+
+def render_specs(
+    builder: ClipBuilder,
+    builder_args: tuple,
+    jobs: Sequence[Tuple[ShardSpec, Path]],
+    *,
+    max_workers: Optional[int] = None,
+    preset: str = "medium",
+    video_filter: Optional[str] = None,
+    total_threads: Optional[int] = None,
+) -> List[Path]:
+    """Render each ``(spec, output_path)`` pair in a worker process.
+
+    ``total_threads`` (default all cores) is split between the workers' encoders.
+    """
+    if not jobs:
+        return []
+    workers = max(1, min(max_workers or len(jobs), len(jobs)))
+    threads = split_threads(total_threads, workers)
+    tasks = [
+        ShardTask(
+            builder=builder,
+            builder_args=builder_args,
+            spec=spec,
+            output_path=path,
+            threads=threads,
+            preset=preset,
+            video_filter=video_filter,
+        )
+        for spec, path in jobs
+    ]
+    logger.info(
+        "Rendering %d time ranges with %d workers (%d threads each)",
+        len(tasks),
+        workers,
+        threads,
+    )
+    pieces: List[Path] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for piece in pool.map(_render_shard, tasks):
+                pieces.append(piece)
+                report_progress(len(pieces) / len(tasks))
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return pieces
+
+
+def render_sharded(
+    builder: ClipBuilder,
+    builder_args: tuple,
+    *,
+    duration: float,
+    fps: int,
+    shards: int,
+    output_path: Path,
+    audio_path: Optional[Path] = None,
+    work_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    preset: str = "medium",
+    video_filter: Optional[str] = None,
+    total_threads: Optional[int] = None,
+) -> Path:
+    """Render ``builder``'s clip in parallel time shards and write ``output_path``."""
+    specs = plan_shards(duration, fps, shards)
+    work_dir = work_dir or output_path.parent / f"{output_path.stem}_shards"
+    work_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(spec, work_dir / f"shard-{spec.index:04d}.mp4") for spec in specs]
+    logger.info("Rendering %s in %d shards", output_path.name, len(jobs))
+    try:
+        pieces = render_specs(
+            builder,
+            builder_args,
+            jobs,
+            max_workers=max_workers,
+            preset=preset,
+            video_filter=video_filter,
+            total_threads=total_threads,
+        )
+        concat_with_audio(pieces, output_path, audio_path=audio_path, duration=duration)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return output_path
+
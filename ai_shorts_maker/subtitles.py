@@ -53,6 +53,16 @@ def allocate_caption_timings(sentences: List[str], total_duration: float) -> Lis
     return captions
 
 
+def captions_from_durations(sentences: List[str], durations: List[float], gap: float = 0.0) -> List[CaptionLine]:
+    """Back-to-back captions from measured per-sentence narration durations and the gap between them."""
+    captions: List[CaptionLine] = []
+    cursor = 0.0
+    for sentence, duration in zip(sentences, durations):
+        captions.append(CaptionLine(start=cursor, end=cursor + duration, text=sentence))
+        cursor += duration + gap
+    return captions
+
+
 def captions_to_srt(captions: Iterable[CaptionLine]) -> str:
     blocks = [caption.to_srt_block(idx + 1) for idx, caption in enumerate(captions)]
     return "\n".join(blocks)
@@ -0,0 +1,310 @@
+"""Pillow/FreeType text rasterizer for burned-in subtitles and banners.
+
+Replaces MoviePy's ``TextClip`` (an ImageMagick subprocess per caption) with
+in-process rendering into RGBA bitmaps. Bitmaps are cached in memory and on
+disk keyed by everything that affects their pixels, so re-rendering a project
+only rasterizes captions whose text or style changed.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # pragma: no cover - Pillow is optional at import time
+    Image = ImageDraw = ImageFont = None  # type: ignore
+
+from .fingerprint import hash_payload
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(
+    os.getenv("SHORTS_TEXT_CACHE_DIR", Path(__file__).resolve().parent / "outputs" / ".text_cache")
+).expanduser()
+MEMORY_CACHE_ENTRIES = 512
+# Bitmaps are uncompressed RGBA (about 1 MB for a full-width caption), so the
+# disk cache is trimmed to this size, least recently used first.
+CACHE_BYTES = int(os.getenv("SHORTS_TEXT_CACHE_MB", "256")) * 1024 * 1024
+# Trimming walks the whole directory; run it at most every this many writes or seconds.
+EVICT_EVERY_WRITES = 64
+EVICT_EVERY_SECONDS = 300.0
+
+# Characters that must not begin a line (closing brackets and punctuation).
+_NO_LINE_START = set("、。，．,.!?！？:;：；)]}）］｝」』】〉》〕…~ー%")
+
+_memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_memory_lock = threading.Lock()
+_disk_writes = 0
+_last_evict = 0.0
+
+
+@dataclass(frozen=True)
+class TextStyle:
+    font_path: Optional[str]
+    font_size: int
+    color: str = "white"
+    stroke_color: str = "black"
+    stroke_width: int = 0
+    max_width: Optional[int] = None
+    line_spacing: int = 4
+
+
+def available() -> bool:
+    return Image is not None
+
+
+@lru_cache(maxsize=32)
+def _load_font(font_path: Optional[str], size: int):
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            logger.warning("Could not load font %s; using Pillow default", font_path)
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def _breaks_anywhere(char: str) -> bool:
+    """Han and kana may wrap between any two characters; Hangul and Latin wrap at spaces."""
+    if unicodedata.east_asian_width(char) not in {"W", "F"}:
+        return False
+    name = unicodedata.name(char, "")
+    return not name.startswith("HANGUL")
+
+
+def _tokenize(paragraph: str) -> List[str]:
+    """Split into wrap units: spaces, words, and single Han/kana characters."""
+    tokens: List[str] = []
+    for char in paragraph:
+        if char.isspace():
+            tokens.append(" ")
+        elif char in _NO_LINE_START and tokens and tokens[-1] != " ":
+            tokens[-1] += char
+        elif (
+            not tokens
+            or tokens[-1] == " "
+            or _breaks_anywhere(char)
+            or _breaks_anywhere(tokens[-1][-1])
+        ):
+            tokens.append(char)
+        else:
+            tokens[-1] += char
+    return tokens
+
+
+def _split_to_width(text: str, font, limit: float) -> Tuple[str, str]:
+    cut = 1
+    while cut < len(text) and font.getlength(text[: cut + 1]) <= limit:
+        cut += 1
+    return text[:cut], text[cut:]
+
+
+def wrap_text(text: str, font, max_width: Optional[int], stroke_width: int = 0) -> List[str]:
+    """Greedy line wrapping that breaks Latin/Hangul at spaces and Han/kana between characters."""
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        if max_width is None:
+            lines.append(paragraph.strip())
+            continue
+        limit = max(max_width - 2 * stroke_width, 1)
+        current = ""
+        for token in _tokenize(paragraph):
+            candidate = current + token
+            if not current.strip() or font.getlength(candidate.rstrip()) <= limit:
+                current = candidate
+            else:
+                lines.append(current.strip())
+                current = token.lstrip()
+            # A single word wider than the line is broken between characters.
+            while len(current.strip()) > 1 and font.getlength(current.strip()) > limit:
+                head, current = _split_to_width(current.strip(), font, limit)
+                lines.append(head)
+        lines.append(current.strip())
+    return lines
+
+
+@dataclass
+class TextLayout:
+    lines: List[str]
+    widths: List[int]
+    width: int
+    height: int
+    line_height: int
+    font_height: int  # ascent + descent at ``font_size``, without stroke
+
+
+def layout_text(text: str, style: TextStyle) -> Optional[TextLayout]:
+    """Wrap and measure ``text`` without drawing it; ``None`` without Pillow."""
+    if Image is None:
+        return None
+    font = _load_font(style.font_path, style.font_size)
+    stroke = max(int(style.stroke_width), 0)
+    lines = wrap_text(text, font, style.max_width, stroke)
+    ascent, descent = font.getmetrics()
+    line_height = ascent + descent + 2 * stroke
+    widths = [int(np.ceil(font.getlength(line))) + 2 * stroke for line in lines]
+    return TextLayout(
+        lines=lines,
+        widths=widths,
+        width=max(widths + [style.max_width or 0, 1]),
+        height=max(len(lines) * line_height + (len(lines) - 1) * style.line_spacing, 1),
+        line_height=line_height,
+        font_height=ascent + descent,
+    )
+
+
+def _rasterize(text: str, style: TextStyle) -> np.ndarray:
+    font = _load_font(style.font_path, style.font_size)
+    stroke = max(int(style.stroke_width), 0)
+    layout = layout_text(text, style)
+
+    image = Image.new("RGBA", (layout.width, layout.height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    y = 0
+    for line, line_width in zip(layout.lines, layout.widths):
+        x = (layout.width - line_width) // 2 + stroke
+        draw.text(
+            (x, y + stroke),
+            line,
+            font=font,
+            fill=style.color,
+            stroke_width=stroke,
+            stroke_fill=style.stroke_color,
+        )
+        y += layout.line_height + style.line_spacing
+    return np.asarray(image, dtype=np.uint8)
+
+
+def _cache_key(text: str, style: TextStyle) -> str:
+    font_stamp = None
+    if style.font_path:
+        try:
+            stat = os.stat(style.font_path)
+            font_stamp = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            font_stamp = None
+    return hash_payload({"text": text, "style": asdict(style), "font": font_stamp})
+
+
+def _remember(key: str, bitmap: np.ndarray) -> np.ndarray:
+    bitmap.setflags(write=False)
+    with _memory_lock:
+        _memory_cache[key] = bitmap
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_ENTRIES:
+            _memory_cache.popitem(last=False)
+    return bitmap
+
+
+def evict_disk_cache(max_bytes: Optional[int] = None) -> int:
+    """Delete the least recently used bitmaps until the disk cache fits ``max_bytes``."""
+    limit = CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for path in CACHE_DIR.glob("*/*.npy"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        total += stat.st_size
+        entries.append((stat.st_atime, stat.st_size, path))
+
+    removed = 0
+    for _atime, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    if removed:
+        logger.info("Evicted %d cached text bitmaps from %s", removed, CACHE_DIR)
+    return removed
+
+
+def _note_disk_write() -> None:
+    global _disk_writes, _last_evict
+    now = time.monotonic()
+    with _memory_lock:
+        _disk_writes += 1
+        due = _disk_writes >= EVICT_EVERY_WRITES or now - _last_evict >= EVICT_EVERY_SECONDS
+        if due:
+            _disk_writes, _last_evict = 0, now
+    if due:
+        evict_disk_cache()
+
+
+def rasterize_text(text: str, style: TextStyle) -> Optional[np.ndarray]:
+    """Return an ``(H, W, 4)`` uint8 RGBA bitmap of ``text``, or ``None`` without Pillow.
+
+    The returned array is shared through the cache and is read-only.
+    """
+    if Image is None:
+        return None
+    key = _cache_key(text, style)
+    with _memory_lock:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            _memory_cache.move_to_end(key)
+            return cached
+
+    disk_path = CACHE_DIR / key[:2] / f"{key}.npy"
+    try:
+        bitmap = np.load(disk_path)
+    except (OSError, ValueError):
+        pass
+    else:
+        try:
+            # Eviction goes by atime, which noatime/relatime mounts do not keep current.
+            os.utime(disk_path)
+        except OSError:
+            pass
+        return _remember(key, bitmap)
+
+    bitmap = _rasterize(text, style)
+    try:
+        disk_path.parent.mkdir(parents=True, exist_ok=True)
+        # The job worker and the frame endpoint may rasterize the same caption at once.
+        tmp_path = disk_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, bitmap)
+        os.replace(tmp_path, disk_path)
+    except OSError as exc:
+        logger.debug("Could not persist text bitmap %s: %s", disk_path, exc)
+    else:
+        _note_disk_write()
+    return _remember(key, bitmap)
+
+
+def compose_rgba(
+    size: Tuple[int, int],
+    *,
+    rects: Iterable[Tuple[Sequence[int], Sequence[int]]] = (),
+    layers: Iterable[Tuple[np.ndarray, Tuple[int, int]]] = (),
+) -> np.ndarray:
+    """Flatten filled rectangles and RGBA bitmaps (in order) into one RGBA overlay."""
+    canvas = Image.new("RGBA", (int(size[0]), int(size[1])), (0, 0, 0, 0))
+    for box, color in rects:
+        fill = Image.new("RGBA", canvas.size, (0, 0, 0, 0))
+        ImageDraw.Draw(fill).rectangle([int(v) for v in box], fill=tuple(int(c) for c in color))
+        canvas = Image.alpha_composite(canvas, fill)
+    for bitmap, (x, y) in layers:
+        layer = Image.new("RGBA", canvas.size, (0, 0, 0, 0))
+        layer.paste(Image.fromarray(np.ascontiguousarray(bitmap), "RGBA"), (int(x), int(y)))
+        canvas = Image.alpha_composite(canvas, layer)
+    return np.asarray(canvas, dtype=np.uint8)
@@ -0,0 +1,261 @@
+"""Lightweight stage timings for the generation, render and translator pipelines.
+
+A pipeline run is wrapped in :func:`pipeline` (or the :func:`timed_pipeline`
+decorator, which also accepts coroutine functions), which binds a
+:class:`StageTimings` recorder to the current context: the calling thread, or
+an asyncio task together with the tasks and ``to_thread`` calls it starts.
+Code anywhere below it measures stages with :func:`span`, optionally attaching
+a byte size and an item count; outside a pipeline ``span`` still feeds the
+process-wide ``registry`` but records nothing else. When the run
+ends, :func:`record_timings` copies the spans into a project's ``extra``
+(``extra["timings"][pipeline]``), and every span is folded into ``registry``,
+which renders Prometheus text for the web app's ``/metrics``.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Durations kept per (pipeline, stage) for the quantiles in ``/metrics``.
+WINDOW = 256
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class Span:
+    stage: str
+    seconds: float = 0.0
+    bytes: Optional[int] = None
+    count: Optional[int] = None
+    calls: int = 1
+
+    def add_file(self, path: Optional[Path | str]) -> None:
+        """Add the size of ``path`` (if it exists) to ``bytes``."""
+        if not path:
+            return
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            return
+        self.bytes = (self.bytes or 0) + size
+
+    def as_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"stage": self.stage, "seconds": round(self.seconds, 4)}
+        if self.bytes is not None:
+            data["bytes"] = self.bytes
+        if self.count is not None:
+            data["count"] = self.count
+        if self.calls > 1:
+            data["calls"] = self.calls
+        return data
+
+
+@dataclass
+class StageTimings:
+    """Spans of one pipeline run, in the order they first finished.
+
+    Repeated stages (one OpenAI request per segment, say) are folded into a
+    single entry with ``calls`` so the stored timings stay small.
+    """
+
+    pipeline: str
+    spans: List[Span] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(self, span: Span) -> None:
+        for existing in self.spans:
+            if existing.stage == span.stage:
+                existing.seconds += span.seconds
+                existing.calls += 1
+                if span.bytes is not None:
+                    existing.bytes = (existing.bytes or 0) + span.bytes
+                if span.count is not None:
+                    existing.count = (existing.count or 0) + span.count
+                return
+        self.spans.append(replace(span))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "stages": [span.as_dict() for span in self.spans],
+        }
+
+
+class _Series:
+    __slots__ = ("window", "runs", "seconds", "bytes", "count")
+
+    def __init__(self) -> None:
+        self.window: Deque[float] = deque(maxlen=WINDOW)
+        self.runs = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Rolling per-stage statistics for the whole process."""
+
+    def __init__(self) -> None:
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a plain counter (e.g. cache hits) exported next to the stage series."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else ""): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+
+    def observe(self, pipeline_name: str, span: Span) -> None:
+        with self._lock:
+            series = self._series.setdefault((pipeline_name, span.stage), _Series())
+            series.window.append(span.seconds)
+            series.runs += 1
+            series.seconds += span.seconds
+            series.bytes += span.bytes or 0
+            series.count += span.count or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                f"{pipeline_name}.{stage}": {
+                    "runs": series.runs,
+                    "seconds": round(series.seconds, 4),
+                    "bytes": series.bytes,
+                    "count": series.count,
+                    **{f"p{int(q * 100)}": round(_quantile(sorted(series.window), q), 4) for q in QUANTILES},
+                }
+                for (pipeline_name, stage), series in sorted(self._series.items())
+            }
+
+    def prometheus(self, prefix: str = "shorts") -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        with self._lock:
+            items = [
+                (labels, series.runs, series.seconds, series.bytes, series.count, sorted(series.window))
+                for labels, series in sorted(self._series.items())
+            ]
+            counters = sorted(self._counters.items())
+        duration = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {duration} Stage wall time (quantiles over the last {WINDOW} runs).",
+            f"# TYPE {duration} summary",
+        ]
+        for (pipeline_name, stage), runs, seconds, _, _, window in items:
+            labels = f'pipeline="{_escape(pipeline_name)}",stage="{_escape(stage)}"'
+            for q in QUANTILES:
+                lines.append(f'{duration}{{{labels},quantile="{q}"}} {_quantile(window, q):.6f}')
+            lines.append(f"{duration}_sum{{{labels}}} {seconds:.6f}")
+            lines.append(f"{duration}_count{{{labels}}} {runs}")
+        for name, help_text, index in (
+            (f"{prefix}_stage_bytes_total", "Bytes produced or processed by a stage.", 3),
+            (f"{prefix}_stage_items_total", "Items (captions, clips, segments, ...) handled by a stage.", 4),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for item in items:
+                pipeline_name, stage = item[0]
+                lines.append(f'{name}{{pipeline="{_escape(pipeline_name)}",stage="{_escape(stage)}"}} {item[index]}')
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"{prefix}_{name}"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+            lines.append(f"{metric}{{{rendered}}} {value:g}" if rendered else f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+_current: contextvars.ContextVar[Optional[StageTimings]] = contextvars.ContextVar("stage_timings", default=None)
+
+
+def current_timings() -> Optional[StageTimings]:
+    return _current.get()
+
+
+@contextmanager
+def pipeline(name: str) -> Iterator[StageTimings]:
+    """Collect the spans of one ``name`` run on this thread (nested runs keep their own)."""
+    timings = StageTimings(name)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        registry.observe(name, Span("total", time.perf_counter() - timings.started))
+
+
+def timed_pipeline(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with pipeline(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with pipeline(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+@contextmanager
+def span(stage: str, *, count: Optional[int] = None) -> Iterator[Span]:
+    """Time a stage; set ``bytes``/``count`` (or call ``add_file``) on the yielded span."""
+    current = Span(stage, count=count)
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        timings = current_timings()
+        if timings is not None:
+            timings.add(current)
+        registry.observe(timings.pipeline if timings is not None else "other", current)
+
+
+def record_timings(extra: Dict[str, Any]) -> None:
+    """Store the current run's spans in ``extra["timings"][pipeline]``."""
+    timings = current_timings()
+    if timings is None:
+        return
+    stored = extra.get("timings")
+    if not isinstance(stored, dict):
+        stored = extra["timings"] = {}
+    stored[timings.pipeline] = timings.as_dict()
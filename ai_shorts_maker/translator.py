@@ -1,6 +1,7 @@
 """Translator project repository and utilities."""
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import glob
@@ -8,14 +9,17 @@ import re
 import html
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Literal, Optional
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
 from uuid import uuid4
 
 from pydantic import BaseModel, Field, ValidationError
 
+from .jobs import JobCancelled, moviepy_logger
 from .models import ProjectSummary
+from .resources import governor
 from .repository import OUTPUT_DIR as SHORTS_OUTPUT_DIR
 from .subtitles import parse_subtitle_file, CaptionLine
+from .timings import record_timings, span, timed_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +110,7 @@ class TranslatorProjectUpdate(BaseModel):
     prompt_hint: Optional[str] = None
     voice: Optional[str] = None
     music_track: Optional[str] = None
+    subtitle_renderer: Optional[Literal["moviepy", "ass"]] = None
 
 
 def ensure_directories() -> None:
@@ -478,6 +483,8 @@ def update_project(project_id: str, payload: TranslatorProjectUpdate) -> Transla
         project.voice = payload.voice
     if payload.music_track is not None:
         project.music_track = payload.music_track
+    if payload.subtitle_renderer is not None:
+        project.extra["subtitle_renderer"] = payload.subtitle_renderer
 
     return save_project(project)
 
@@ -780,31 +787,24 @@ def populate_segments_from_subtitles(project: TranslatorProject) -> TranslatorPr
     return project
 
 
-def generate_ai_commentary_for_project(project_id: str) -> TranslatorProject:
-    """Generate AI commentary for all segments in a project based on source text."""
+def _start_commentary(project_id: str, allowed: Iterable[str], task: str) -> Tuple[TranslatorProject, bool]:
+    """Load the project for commentary generation; the flag is False when it cannot run."""
     project = load_project(project_id)
 
-    if project.status not in ["segmenting", "draft"]:
-        logger.warning("Project %s is not in a state for AI commentary generation (status: %s)", project_id, project.status)
-        return project
+    if project.status not in allowed:
+        logger.warning("Project %s is not in a state for %s generation (status: %s)", project_id, task, project.status)
+        return project, False
 
     project = populate_segments_from_subtitles(project)
     if not any(seg.source_text for seg in project.segments):
         project.status = "failed"
         project.extra["error"] = "Could not find any source text to generate commentary from."
-        return save_project(project)
+        return save_project(project), False
+    return project, True
 
-    try:
-        from .openai_client import OpenAIShortsClient
-        client = OpenAIShortsClient()
 
-        # Generate commentary for each segment
-        for segment in project.segments:
-            if not segment.source_text:
-                continue
-
-            # Create prompt for commentary generation
-            commentary_prompt = f"""다음은 동영상의 자막 내용입니다. 이 내용에 대해 간단하고 유익한 해설을 한국어로 작성해주세요.
+def _commentary_prompt(segment: TranslatorSegment) -> str:
+    return f"""다음은 동영상의 자막 내용입니다. 이 내용에 대해 간단하고 유익한 해설을 한국어로 작성해주세요.
 
 자막 내용: "{segment.source_text}"
 
@@ -816,30 +816,81 @@ def generate_ai_commentary_for_project(project_id: str) -> TranslatorProject:
 
 해설:"""
 
-            try:
-                commentary = client.generate_script(
-                    prompt=commentary_prompt,
-                    temperature=0.7
-                ).strip()
 
-                segment.commentary = commentary
-                logger.info(f"Generated commentary for segment {segment.id}: {commentary[:50]}...")
+def _set_commentary(segment: TranslatorSegment, commentary: str) -> None:
+    segment.commentary = commentary.strip()
+    logger.info(f"Generated commentary for segment {segment.id}: {segment.commentary[:50]}...")
+
+
+def _finish_commentary(project: TranslatorProject) -> TranslatorProject:
+    project.status = "segmenting"  # Keep in segmenting status
+    record_timings(project.extra)
+    project = save_project(project)
+    logger.info(f"AI commentary generation completed for project {project.id}")
+    return project
+
+
+def _commentary_failed(project: TranslatorProject, exc: Exception) -> TranslatorProject:
+    project.status = "failed"
+    project.extra["error"] = f"AI 해설 생성 중 오류 발생: {str(exc)}"
+    return save_project(project)
+
+
+@timed_pipeline("translator.commentary")
+def generate_ai_commentary_for_project(project_id: str) -> TranslatorProject:
+    """Generate AI commentary for all segments in a project based on source text."""
+    project, ready = _start_commentary(project_id, ["segmenting", "draft"], "AI commentary")
+    if not ready:
+        return project
+
+    try:
+        from .openai_client import OpenAIShortsClient
+        client = OpenAIShortsClient()
 
+        # Generate commentary for each segment
+        for segment in project.segments:
+            if not segment.source_text:
+                continue
+            try:
+                _set_commentary(segment, client.generate_script(prompt=_commentary_prompt(segment), temperature=0.7))
             except Exception as exc:
                 logger.warning(f"Failed to generate commentary for segment {segment.id}: {exc}")
-                continue
 
-        project.status = "segmenting"  # Keep in segmenting status
-        project = save_project(project)
+        return _finish_commentary(project)
 
-        logger.info(f"AI commentary generation completed for project {project_id}")
+    except Exception as exc:
+        logger.exception("Failed to generate AI commentary for project %s", project_id)
+        return _commentary_failed(project, exc)
+
+
+@timed_pipeline("translator.commentary")
+async def generate_ai_commentary_for_project_async(project_id: str) -> TranslatorProject:
+    """Async :func:`generate_ai_commentary_for_project`; segments are requested concurrently."""
+    project, ready = await asyncio.to_thread(
+        _start_commentary, project_id, ["segmenting", "draft"], "AI commentary"
+    )
+    if not ready:
         return project
 
+    try:
+        from .openai_client import OpenAIShortsClient
+        client = OpenAIShortsClient()
+
+        async def comment(segment: TranslatorSegment) -> None:
+            try:
+                _set_commentary(
+                    segment,
+                    await client.generate_script_async(prompt=_commentary_prompt(segment), temperature=0.7),
+                )
+            except Exception as exc:
+                logger.warning(f"Failed to generate commentary for segment {segment.id}: {exc}")
+
+        await asyncio.gather(*(comment(segment) for segment in project.segments if segment.source_text))
+        return await asyncio.to_thread(_finish_commentary, project)
+
     except Exception as exc:
         logger.exception("Failed to generate AI commentary for project %s", project_id)
-        project.status = "failed"
-        project.extra["error"] = f"AI 해설 생성 중 오류 발생: {str(exc)}"
-        return save_project(project)
+        return await asyncio.to_thread(_commentary_failed, project, exc)
 
 
 def _find_optimal_commentary_positions(segments: List[TranslatorSegment]) -> List[float]:
@@ -909,47 +960,19 @@ def _create_commentary_segments(segments: List[TranslatorSegment], commentary_po
     return commentary_segments
 
 
-def generate_korean_ai_commentary_for_project(project_id: str) -> TranslatorProject:
-    """Generate Korean AI commentary and insert at optimal positions."""
-    project = load_project(project_id)
+def _korean_commentary_prompt(project: TranslatorProject, commentary_segment: TranslatorSegment) -> str:
+    # Find the surrounding subtitle segments for context
+    prev_segments = [seg for seg in project.segments if seg.end <= commentary_segment.start]
 
-    if project.status not in ["segmenting", "draft", "voice_ready"]:
-        logger.warning("Project %s is not in a state for Korean AI commentary generation (status: %s)", project_id, project.status)
-        return project
+    # Create context from previous segments
+    context_texts = []
+    if prev_segments:
+        # Take last 2 segments for context
+        context_segments = prev_segments[-2:] if len(prev_segments) >= 2 else prev_segments
+        context_texts = [seg.source_text for seg in context_segments if seg.source_text]
 
-    project = populate_segments_from_subtitles(project)
-    if not any(seg.source_text for seg in project.segments):
-        project.status = "failed"
-        project.extra["error"] = "Could not find any source text to generate commentary from."
-        return save_project(project)
-
-    try:
-        from .openai_client import OpenAIShortsClient
-        client = OpenAIShortsClient()
-
-        # Find optimal positions for commentary insertion
-        commentary_positions = _find_optimal_commentary_positions(project.segments)
-        logger.info(f"Found {len(commentary_positions)} optimal positions for commentary")
-
-        # Create commentary segments at these positions
-        commentary_segments = _create_commentary_segments(project.segments, commentary_positions)
-
-        # Generate AI commentary for each commentary segment
-        for i, commentary_segment in enumerate(commentary_segments):
-            # Find the surrounding subtitle segments for context
-            prev_segments = [seg for seg in project.segments if seg.end <= commentary_segment.start]
-            next_segments = [seg for seg in project.segments if seg.start >= commentary_segment.end]
-
-            # Create context from previous segments
-            context_texts = []
-            if prev_segments:
-                # Take last 2 segments for context
-                context_segments = prev_segments[-2:] if len(prev_segments) >= 2 else prev_segments
-                context_texts = [seg.source_text for seg in context_segments if seg.source_text]
-
-            # Create prompt for Korean commentary generation
-            context_str = " ".join(context_texts) if context_texts else "영상 시작"
-            korean_commentary_prompt = f"""다음은 드라마/예능 프로그램의 한국어 자막 내용입니다. 이 상황에서 시청자를 위한 재미있고 유용한 해설을 한국어로 작성해주세요.
+    context_str = " ".join(context_texts) if context_texts else "영상 시작"
+    return f"""다음은 드라마/예능 프로그램의 한국어 자막 내용입니다. 이 상황에서 시청자를 위한 재미있고 유용한 해설을 한국어로 작성해주세요.
 
 이전 자막 내용: "{context_str}"
 
@@ -962,41 +985,106 @@ def generate_korean_ai_commentary_for_project(project_id: str) -> TranslatorProj
 
 한국어 해설:"""
 
-            try:
-                # Generate Korean commentary
-                korean_commentary = client.generate_script(
-                    prompt=korean_commentary_prompt,
-                    temperature=0.8
-                ).strip()
-                korean_commentary = korean_commentary.strip('"').strip("'")
-                commentary_segment.commentary_korean = korean_commentary
 
-                # Generate Japanese translation
-                japanese_translation_prompt = f"""다음 한국어 해설을 자연스러운 일본어로 번역해주세요.
+def _japanese_translation_prompt(korean_commentary: str) -> str:
+    return f"""다음 한국어 해설을 자연스러운 일본어로 번역해주세요.
 
 한국어 해설: "{korean_commentary}"
 
 일본어 번역:"""
 
-                japanese_translation = client.generate_script(
-                    prompt=japanese_translation_prompt,
-                    temperature=0.3
-                ).strip()
-                japanese_translation = japanese_translation.strip('"').strip("'")
-                commentary_segment.commentary_japanese = japanese_translation
 
-                # Generate reverse Korean translation
-                reverse_korean_prompt = f"""다음 일본어 텍스트를 다시 한국어로 역번역해주세요.
+def _reverse_korean_prompt(japanese_translation: str) -> str:
+    return f"""다음 일본어 텍스트를 다시 한국어로 역번역해주세요.
 
 일본어 텍스트: "{japanese_translation}"
 
 한국어 역번역:"""
 
-                reverse_korean = client.generate_script(
-                    prompt=reverse_korean_prompt,
-                    temperature=0.3
-                ).strip()
-                reverse_korean = reverse_korean.strip('"').strip("'")
+
+def _clean_commentary(text: str) -> str:
+    return text.strip().strip('"').strip("'")
+
+
+def _commentary_generation_failed(commentary_segment: TranslatorSegment, position: int, exc: Exception) -> None:
+    logger.warning(f"Failed to generate commentary for position {position}: {exc}")
+    commentary_segment.commentary_korean = "[해설 생성 실패]"
+    commentary_segment.commentary_japanese = "[翻訳失敗]"
+    commentary_segment.commentary_reverse_korean = "[역번역 실패]"
+    commentary_segment.commentary = "[해설 생성 실패]"
+
+
+def _plan_commentary_segments(project: TranslatorProject) -> List[TranslatorSegment]:
+    # Find optimal positions for commentary insertion
+    commentary_positions = _find_optimal_commentary_positions(project.segments)
+    logger.info(f"Found {len(commentary_positions)} optimal positions for commentary")
+
+    # Create commentary segments at these positions
+    return _create_commentary_segments(project.segments, commentary_positions)
+
+
+def _merge_commentary_segments(
+    project: TranslatorProject, commentary_segments: List[TranslatorSegment]
+) -> TranslatorProject:
+    # Merge commentary segments with original segments and sort by time
+    all_segments = project.segments + commentary_segments
+    all_segments.sort(key=lambda seg: seg.start)
+
+    # Update segment clip_index to maintain order
+    for i, segment in enumerate(all_segments):
+        segment.clip_index = i
+
+    project.segments = all_segments
+    record_timings(project.extra)
+    project = save_project(project)
+    logger.info(f"Korean AI commentary generation completed for project {project.id}")
+    return project
+
+
+def _korean_commentary_failed(project: TranslatorProject, exc: Exception) -> TranslatorProject:
+    project.status = "failed"
+    project.extra["error"] = f"한국어 AI 해설 생성 중 오류 발생: {str(exc)}"
+    return save_project(project)
+
+
+@timed_pipeline("translator.korean_commentary")
+def generate_korean_ai_commentary_for_project(project_id: str) -> TranslatorProject:
+    """Generate Korean AI commentary and insert at optimal positions."""
+    project, ready = _start_commentary(
+        project_id, ["segmenting", "draft", "voice_ready"], "Korean AI commentary"
+    )
+    if not ready:
+        return project
+
+    try:
+        from .openai_client import OpenAIShortsClient
+        client = OpenAIShortsClient()
+        commentary_segments = _plan_commentary_segments(project)
+
+        # Generate AI commentary for each commentary segment
+        for i, commentary_segment in enumerate(commentary_segments):
+            try:
+                # Generate Korean commentary
+                korean_commentary = _clean_commentary(client.generate_script(
+                    prompt=_korean_commentary_prompt(project, commentary_segment),
+                    temperature=0.8,
+                ))
+                commentary_segment.commentary_korean = korean_commentary
+
+                # Generate Japanese translation
+                japanese_translation = _clean_commentary(client.generate_script(
+                    prompt=_japanese_translation_prompt(korean_commentary),
+                    temperature=0.3,
+                    cache=True,  # translations of unchanged text can be reused
+                ))
+                commentary_segment.commentary_japanese = japanese_translation
+
+                # Generate reverse Korean translation
+                reverse_korean = _clean_commentary(client.generate_script(
+                    prompt=_reverse_korean_prompt(japanese_translation),
+                    temperature=0.3,
+                    cache=True,  # translations of unchanged text can be reused
+                ))
                 commentary_segment.commentary_reverse_korean = reverse_korean
 
                 # Keep commentary field for backward compatibility
@@ -1005,49 +1093,94 @@ def generate_korean_ai_commentary_for_project(project_id: str) -> TranslatorProj
                 logger.info(f"Generated commentary {i+1} - KR: {korean_commentary}, JP: {japanese_translation}, RV: {reverse_korean}")
 
             except Exception as exc:
-                logger.warning(f"Failed to generate commentary for position {i+1}: {exc}")
-                commentary_segment.commentary_korean = "[해설 생성 실패]"
-                commentary_segment.commentary_japanese = "[翻訳失敗]"
-                commentary_segment.commentary_reverse_korean = "[역번역 실패]"
-                commentary_segment.commentary = "[해설 생성 실패]"
+                _commentary_generation_failed(commentary_segment, i + 1, exc)
 
+        return _merge_commentary_segments(project, commentary_segments)
 
-        # Merge commentary segments with original segments and sort by time
-        all_segments = project.segments + commentary_segments
-        all_segments.sort(key=lambda seg: seg.start)
+    except Exception as exc:
+        logger.exception("Failed to generate Korean AI commentary for project %s", project_id)
+        return _korean_commentary_failed(project, exc)
 
-        # Update segment clip_index to maintain order
-        for i, segment in enumerate(all_segments):
-            segment.clip_index = i
 
-        project.segments = all_segments
-        project = save_project(project)
-        logger.info(f"Korean AI commentary generation completed for project {project_id}")
+@timed_pipeline("translator.korean_commentary")
+async def generate_korean_ai_commentary_for_project_async(project_id: str) -> TranslatorProject:
+    """Async :func:`generate_korean_ai_commentary_for_project`.
+
+    Each insertion point still chains commentary, translation and reverse
+    translation, but the insertion points are generated concurrently.
+    """
+    project, ready = await asyncio.to_thread(
+        _start_commentary, project_id, ["segmenting", "draft", "voice_ready"], "Korean AI commentary"
+    )
+    if not ready:
         return project
 
+    try:
+        from .openai_client import OpenAIShortsClient
+        client = OpenAIShortsClient()
+        commentary_segments = _plan_commentary_segments(project)
+
+        async def comment(i: int, commentary_segment: TranslatorSegment) -> None:
+            try:
+                korean_commentary = _clean_commentary(await client.generate_script_async(
+                    prompt=_korean_commentary_prompt(project, commentary_segment),
+                    temperature=0.8,
+                ))
+                commentary_segment.commentary_korean = korean_commentary
+                japanese_translation = _clean_commentary(await client.generate_script_async(
+                    prompt=_japanese_translation_prompt(korean_commentary),
+                    temperature=0.3,
+                    cache=True,  # translations of unchanged text can be reused
+                ))
+                commentary_segment.commentary_japanese = japanese_translation
+                reverse_korean = _clean_commentary(await client.generate_script_async(
+                    prompt=_reverse_korean_prompt(japanese_translation),
+                    temperature=0.3,
+                    cache=True,  # translations of unchanged text can be reused
+                ))
+                commentary_segment.commentary_reverse_korean = reverse_korean
+                commentary_segment.commentary = korean_commentary
+                logger.info(f"Generated commentary {i+1} - KR: {korean_commentary}, JP: {japanese_translation}, RV: {reverse_korean}")
+            except Exception as exc:
+                _commentary_generation_failed(commentary_segment, i + 1, exc)
+
+        await asyncio.gather(*(comment(i, segment) for i, segment in enumerate(commentary_segments)))
+        return await asyncio.to_thread(_merge_commentary_segments, project, commentary_segments)
+
     except Exception as exc:
         logger.exception("Failed to generate Korean AI commentary for project %s", project_id)
-        project.status = "failed"
-        project.extra["error"] = f"한국어 AI 해설 생성 중 오류 발생: {str(exc)}"
-        return save_project(project)
+        return await asyncio.to_thread(_korean_commentary_failed, project, exc)
 
 
-def translate_project_segments(project_id: str) -> TranslatorProject:
-    """Run translation for all segments in a project."""
+def _start_translation(project_id: str) -> Tuple[TranslatorProject, bool]:
+    """Load the project and mark it as translating; the flag is False when it cannot be."""
     project = load_project(project_id)
 
     if project.status not in ["segmenting", "draft"]:
         logger.warning("Project %s is not in a state to be translated (status: %s)", project_id, project.status)
-        return project
+        return project, False
 
     project = populate_segments_from_subtitles(project)
     if not any(seg.source_text for seg in project.segments):
         project.status = "failed"
         project.extra["error"] = "Could not find any source text in subtitles to translate."
-        return save_project(project)
+        return save_project(project), False
 
     project.status = "translating"
-    project = save_project(project)
+    return save_project(project), True
+
+
+def _text_to_translate(segment: TranslatorSegment) -> str:
+    # Remove ">>" prefix from source text for translation
+    return (segment.source_text or "").lstrip(">> ").strip()
+
+
+@timed_pipeline("translator.translate")
+def translate_project_segments(project_id: str) -> TranslatorProject:
+    """Run translation for all segments in a project."""
+    project, ready = _start_translation(project_id)
+    if not ready:
+        return project
 
     try:
         from .openai_client import OpenAIShortsClient  # Local import to avoid circular dependency issues
@@ -1055,11 +1188,7 @@ def translate_project_segments(project_id: str) -> TranslatorProject:
         client = OpenAIShortsClient()
 
         for segment in project.segments:
-            if not segment.source_text:
-                continue
-
-            # Remove ">>" prefix from source text for translation
-            text_to_translate = segment.source_text.lstrip(">> ").strip()
+            text_to_translate = _text_to_translate(segment)
             if not text_to_translate:
                 continue
 
@@ -1073,6 +1202,7 @@ def translate_project_segments(project_id: str) -> TranslatorProject:
             segment.translated_text = translated
 
         project.status = "voice_ready"  # Assuming voice is the next step
+        record_timings(project.extra)
         project = save_project(project)
 
         # Save translation results to TXT files
@@ -1087,6 +1217,52 @@ def translate_project_segments(project_id: str) -> TranslatorProject:
         return save_project(project)
 
 
+@timed_pipeline("translator.translate")
+async def translate_project_segments_async(project_id: str) -> TranslatorProject:
+    """Async :func:`translate_project_segments` for the web app.
+
+    Segments are translated concurrently over the shared OpenAI pool, which
+    bounds how many requests are in flight; project files are read and
+    written off the event loop.
+    """
+    project, ready = await asyncio.to_thread(_start_translation, project_id)
+    if not ready:
+        return project
+
+    try:
+        from .openai_client import OpenAIShortsClient
+
+        client = OpenAIShortsClient()
+        pending = [(segment, _text_to_translate(segment)) for segment in project.segments]
+        pending = [(segment, text) for segment, text in pending if text]
+        translations = await asyncio.gather(
+            *(
+                client.translate_text_async(
+                    text_to_translate=text,
+                    target_lang=project.target_lang,
+                    translation_mode=project.translation_mode,
+                    tone_hint=project.tone_hint,
+                    prompt_hint=project.prompt_hint,
+                )
+                for _, text in pending
+            )
+        )
+        for (segment, _), translated in zip(pending, translations):
+            segment.translated_text = translated
+
+        project.status = "voice_ready"
+        record_timings(project.extra)
+        project = await asyncio.to_thread(save_project, project)
+        await asyncio.to_thread(_save_translation_texts, project)
+        return project
+
+    except Exception as e:
+        logger.exception("Failed to translate project %s", project_id)
+        project.status = "failed"
+        project.extra["error"] = str(e)
+        return await asyncio.to_thread(save_project, project)
+
+
 def translate_text(
     text: str,
     target_lang: str = "ko",
@@ -1113,6 +1289,28 @@ def translate_text(
         raise e
 
 
+async def translate_text_async(
+    text: str,
+    target_lang: str = "ko",
+    translation_mode: str = "reinterpret",
+    tone_hint: Optional[str] = None,
+) -> str:
+    """Async :func:`translate_text` over the shared OpenAI pool."""
+    from .openai_client import OpenAIShortsClient
+
+    try:
+        return await OpenAIShortsClient().translate_text_async(
+            text_to_translate=text,
+            target_lang=target_lang,
+            translation_mode=translation_mode,
+            tone_hint=tone_hint,
+            prompt_hint=None,
+        )
+    except Exception:
+        logger.exception("Failed to translate text: %s", text)
+        raise
+
+
 def update_segment_text(project_id: str, segment_id: str, text_type: str, text_value: str) -> None:
     """Update a specific text field in a segment."""
     project = load_project(project_id)
@@ -1267,13 +1465,13 @@ def _save_translation_texts(project: TranslatorProject) -> None:
         logger.info(f"Saved reverse translated Korean to {reverse_file}")
 
 
-def synthesize_voice_for_project(project_id: str) -> TranslatorProject:
-    """Generate TTS for the entire translated script."""
+def _start_voice(project_id: str) -> Tuple[TranslatorProject, str]:
+    """Load the project and mark it for synthesis; the script is empty when it cannot be."""
     project = load_project(project_id)
 
     if project.status != "voice_ready":
         logger.warning("Project %s is not ready for voice synthesis (status: %s)", project_id, project.status)
-        return project
+        return project, ""
 
     # Build script based on voice synthesis mode
     script_parts = []
@@ -1293,38 +1491,79 @@ def synthesize_voice_for_project(project_id: str) -> TranslatorProject:
         project.status = "failed"
         mode_text = {"subtitle": "자막", "commentary": "해설", "both": "자막+해설"}[project.voice_synthesis_mode]
         project.extra["error"] = f"음성 변환할 {mode_text} 텍스트가 없습니다."
-        return save_project(project)
+        return save_project(project), ""
 
     project.status = "rendering" # Next logical status
-    project = save_project(project)
+    return save_project(project), full_script
+
+
+def _voice_output_path(project: TranslatorProject) -> Path:
+    return Path(project.metadata_path).parent / f"{project.base_name}_voice.mp3"
+
+
+def _finish_voice(project: TranslatorProject, audio_path: Path) -> TranslatorProject:
+    # In a real app, you might want to store this in a more structured way
+    project.extra["voice_path"] = str(audio_path)
+    project.status = "voice_complete"
+    record_timings(project.extra)
+    return save_project(project)
+
+
+def _voice_failed(project: TranslatorProject, exc: Exception) -> TranslatorProject:
+    project.status = "failed"
+    project.extra["error"] = str(exc)
+    return save_project(project)
+
+
+@timed_pipeline("translator.voice")
+def synthesize_voice_for_project(project_id: str) -> TranslatorProject:
+    """Generate TTS for the entire translated script."""
+    project, full_script = _start_voice(project_id)
+    if not full_script:
+        return project
 
     try:
         from .openai_client import OpenAIShortsClient
 
         client = OpenAIShortsClient()
-        output_dir = Path(project.metadata_path).parent
-        audio_path = output_dir / f"{project.base_name}_voice.mp3"
-
-        voice = project.voice or "alloy"
-
+        audio_path = _voice_output_path(project)
         client.synthesize_voice(
             text=full_script,
-            voice=voice,
+            voice=project.voice or "alloy",
             output_path=audio_path,
         )
+        return _finish_voice(project, audio_path)
 
-        # In a real app, you might want to store this in a more structured way
-        project.extra["voice_path"] = str(audio_path)
-        project.status = "voice_complete"
-        return save_project(project)
+    except Exception as e:
+        logger.exception("Failed to synthesize voice for project %s", project_id)
+        return _voice_failed(project, e)
+
+
+@timed_pipeline("translator.voice")
+async def synthesize_voice_for_project_async(project_id: str) -> TranslatorProject:
+    """Async :func:`synthesize_voice_for_project` over the shared OpenAI pool."""
+    project, full_script = await asyncio.to_thread(_start_voice, project_id)
+    if not full_script:
+        return project
+
+    try:
+        from .openai_client import OpenAIShortsClient
+
+        client = OpenAIShortsClient()
+        audio_path = _voice_output_path(project)
+        await client.synthesize_voice_async(
+            text=full_script,
+            voice=project.voice or "alloy",
+            output_path=audio_path,
+        )
+        return await asyncio.to_thread(_finish_voice, project, audio_path)
 
     except Exception as e:
         logger.exception("Failed to synthesize voice for project %s", project_id)
-        project.status = "failed"
-        project.extra["error"] = str(e)
-        return save_project(project)
+        return await asyncio.to_thread(_voice_failed, project, e)
 
 
+@timed_pipeline("translator.render")
 def render_translated_project(project_id: str) -> TranslatorProject:
     """Render the final video for a translated project."""
     project = load_project(project_id)
@@ -1359,26 +1598,51 @@ def render_translated_project(project_id: str) -> TranslatorProject:
             for seg in project.segments
             if seg.translated_text
         ]
-        video_clip = factory.burn_subtitles(video_clip, captions)
-
-        # 4. Write to file
         output_dir = Path(project.metadata_path).parent
         output_path = output_dir / f"{project.base_name}_translated.mp4"
+
+        # project.extra["subtitle_renderer"] = "ass" burns captions with libass
+        # while encoding instead of compositing them frame by frame.
+        ffmpeg_params = None
+        if captions and project.extra.get("subtitle_renderer") == "ass":
+            from .ass_subtitles import AssLayout, write_ass_file
+            from .ffmpeg_render import ass_subtitle_filter
+            from .models import SubtitleStyle
+
+            layout = AssLayout.from_style(
+                SubtitleStyle(),
+                canvas_size=tuple(video_clip.size),
+                font_path=factory.subtitle_font,
+            )
+            ass_path = write_ass_file(captions, layout, output_dir / f"{project.base_name}_translated.ass")
+            ffmpeg_params = ["-vf", ass_subtitle_filter(ass_path, font_path=factory.subtitle_font)]
+        else:
+            with span("burn_subtitles", count=len(captions)):
+                video_clip = factory.burn_subtitles(video_clip, captions)
+
+        # 4. Write to file
         
-        video_clip.write_videofile(
-            str(output_path),
-            codec="libx264",
-            audio_codec="aac",
-            temp_audiofile=output_dir / "temp-audio.m4a",
-            remove_temp=True,
-            threads=4, # TODO: Make configurable
-            fps=project.fps or 24,
-        )
+        with governor.lease(f"translator-render:{project_id}") as threads, span("encode") as stage:
+            video_clip.write_videofile(
+                str(output_path),
+                codec="libx264",
+                audio_codec="aac",
+                temp_audiofile=output_dir / "temp-audio.m4a",
+                remove_temp=True,
+                threads=threads,
+                fps=project.fps or 24,
+                ffmpeg_params=ffmpeg_params,
+                logger=moviepy_logger(),
+            )
+            stage.add_file(output_path)
 
         project.extra["rendered_video_path"] = str(output_path)
         project.status = "rendered"
+        record_timings(project.extra)
         return save_project(project)
 
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.exception("Failed to render project %s", project_id)
         project.status = "failed"
@@ -1465,9 +1729,13 @@ __all__ = [
     "downloads_listing",
     "aggregate_dashboard_projects",
     "generate_ai_commentary_for_project",
+    "generate_ai_commentary_for_project_async",
     "generate_korean_ai_commentary_for_project",
+    "generate_korean_ai_commentary_for_project_async",
     "translate_project_segments",
+    "translate_project_segments_async",
     "synthesize_voice_for_project",
+    "synthesize_voice_for_project_async",
     "render_translated_project",
     "vtt_to_srt",
     "convert_vtt_to_srt",
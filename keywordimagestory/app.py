@@ -33,7 +33,7 @@ from keywordimagestory.models import (
     ToolType,
     VideoPrompt,
 )
-from keywordimagestory.openai_client import client as openai_client
+from keywordimagestory.openai_client import async_openai, client as openai_client
 from keywordimagestory.services import editor_service, history_service, tool_store
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,12 @@ app.mount("/static", StaticFiles(directory=str(settings.static_dir)), name="stat
 app.mount("/outputs", StaticFiles(directory=str(settings.outputs_dir)), name="outputs")
 
 
+@app.on_event("shutdown")
+async def _close_openai_clients() -> None:
+    if async_openai is not None:
+        await async_openai.close_clients()
+
+
 # ---------------------------------------------------------------------------
 # Utility helpers
 # ---------------------------------------------------------------------------
@@ -124,12 +130,12 @@ async def api_generate_titles(project_id: str, payload: dict[str, Any] = Body(..
 
     titles = []
     if generator_type == "keyword":
-        titles.extend(KeywordTitleGenerator().generate(context, count=count))
+        titles.extend(await KeywordTitleGenerator().generate_async(context, count=count))
     if generator_type == "image":
         description = payload.get("image_description")
         if not description:
             raise HTTPException(status_code=400, detail="image_description required for image titles")
-        titles.extend(ImageTitleGenerator().generate(description, context, count=count))
+        titles.extend(await ImageTitleGenerator().generate_async(description, context, count=count))
     editor_service.set_titles(project_id, titles)
     return _project_or_404(project_id)
 
@@ -138,7 +144,7 @@ async def api_generate_titles(project_id: str, payload: dict[str, Any] = Body(..
 async def api_generate_subtitles(project_id: str) -> StoryProject:
     project = _project_or_404(project_id)
     context = GenerationContext(keyword=project.keyword, language=project.language, duration=settings.default_story_duration)
-    subtitles, images = ShortsScriptGenerator().generate(context)
+    subtitles, images = await ShortsScriptGenerator().generate_async(context)
     editor_service.set_subtitles(project_id, subtitles)
     if images:
         editor_service.set_image_prompts(project_id, images)
@@ -149,7 +155,7 @@ async def api_generate_subtitles(project_id: str) -> StoryProject:
 async def api_generate_scenes(project_id: str) -> StoryProject:
     project = _project_or_404(project_id)
     context = GenerationContext(keyword=project.keyword, language=project.language, duration=settings.default_story_duration)
-    subtitles, scenes = ShortsSceneGenerator().generate(context)
+    subtitles, scenes = await ShortsSceneGenerator().generate_async(context)
     editor_service.set_video_prompts(project_id, scenes)
     editor_service.set_subtitles(project_id, project.subtitles + subtitles)
     return _project_or_404(project_id)
@@ -169,7 +175,7 @@ async def api_generate_story_keywords(payload: dict[str, Any] = Body(...)) -> di
     count = max(1, min(requested_count, 60))
 
     context = GenerationContext(keyword=keyword, language=language, duration=settings.default_story_duration)
-    titles = KeywordTitleGenerator().generate(context, count=count)
+    titles = await KeywordTitleGenerator().generate_async(context, count=count)
     return {
         "keyword": keyword,
         "language": language,
@@ -227,7 +233,7 @@ async def api_generate_image_story(
 
     context_keyword = keyword or (image_description[:30] if image_description else "이미지 스토리")
     context = GenerationContext(keyword=context_keyword, language=language, duration=settings.default_story_duration)
-    story_items = ImageStoryGenerator().generate(context, "\n".join(context_lines), count=count, image_data=image_data)
+    story_items = await ImageStoryGenerator().generate_async(context, "\n".join(context_lines), count=count, image_data=image_data)
 
     return {
         "keyword": context_keyword,
@@ -250,7 +256,7 @@ async def api_generate_shorts_script(payload: dict[str, Any] = Body(...)) -> dic
 
     language = str(payload.get("language", settings.default_language) or settings.default_language)
     context = GenerationContext(keyword=keyword, language=language, duration=settings.default_story_duration)
-    subtitles, images = ShortsScriptGenerator().generate(context)
+    subtitles, images = await ShortsScriptGenerator().generate_async(context)
     return {
         "keyword": keyword,
         "language": language,
@@ -267,7 +273,7 @@ async def api_generate_shorts_scenes(payload: dict[str, Any] = Body(...)) -> dic
 
     language = str(payload.get("language", settings.default_language) or settings.default_language)
     context = GenerationContext(keyword=keyword, language=language, duration=settings.default_story_duration)
-    subtitles, scenes = ShortsSceneGenerator().generate(context)
+    subtitles, scenes = await ShortsSceneGenerator().generate_async(context)
     return {
         "keyword": keyword,
         "language": language,
@@ -338,7 +344,7 @@ async def api_generate_speech(tool: ToolType, payload: dict[str, Any] = Body(...
     requested_format = str(payload.get("format") or "mp3").lower()
 
     try:
-        audio_bytes, audio_format = openai_client.synthesize_speech(
+        audio_bytes, audio_format = await openai_client.synthesize_speech_async(
             full_text,
             voice=voice,
             audio_format=requested_format,
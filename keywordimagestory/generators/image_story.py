@@ -14,12 +14,30 @@ class ImageStoryGenerator(BaseGenerator):
     """Create creative titles and corresponding image scene prompts."""
 
     def generate(self, context: GenerationContext, context_text: str, count: int = 6, image_data: bytes | None = None) -> List[ImageStoryItem]:
+        prompt = self._prompt(context, context_text, count, image_data)
+        if image_data:
+            raw = self.client.analyze_image(image_data, prompt)
+        else:
+            raw = self.client.generate_structured(prompt, context_text)
+        return self._parse(raw, context, count)
+
+    async def generate_async(
+        self, context: GenerationContext, context_text: str, count: int = 6, image_data: bytes | None = None
+    ) -> List[ImageStoryItem]:
+        prompt = self._prompt(context, context_text, count, image_data)
+        if image_data:
+            raw = await self.client.analyze_image_async(image_data, prompt)
+        else:
+            raw = await self.client.generate_structured_async(prompt, context_text)
+        return self._parse(raw, context, count)
+
+    def _prompt(self, context: GenerationContext, context_text: str, count: int, image_data: bytes | None) -> str:
         if not context.keyword:
             raise ValueError("keyword is required to generate image stories")
 
         # If image data is provided, analyze it first
         if image_data:
-            image_analysis_prompt = (
+            return (
                 f"이미지를 분석하여 키워드 '{context.keyword}'와 연관된 "
                 f"창의적인 제목 {count}개와 각각의 상세한 장면 묘사를 JSON 형식으로 생성해주세요.\n"
                 f"각 항목은 다음 구조를 가져야 합니다:\n"
@@ -30,30 +48,28 @@ class ImageStoryGenerator(BaseGenerator):
                 f"}}]\n"
                 f"전체 {count}개 항목을 배열로 반환해주세요."
             )
-            raw = self.client.analyze_image(image_data, image_analysis_prompt)
-        else:
-            # Use text-based generation
-            prompt = IMAGE_STORY_TEMPLATE.format(keyword=context.keyword, count=count, context=context_text)
-            # Create a structured prompt that asks for JSON output
-            structured_prompt = (
-                f"{prompt}\n\n"
-                f"응답을 다음 JSON 형식으로 정확히 작성해주세요:\n"
-                f"[\n"
-                f"  {{\n"
-                f'    "index": 1,\n'
-                f'    "title": "제목1",\n'
-                f'    "description": "묘사1"\n'
-                f"  }},\n"
-                f"  {{\n"
-                f'    "index": 2,\n'
-                f'    "title": "제목2",\n'
-                f'    "description": "묘사2"\n'
-                f"  }}\n"
-                f"]\n"
-                f"JSON 형식만 응답하고 다른 텍스트는 포함하지 마세요."
-            )
-            raw = self.client.generate_structured(structured_prompt, context_text)
+        # Use text-based generation
+        prompt = IMAGE_STORY_TEMPLATE.format(keyword=context.keyword, count=count, context=context_text)
+        # Create a structured prompt that asks for JSON output
+        return (
+            f"{prompt}\n\n"
+            f"응답을 다음 JSON 형식으로 정확히 작성해주세요:\n"
+            f"[\n"
+            f"  {{\n"
+            f'    "index": 1,\n'
+            f'    "title": "제목1",\n'
+            f'    "description": "묘사1"\n'
+            f"  }},\n"
+            f"  {{\n"
+            f'    "index": 2,\n'
+            f'    "title": "제목2",\n'
+            f'    "description": "묘사2"\n'
+            f"  }}\n"
+            f"]\n"
+            f"JSON 형식만 응답하고 다른 텍스트는 포함하지 마세요."
+        )
 
+    def _parse(self, raw: str, context: GenerationContext, count: int) -> List[ImageStoryItem]:
         items: list[ImageStoryItem] = []
 
         # Try to extract JSON from response
@@ -21,6 +21,29 @@ class ImageTitleGenerator(BaseGenerator):
         video_url: str | None = None,
         transcript: str | None = None,
     ) -> list[TitleItem]:
+        prompt = self._prompt(description, context, count, video_url, transcript)
+        return self._items(self.client.generate_list(prompt, count=count))
+
+    async def generate_async(
+        self,
+        description: str | None,
+        context: GenerationContext,
+        count: int = 30,
+        *,
+        video_url: str | None = None,
+        transcript: str | None = None,
+    ) -> list[TitleItem]:
+        prompt = self._prompt(description, context, count, video_url, transcript)
+        return self._items(await self.client.generate_list_async(prompt, count=count))
+
+    def _prompt(
+        self,
+        description: str | None,
+        context: GenerationContext,
+        count: int,
+        video_url: str | None,
+        transcript: str | None,
+    ) -> str:
         if not (description or transcript or video_url):
             raise ValueError("영상 정보(설명, URL, 대사 등)를 최소 한 개 이상 입력해야 합니다.")
 
@@ -41,12 +64,13 @@ class ImageTitleGenerator(BaseGenerator):
             raise ValueError("영상 정보를 파악할 수 없습니다. 설명이나 대사를 입력해 주세요.")
 
         video_context = "\n".join(details)
-        prompt = VIDEO_TITLE_TEMPLATE.format(
+        return VIDEO_TITLE_TEMPLATE.format(
             video_context=video_context,
             keyword=context.keyword,
             count=count,
         )
-        titles = self.client.generate_list(prompt, count=count)
+
+    def _items(self, titles: list[str]) -> list[TitleItem]:
         return [
             TitleItem(index=i + 1, text=title, source="image")
             for i, title in enumerate(titles)
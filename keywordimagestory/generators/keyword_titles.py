@@ -11,9 +11,18 @@ class KeywordTitleGenerator(BaseGenerator):
     """Create short creative titles based on a keyword."""
 
     def generate(self, context: GenerationContext, count: int = 30) -> list[TitleItem]:
+        titles = self.client.generate_list(self._prompt(context, count), count=count)
+        return self._items(titles)
+
+    async def generate_async(self, context: GenerationContext, count: int = 30) -> list[TitleItem]:
+        titles = await self.client.generate_list_async(self._prompt(context, count), count=count)
+        return self._items(titles)
+
+    def _prompt(self, context: GenerationContext, count: int) -> str:
         self._ensure_keyword(context)
-        prompt = KEYWORD_TITLE_TEMPLATE.format(keyword=context.keyword, count=count)
-        titles = self.client.generate_list(prompt, count=count)
+        return KEYWORD_TITLE_TEMPLATE.format(keyword=context.keyword, count=count)
+
+    def _items(self, titles: list[str]) -> list[TitleItem]:
         return [
             TitleItem(index=i + 1, text=title, source="keyword")
             for i, title in enumerate(titles)
@@ -26,8 +26,14 @@ class ShortsSceneGenerator(BaseGenerator):
     def generate(self, context: GenerationContext) -> Tuple[list[SubtitleSegment], list[VideoPrompt]]:
         self._ensure_keyword(context)
         prompt = SHORTS_SCENE_TEMPLATE.format(keyword=context.keyword)
-        raw = self.client.generate_structured(prompt, context.keyword)
+        return self._parse(context, self.client.generate_structured(prompt, context.keyword))
 
+    async def generate_async(self, context: GenerationContext) -> Tuple[list[SubtitleSegment], list[VideoPrompt]]:
+        self._ensure_keyword(context)
+        prompt = SHORTS_SCENE_TEMPLATE.format(keyword=context.keyword)
+        return self._parse(context, await self.client.generate_structured_async(prompt, context.keyword))
+
+    def _parse(self, context: GenerationContext, raw: str) -> Tuple[list[SubtitleSegment], list[VideoPrompt]]:
         # Debug logging
         import logging
         logger = logging.getLogger(__name__)
@@ -1,7 +1,9 @@
 """OpenAI client wrapper with graceful degradation for offline development."""
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import io
 import logging
 import wave
@@ -12,10 +14,20 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     OpenAI = None  # type: ignore
 
+try:  # shared with ai_shorts_maker: one response cache and one async connection pool
+    from ai_shorts_maker import async_openai
+    from ai_shorts_maker.response_cache import response_cache, response_key
+except ImportError:  # pragma: no cover - running without the shorts package
+    async_openai = None  # type: ignore
+    response_cache = None  # type: ignore
+    response_key = None  # type: ignore
+
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+CHAT_MODEL = "gpt-4o-mini"
+
 
 class OpenAIClient:
     """Wrapper around the OpenAI SDK supporting fallbacks."""
@@ -39,33 +51,136 @@ class OpenAIClient:
             if OpenAI is None:
                 logger.warning("openai package not installed – using deterministic mock responses")
 
+    def _cache_key(self, kind: str, cache: bool, **parts: Any) -> str | None:
+        if not cache or response_cache is None:
+            return None
+        return response_key(kind, **parts)
+
+    def _chat_key(self, messages: list[dict[str, Any]], temperature: float, max_tokens: int, cache: bool) -> str | None:
+        return self._cache_key(
+            "chat", cache, model=CHAT_MODEL, messages=messages, temperature=temperature, max_tokens=max_tokens
+        )
+
+    def _vision_key(self, image_data: bytes, prompt: str, cache: bool) -> str | None:
+        # Key on the image digest rather than the multi-megabyte data URL.
+        return self._cache_key(
+            "vision",
+            cache,
+            model=CHAT_MODEL,
+            prompt=prompt,
+            image=hashlib.sha256(image_data).hexdigest(),
+            temperature=0.7,
+            max_tokens=2000,
+        )
+
+    def _chat(
+        self, messages: list[dict[str, Any]], *, temperature: float, max_tokens: int, key: str | None, kind: str = "chat"
+    ) -> str:
+        """Chat completion answered from the shared response cache when ``key`` is set."""
+
+        if key is not None:
+            cached = response_cache.get_text(key, kind=kind)
+            if cached is not None:
+                return cached
+        response = self._client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        text = response.choices[0].message.content or ""
+        if key is not None and text:
+            response_cache.put_text(key, text, kind=kind)
+        return text
+
+    async def _chat_async(
+        self, messages: list[dict[str, Any]], *, temperature: float, max_tokens: int, key: str | None, kind: str = "chat"
+    ) -> str:
+        # The cache is SQLite behind a lock; keep it off the event loop.
+        if key is not None:
+            cached = await asyncio.to_thread(response_cache.get_text, key, kind)
+            if cached is not None:
+                return cached
+        response = await async_openai.request(
+            self.api_key,
+            lambda client: client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ),
+            kind=kind,
+        )
+        text = response.choices[0].message.content or ""
+        if key is not None and text:
+            await asyncio.to_thread(response_cache.put_text, key, text, kind)
+        return text
+
+    def _async_ready(self) -> bool:
+        """Whether the pooled async transport can serve this client's requests."""
+
+        return self._client is not None and async_openai is not None and async_openai.available()
+
     # ------------------------------------------------------------------
     # High-level helpers
     # ------------------------------------------------------------------
-    def generate_list(self, prompt: str, count: int = 10) -> list[str]:
+    @staticmethod
+    def _list_messages(prompt: str) -> list[dict[str, Any]]:
+        return [
+            {"role": "system", "content": "You are a helpful and creative assistant."},
+            {"role": "user", "content": prompt},
+        ]
+
+    @staticmethod
+    def _image_messages(image_data: bytes, prompt: str) -> list[dict[str, Any]]:
+        base64_image = base64.b64encode(image_data).decode('utf-8')
+        logger.info(f"Image converted to base64, length: {len(base64_image)}")
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{base64_image}"
+                        }
+                    }
+                ]
+            }
+        ]
+
+    def generate_list(self, prompt: str, count: int = 10, *, cache: bool = False) -> list[str]:
         """Generate a list of short strings based on a prompt."""
 
         if self._client is None:
             return self._mock_list(prompt, count)
 
-        messages = [
-            {"role": "system", "content": "You are a helpful and creative assistant."},
-            {"role": "user", "content": prompt},
-        ]
+        messages = self._list_messages(prompt)
         try:
-            response = self._client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.8,
-                max_tokens=512,
+            text = self._chat(
+                messages, temperature=0.8, max_tokens=512, key=self._chat_key(messages, 0.8, 512, cache)
+            )
+            return self._normalise_list_output(text, count)
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("OpenAI list generation failed: %s", exc)
+            return self._mock_list(prompt, count)
+
+    async def generate_list_async(self, prompt: str, count: int = 10, *, cache: bool = False) -> list[str]:
+        if not self._async_ready():
+            return await asyncio.to_thread(self.generate_list, prompt, count, cache=cache)
+
+        messages = self._list_messages(prompt)
+        try:
+            text = await self._chat_async(
+                messages, temperature=0.8, max_tokens=512, key=self._chat_key(messages, 0.8, 512, cache)
             )
-            text = response.choices[0].message.content or ""
             return self._normalise_list_output(text, count)
         except Exception as exc:  # pragma: no cover - network failure
             logger.error("OpenAI list generation failed: %s", exc)
             return self._mock_list(prompt, count)
 
-    def generate_structured(self, instructions: str, content: str) -> str:
+    def generate_structured(self, instructions: str, content: str, *, cache: bool = False) -> str:
         """Return structured text output using the Chat API."""
 
         if self._client is None:
@@ -76,19 +191,35 @@ class OpenAIClient:
                 {"role": "system", "content": instructions},
                 {"role": "user", "content": content},
             ]
-            response = self._client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000,
+            return self._chat(
+                messages, temperature=0.7, max_tokens=2000, key=self._chat_key(messages, 0.7, 2000, cache)
+            )
+        except Exception as exc:  # pragma: no cover
+            logger.error("OpenAI structured generation failed: %s", exc)
+            return self._mock_structured(instructions, content)
+
+    async def generate_structured_async(self, instructions: str, content: str, *, cache: bool = False) -> str:
+        if not self._async_ready():
+            return await asyncio.to_thread(self.generate_structured, instructions, content, cache=cache)
+
+        try:
+            messages = [
+                {"role": "system", "content": instructions},
+                {"role": "user", "content": content},
+            ]
+            return await self._chat_async(
+                messages, temperature=0.7, max_tokens=2000, key=self._chat_key(messages, 0.7, 2000, cache)
             )
-            return response.choices[0].message.content or ""
         except Exception as exc:  # pragma: no cover
             logger.error("OpenAI structured generation failed: %s", exc)
             return self._mock_structured(instructions, content)
 
-    def analyze_image(self, image_data: bytes, prompt: str) -> str:
-        """Analyze image using Vision API and return description."""
+    def analyze_image(self, image_data: bytes, prompt: str, *, cache: bool = False) -> str:
+        """Analyze image using Vision API and return description.
+
+        Image stories are sampled creatively, so a repeated image gets a fresh
+        take unless ``cache=True``.
+        """
 
         logger.info(f"analyze_image called. Client available: {self._client is not None}, Image size: {len(image_data)} bytes")
 
@@ -97,33 +228,34 @@ class OpenAIClient:
             return self._mock_image_analysis(prompt)
 
         try:
-            # Convert image to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
-            logger.info(f"Image converted to base64, length: {len(base64_image)}")
+            messages = self._image_messages(image_data, prompt)
+            logger.info("Making OpenAI Vision API call...")
+            result = self._chat(
+                messages,
+                temperature=0.7,
+                max_tokens=2000,
+                key=self._vision_key(image_data, prompt, cache),
+                kind="vision",
+            )
+            logger.info(f"OpenAI Vision API response received, length: {len(result)}")
+            return result
+        except Exception as exc:  # pragma: no cover
+            logger.error("OpenAI image analysis failed: %s", exc)
+            return self._mock_image_analysis(prompt)
 
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}"
-                            }
-                        }
-                    ]
-                }
-            ]
+    async def analyze_image_async(self, image_data: bytes, prompt: str, *, cache: bool = False) -> str:
+        if not self._async_ready():
+            return await asyncio.to_thread(self.analyze_image, image_data, prompt, cache=cache)
 
-            logger.info("Making OpenAI Vision API call...")
-            response = self._client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
+        try:
+            messages = self._image_messages(image_data, prompt)
+            result = await self._chat_async(
+                messages,
                 temperature=0.7,
                 max_tokens=2000,
+                key=self._vision_key(image_data, prompt, cache),
+                kind="vision",
             )
-            result = response.choices[0].message.content or ""
             logger.info(f"OpenAI Vision API response received, length: {len(result)}")
             return result
         except Exception as exc:  # pragma: no cover
@@ -137,6 +269,7 @@ class OpenAIClient:
         voice: str = "alloy",
         audio_format: str = "mp3",
         model: str = "gpt-4o-mini-tts",
+        cache: bool = True,
     ) -> Tuple[bytes, str]:
         """Generate speech from text and return (audio_bytes, format)."""
 
@@ -146,6 +279,12 @@ class OpenAIClient:
         if self._client is None:
             return self._mock_audio()
 
+        key = self._cache_key("speech", cache, model=model, voice=voice, input=text, format=audio_format)
+        if key is not None:
+            cached = response_cache.read_bytes(key, kind="speech")
+            if cached is not None:
+                return cached, audio_format
+
         try:
             response = self._client.audio.speech.create(
                 model=model,
@@ -156,11 +295,55 @@ class OpenAIClient:
             buffer = io.BytesIO()
             for chunk in response.iter_bytes():
                 buffer.write(chunk)
+            if key is not None:
+                response_cache.put_bytes(key, buffer.getvalue(), f".{audio_format}", kind="speech")
             return buffer.getvalue(), audio_format
         except Exception as exc:  # pragma: no cover - network failure
             logger.error("OpenAI speech synthesis failed: %s", exc)
             return self._mock_audio()
 
+    async def synthesize_speech_async(
+        self,
+        text: str,
+        *,
+        voice: str = "alloy",
+        audio_format: str = "mp3",
+        model: str = "gpt-4o-mini-tts",
+        cache: bool = True,
+    ) -> Tuple[bytes, str]:
+        if not text or not text.strip():
+            raise ValueError("text is required for speech synthesis")
+
+        if not self._async_ready():
+            return await asyncio.to_thread(
+                self.synthesize_speech, text, voice=voice, audio_format=audio_format, model=model, cache=cache
+            )
+
+        key = self._cache_key("speech", cache, model=model, voice=voice, input=text, format=audio_format)
+        if key is not None:
+            cached = await asyncio.to_thread(response_cache.read_bytes, key, "speech")
+            if cached is not None:
+                return cached, audio_format
+
+        try:
+            response = await async_openai.request(
+                self.api_key,
+                lambda client: client.audio.speech.create(
+                    model=model,
+                    voice=voice,
+                    input=text,
+                    response_format=audio_format,
+                ),
+                kind="speech",
+            )
+            audio = response.content
+            if key is not None:
+                await asyncio.to_thread(response_cache.put_bytes, key, audio, f".{audio_format}", "speech")
+            return audio, audio_format
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.error("OpenAI speech synthesis failed: %s", exc)
+            return self._mock_audio()
+
     # ------------------------------------------------------------------
     # Mock helpers used during development or offline mode
     # ------------------------------------------------------------------
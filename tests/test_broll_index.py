@@ -0,0 +1,55 @@
+"""Refreshing an unchanged b-roll library must not rescan it."""
+from __future__ import annotations
+
+import os
+
+from ai_shorts_maker import broll_index
+from ai_shorts_maker.broll_index import BrollEntry, BrollIndex
+
+
+def _fake_probe(calls):
+    def probe(path, stat):
+        calls.append(path.name)
+        return BrollEntry(name=path.name, kind="image", size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    return probe
+
+
+def test_consecutive_refreshes_do_not_rescan(tmp_path, monkeypatch):
+    library = tmp_path / "broll"
+    library.mkdir()
+    (library / "a.png").write_bytes(b"a")
+    (library / "b.jpg").write_bytes(b"b")
+    monkeypatch.setattr(broll_index, "INDEX_DIR", tmp_path / "index")
+    probed = []
+    monkeypatch.setattr(broll_index, "probe_entry", _fake_probe(probed))
+
+    index = BrollIndex(library)
+    rescans = []
+    original = index._rescan
+    monkeypatch.setattr(index, "_rescan", lambda mtime: (rescans.append(mtime), original(mtime)))
+
+    assert [entry.name for entry in index.refresh()] == ["a.png", "b.jpg"]
+    mtime_after_first = os.stat(library).st_mtime_ns
+    assert [entry.name for entry in index.refresh()] == ["a.png", "b.jpg"]
+    assert [entry.name for entry in index.refresh()] == ["a.png", "b.jpg"]
+
+    assert len(rescans) == 1
+    assert sorted(probed) == ["a.png", "b.jpg"]
+    assert os.stat(library).st_mtime_ns == mtime_after_first
+    assert index.index_path.exists() and index.index_path.parent != library
+
+
+def test_persisted_index_is_reused_without_rescan(tmp_path, monkeypatch):
+    library = tmp_path / "broll"
+    library.mkdir()
+    (library / "a.png").write_bytes(b"a")
+    monkeypatch.setattr(broll_index, "INDEX_DIR", tmp_path / "index")
+    probed = []
+    monkeypatch.setattr(broll_index, "probe_entry", _fake_probe(probed))
+    BrollIndex(library).refresh()
+
+    reloaded = BrollIndex(library)
+    monkeypatch.setattr(reloaded, "_rescan", lambda mtime: (_ for _ in ()).throw(AssertionError("rescanned")))
+    assert [entry.name for entry in reloaded.refresh()] == ["a.png"]
+    assert probed == ["a.png"]
@@ -0,0 +1,16 @@
+"""Run work directories are pruned once they go stale."""
+from __future__ import annotations
+
+import os
+
+from ai_shorts_maker.checkpoints import RUNS_DIRNAME, RunCheckpoint
+
+
+def test_creating_a_run_prunes_stale_runs(tmp_path):
+    stale = RunCheckpoint.create(tmp_path, "stale")
+    os.utime(stale.path("run.json"), (0, 0))
+    RunCheckpoint.create(tmp_path, "recent")
+
+    RunCheckpoint.create(tmp_path, "current")
+
+    assert sorted(path.name for path in (tmp_path / RUNS_DIRNAME).iterdir()) == ["current", "recent"]
@@ -0,0 +1,31 @@
+"""Encodes still being written must neither collide nor be evicted."""
+from __future__ import annotations
+
+import os
+import threading
+
+from ai_shorts_maker.render_chunks import ChunkCache
+
+
+def test_evict_skips_partial_files(tmp_path):
+    cache = ChunkCache(tmp_path, max_bytes=0)
+    partial = cache.partial_path("inflight")
+    partial.write_bytes(b"x" * 10)
+    old = cache.path_for("old")
+    old.write_bytes(b"x" * 10)
+    os.utime(old, (0, 0))
+
+    assert cache.evict() == 1
+    assert partial.exists()
+    assert not old.exists()
+
+
+def test_partial_paths_are_unique_per_writer(tmp_path):
+    cache = ChunkCache(tmp_path)
+    names = []
+    worker = threading.Thread(target=lambda: names.append(cache.partial_path("chunk")))
+    worker.start()
+    worker.join()
+
+    assert names[0] != cache.partial_path("chunk")
+    assert names[0].name.endswith(f".partial{cache.suffix}")
@@ -0,0 +1,37 @@
+"""Starting a job queue requeues only jobs whose worker process is gone."""
+from __future__ import annotations
+
+import time
+
+from ai_shorts_maker.jobs import HEARTBEAT_TIMEOUT, Job, JobQueue, JobStore
+
+
+def _running(store: JobStore, owner: str, heartbeat_at: float) -> str:
+    job = store.create(Job(id=f"job-{len(store.list()) + 1}", kind="render", params={}))
+    assert store.claim(job.id, owner)
+    store.update(job.id, heartbeat_at=heartbeat_at)
+    return job.id
+
+
+def test_recover_leaves_jobs_of_live_workers_running(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    live = _running(store, "other-host:123:abcd", time.time())
+    stale = _running(store, "other-host:456:abcd", time.time() - HEARTBEAT_TIMEOUT - 1)
+    legacy = store.create(Job(id="legacy", kind="render", params={}, status="queued")).id
+    store.update(legacy, status="running")
+
+    queue = JobQueue(store)
+    recovered = {job.id for job in store.recover(queue.owner)}
+
+    assert recovered == {stale, legacy}
+    assert store.get(live).status == "running"
+    assert store.get(stale).owner is None
+
+
+def test_earlier_process_with_the_same_pid_is_gone(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(store)
+    host, pid, _ = queue.owner.split(":")
+    previous = _running(store, f"{host}:{pid}:00000000", time.time())
+
+    assert [job.id for job in store.recover(queue.owner)] == [previous]
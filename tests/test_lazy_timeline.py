@@ -0,0 +1,86 @@
+"""The long-form (lazy) timeline must show the same frames as the concat path."""
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("moviepy")
+Image = pytest.importorskip("PIL.Image")
+
+from ai_shorts_maker import services  # noqa: E402
+from ai_shorts_maker.models import AudioSettings, ProjectMetadata, TimelineSegment  # noqa: E402
+
+CANVAS = (64, 112)
+FPS = 10
+
+
+def _image(path, color):
+    Image.new("RGB", CANVAS, color).save(path)
+    return str(path)
+
+
+def _segment(index, source, start, end):
+    return TimelineSegment(id=f"seg-{index}", media_type="image", source=source, start=start, end=end)
+
+
+@pytest.fixture
+def project(tmp_path):
+    red = _image(tmp_path / "red.png", (200, 30, 30))
+    green = _image(tmp_path / "green.png", (30, 200, 30))
+    blue = _image(tmp_path / "blue.png", (30, 30, 200))
+    timeline = [
+        _segment(1, red, 0.0, 2.0),
+        # Overlaps the first segment: the concat path plays it after red ends.
+        _segment(2, green, 1.0, 3.0),
+        # Leaves a gap that is filled only up to its start.
+        _segment(3, blue, 4.5, 5.0),
+        # Shorter than the 0.1 s minimum a clip lasts.
+        _segment(4, red, 5.5, 5.55),
+    ]
+    return ProjectMetadata(
+        base_name="lazy-parity",
+        topic="t",
+        style="s",
+        language="ko",
+        duration=7.0,
+        script_path=str(tmp_path / "script.json"),
+        audio_path=str(tmp_path / "voice.mp3"),
+        subtitles_path=str(tmp_path / "captions.srt"),
+        video_path=None,
+        captions=[],
+        timeline=timeline,
+        audio_settings=AudioSettings(voice_path=str(tmp_path / "voice.mp3")),
+    )
+
+
+def _visual(metadata, lazy):
+    segments = sorted(metadata.timeline, key=lambda seg: seg.start)
+    return services._build_moviepy_visual(
+        metadata,
+        factory=services._project_factory(metadata, FPS, CANVAS),
+        fps=FPS,
+        base_duration=metadata.duration,
+        timeline_segments=segments,
+        burn_subs=False,
+        lazy=lazy,
+    )
+
+
+def test_lazy_timeline_matches_concat(project):
+    concat_clip, concat_pool = _visual(project, lazy=False)
+    lazy_clip, lazy_pool = _visual(project, lazy=True)
+    try:
+        for t in np.arange(0.05, project.duration, 0.25):
+            expected = np.asarray(concat_clip.get_frame(t), dtype=np.int16)
+            actual = np.asarray(lazy_clip.get_frame(t), dtype=np.int16)
+            assert expected.shape == actual.shape
+            assert np.abs(expected - actual).max() <= 2, f"frames differ at t={t:.2f}"
+    finally:
+        services._close_clips(reversed(lazy_pool))
+        services._close_clips(reversed(concat_pool))
+
+
+def test_base_track_layout_follows_concat_cursor(project):
+    layout = services._base_track_layout(project.timeline, project.duration)
+    spans = [(round(start, 3), round(end, 3)) for _, start, end in layout]
+    assert spans == [(0.0, 2.0), (2.0, 4.0), (5.5, 6.0), (6.5, 6.6)]
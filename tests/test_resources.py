@@ -0,0 +1,19 @@
+"""CPU leases leave later jobs a real share of the cores."""
+from __future__ import annotations
+
+from ai_shorts_maker.resources import ResourceGovernor
+
+
+def test_first_lease_is_capped_at_expected_share():
+    governor = ResourceGovernor(8, expected_concurrency=2)
+
+    with governor.lease("first") as first:
+        with governor.lease("second") as second:
+            assert (first, second) == (4, 4)
+
+
+def test_single_worker_takes_every_core():
+    governor = ResourceGovernor(8, expected_concurrency=1)
+
+    with governor.lease("only") as threads:
+        assert threads == 8
@@ -0,0 +1,15 @@
+"""A cached file evicted between lookup and read is a miss, not an error."""
+from __future__ import annotations
+
+from ai_shorts_maker.response_cache import ResponseCache
+
+
+def test_file_evicted_after_lookup_is_a_miss(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path / "cache")
+    cache.put_bytes("speech-key", b"audio", ".mp3", "speech")
+    assert cache.read_bytes("speech-key", "speech") == b"audio"
+
+    monkeypatch.setattr(cache, "get_file", lambda key, kind="audio": tmp_path / "evicted.mp3")
+
+    assert cache.read_bytes("speech-key", "speech") is None
+    assert cache.copy_file("speech-key", tmp_path / "out" / "voice.mp3", "speech") is False
@@ -0,0 +1,24 @@
+"""The text bitmap disk cache stays under its byte limit, dropping cold entries first."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ai_shorts_maker import text_render  # noqa: E402
+
+
+def test_evict_drops_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_render, "CACHE_DIR", tmp_path)
+    paths = []
+    for age, name in enumerate(["cold", "warm", "hot"]):
+        path = tmp_path / name[:2] / f"{name}.npy"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + age, 1000 + age))
+        paths.append(path)
+
+    assert text_render.evict_disk_cache(max_bytes=200) == 1
+    assert [path.exists() for path in paths] == [False, True, True]
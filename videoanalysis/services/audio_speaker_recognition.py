@@ -10,6 +10,8 @@ import subprocess
 import tempfile
 import os
 
+from ai_shorts_maker.resources import governed
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +23,7 @@ class AudioSpeakerRecognition:
         self.window_size = 2.0    # 2초 윈도우
         self.hop_size = 0.5       # 0.5초 겹침
 
+    @governed("speaker-features")
     def extract_audio_features(self, audio_path: str) -> Dict[str, np.ndarray]:
         """오디오에서 화자 구분용 특성 추출"""
         try:
@@ -90,6 +93,7 @@ class AudioSpeakerRecognition:
             logger.error(f"❌ 오디오 특성 추출 실패: {e}")
             return {}
 
+    @governed("speaker-clustering")
     def cluster_speakers(self, features: Dict[str, np.ndarray], n_speakers: int = None) -> np.ndarray:
         """특성을 기반으로 화자 클러스터링"""
         try:
@@ -9,6 +9,8 @@ from typing import List, Dict, Any, Tuple
 from pathlib import Path
 import os
 
+from ai_shorts_maker.resources import governed
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,7 @@ class SimpleAudioSpeakerRecognition:
         self.window_size = 1.0    # 1초 윈도우
         self.hop_size = 0.5       # 0.5초 겹침
 
+    @governed("speaker-features")
     def extract_simple_features(self, audio_path: str) -> Dict[str, np.ndarray]:
         """간단한 오디오 특성 추출 (scikit-learn 없이)"""
         try:
@@ -76,6 +79,7 @@ class SimpleAudioSpeakerRecognition:
             logger.error(f"❌ 간단한 특성 추출 실패: {e}")
             return {}
 
+    @governed("speaker-clustering")
     def simple_speaker_clustering(self, features: Dict[str, np.ndarray], n_speakers: int = 2) -> np.ndarray:
         """간단한 화자 클러스터링 (k-means 대신 임계값 기반)"""
         try:
@@ -1,6 +1,7 @@
 """FastAPI 애플리케이션: AI 쇼츠 제작 웹 UI 및 API."""
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import shutil
@@ -17,12 +18,13 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
     Request,
     Response,
     UploadFile,
     status,
 )
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.concurrency import run_in_threadpool
@@ -49,6 +51,7 @@ from ai_shorts_maker.services import (
     add_subtitle,
     delete_subtitle_line,
     list_versions,
+    render_frame,
     render_project,
     replace_timeline,
     restore_project_version,
@@ -56,6 +59,12 @@ from ai_shorts_maker.services import (
     update_subtitle_style,
     update_subtitle,
 )
+from ai_shorts_maker import async_openai
+from ai_shorts_maker.jobs import JOB_DB_FILENAME, JOB_STATES, JobQueue, JobStore
+from ai_shorts_maker.media_reader import image_cache
+from ai_shorts_maker.response_cache import response_cache
+from ai_shorts_maker.resources import governor
+from ai_shorts_maker.timings import registry as timings_registry
 import ai_shorts_maker.translator as translator_module
 from ai_shorts_maker.translator import (
     TranslatorProject,
@@ -70,8 +79,9 @@ from ai_shorts_maker.translator import (
     list_projects as translator_list_projects,
     load_project as translator_load_project,
     update_project as translator_update_project,
-    translate_project_segments,
-    synthesize_voice_for_project,
+    translate_project_segments_async,
+    translate_text_async,
+    synthesize_voice_for_project_async,
     render_translated_project,
     list_translation_versions,
     load_translation_version,
@@ -82,6 +92,14 @@ from youtube.ytdl import download_with_options, parse_sub_langs
 
 class RenderRequest(BaseModel):
     burn_subs: Optional[bool] = False
+    engine: Optional[Literal["moviepy", "ffmpeg"]] = None
+    shards: Optional[int] = None
+    incremental: Optional[bool] = False
+    subtitle_renderer: Optional[Literal["moviepy", "ass"]] = None
+    lazy: Optional[bool] = None
+    preview: Optional[bool] = False
+    hls: Optional[bool] = False
+    priority: Optional[int] = None
 
 
 class SubtitleStyleRequest(BaseModel):
@@ -96,6 +114,7 @@ class SubtitleStyleRequest(BaseModel):
     banner_primary_font_size: Optional[int] = None
     banner_secondary_font_size: Optional[int] = None
     banner_line_spacing: Optional[int] = None
+    renderer: Optional[Literal["moviepy", "ass"]] = None
 
 
 class DashboardProject(BaseModel):
@@ -196,6 +215,39 @@ app.mount("/outputs", StaticFiles(directory=OUTPUT_DIR), name="outputs")
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+# Renders run as background jobs; interactive previews jump the queue.
+job_queue = JobQueue(JobStore(OUTPUT_DIR / JOB_DB_FILENAME))
+PREVIEW_JOB_PRIORITY = 10
+JOB_EVENT_INTERVAL = 0.5
+
+
+def _run_render_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    return render_project(**params).model_dump(mode="json")
+
+
+def _run_translator_render_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    project = render_translated_project(params["project_id"])
+    if project.status == "failed":
+        raise RuntimeError(project.extra.get("error") or "Render failed")
+    # render_translated_project returns the project untouched when it is not ready.
+    if project.status != "rendered" or not project.extra.get("rendered_video_path"):
+        raise RuntimeError(f"Project is not ready for rendering (status: {project.status})")
+    return project.model_dump(mode="json")
+
+
+job_queue.register("render", _run_render_job)
+job_queue.register("translator_render", _run_translator_render_job)
+
+
+@app.on_event("startup")
+def _start_job_queue() -> None:
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def _close_openai_clients() -> None:
+    await async_openai.close_clients()
+
 api_router = APIRouter(prefix="/api", tags=["projects"])
 
 
@@ -292,15 +344,48 @@ def api_clone_project(base_name: str) -> ProjectMetadata:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@api_router.post("/projects/{base_name}/render", response_model=ProjectMetadata)
-def api_render_project(base_name: str, payload: Optional[RenderRequest] = Body(None)) -> ProjectMetadata:
+@api_router.post("/projects/{base_name}/render", status_code=status.HTTP_202_ACCEPTED)
+def api_render_project(base_name: str, payload: Optional[RenderRequest] = Body(None)) -> Dict[str, Any]:
     try:
+        load_project(base_name, OUTPUT_DIR)
         burn = payload.burn_subs if payload is not None else False
-        return render_project(base_name, burn_subs=bool(burn))
+        engine = (payload.engine if payload is not None else None) or "moviepy"
+        shards = (payload.shards if payload is not None else None) or 1
+        incremental = payload.incremental if payload is not None else False
+        preview = bool(payload.preview) if payload is not None else False
+        priority = payload.priority if payload is not None else None
+        job = job_queue.submit(
+            "render",
+            {
+                "base_name": base_name,
+                "burn_subs": bool(burn),
+                "engine": engine,
+                "shards": shards,
+                "incremental": bool(incremental),
+                "subtitle_renderer": payload.subtitle_renderer if payload is not None else None,
+                "lazy": payload.lazy if payload is not None else None,
+                "preview": preview,
+                "hls": bool(payload.hls) if payload is not None else False,
+            },
+            target=base_name,
+            priority=priority if priority is not None else (PREVIEW_JOB_PRIORITY if preview else 0),
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except (RuntimeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return job.to_dict()
+
+
+@api_router.get("/projects/{base_name}/frame")
+def api_project_frame(base_name: str, t: float = 0.0, scale: float = 0.5) -> Response:
+    try:
+        content = render_frame(base_name, t, scale=scale)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-    except RuntimeError as exc:
+    except (RuntimeError, ValueError) as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return Response(content=content, media_type="image/jpeg", headers={"Cache-Control": "no-store"})
 
 
 @api_router.patch("/projects/{base_name}/subtitle-style", response_model=ProjectMetadata)
@@ -310,6 +395,8 @@ def api_update_subtitle_style_route(base_name: str, payload: SubtitleStyleReques
         return update_subtitle_style(base_name, **data)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @api_router.get("/projects/{base_name}/versions", response_model=List[ProjectVersionInfo])
@@ -325,6 +412,76 @@ def api_restore_version(base_name: str, version: int) -> ProjectMetadata:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
+@api_router.get("/cache/images")
+def api_image_cache_stats() -> Dict[str, int]:
+    return image_cache.stats()
+
+
+@api_router.get("/cache/openai")
+def api_openai_cache_stats() -> Dict[str, Any]:
+    return response_cache.stats()
+
+
+@api_router.get("/resources/cpu")
+def api_cpu_budget() -> Dict[str, Any]:
+    return governor.stats()
+
+
+@api_router.get("/metrics/timings")
+def api_stage_timings() -> Dict[str, Any]:
+    return timings_registry.snapshot()
+
+
+@api_router.get("/jobs")
+def api_list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    target: Optional[str] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    if status_filter is not None and status_filter not in JOB_STATES:
+        raise HTTPException(status_code=400, detail=f"Unknown job status: {status_filter}")
+    return [job.to_dict() for job in job_queue.store.list(status=status_filter, target=target, limit=limit)]
+
+
+@api_router.get("/jobs/{job_id}")
+def api_get_job(job_id: str) -> Dict[str, Any]:
+    try:
+        return job_queue.get(job_id).to_dict()
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@api_router.get("/jobs/{job_id}/events")
+async def api_job_events(job_id: str, request: Request) -> StreamingResponse:
+    """Server-sent events with the job's state whenever it changes, until it finishes."""
+    try:
+        await run_in_threadpool(job_queue.get, job_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+    async def stream():
+        last_payload = None
+        while not await request.is_disconnected():
+            job = await run_in_threadpool(job_queue.get, job_id)
+            payload = json.dumps(job.to_dict(), ensure_ascii=False, default=str)
+            if payload != last_payload:
+                yield f"event: job\ndata: {payload}\n\n"
+                last_payload = payload
+            if job.finished:
+                break
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-store"})
+
+
+@api_router.delete("/jobs/{job_id}")
+def api_cancel_job(job_id: str) -> Dict[str, Any]:
+    try:
+        return job_queue.cancel(job_id).to_dict()
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
 app.include_router(api_router)
 
 
@@ -418,8 +575,8 @@ async def api_delete_translator_project(project_id: str) -> Response:
 @translator_router.post("/projects/{project_id}/generate-commentary", response_model=TranslatorProject)
 async def api_generate_ai_commentary(project_id: str) -> TranslatorProject:
     try:
-        from ai_shorts_maker.translator import generate_ai_commentary_for_project
-        return await run_in_threadpool(generate_ai_commentary_for_project, project_id)
+        from ai_shorts_maker.translator import generate_ai_commentary_for_project_async
+        return await generate_ai_commentary_for_project_async(project_id)
     except Exception as exc:
         logger.exception("Failed to generate AI commentary for project %s", project_id)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -428,8 +585,8 @@ async def api_generate_ai_commentary(project_id: str) -> TranslatorProject:
 @translator_router.post("/projects/{project_id}/generate-korean-commentary", response_model=TranslatorProject)
 async def api_generate_korean_ai_commentary(project_id: str) -> TranslatorProject:
     try:
-        from ai_shorts_maker.translator import generate_korean_ai_commentary_for_project
-        return await run_in_threadpool(generate_korean_ai_commentary_for_project, project_id)
+        from ai_shorts_maker.translator import generate_korean_ai_commentary_for_project_async
+        return await generate_korean_ai_commentary_for_project_async(project_id)
     except Exception as exc:
         logger.exception("Failed to generate Korean AI commentary for project %s", project_id)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -438,7 +595,7 @@ async def api_generate_korean_ai_commentary(project_id: str) -> TranslatorProjec
 @translator_router.post("/projects/{project_id}/translate", response_model=TranslatorProject)
 async def api_translate_project(project_id: str) -> TranslatorProject:
     try:
-        return await run_in_threadpool(translate_project_segments, project_id)
+        return await translate_project_segments_async(project_id)
     except Exception as exc:
         logger.exception("Failed to run translation for project %s", project_id)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -447,19 +604,25 @@ async def api_translate_project(project_id: str) -> TranslatorProject:
 @translator_router.post("/projects/{project_id}/voice", response_model=TranslatorProject)
 async def api_synthesize_voice(project_id: str) -> TranslatorProject:
     try:
-        return await run_in_threadpool(synthesize_voice_for_project, project_id)
+        return await synthesize_voice_for_project_async(project_id)
     except Exception as exc:
         logger.exception("Failed to run voice synthesis for project %s", project_id)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@translator_router.post("/projects/{project_id}/render", response_model=TranslatorProject)
-async def api_render_project(project_id: str) -> TranslatorProject:
+@translator_router.post("/projects/{project_id}/render", status_code=status.HTTP_202_ACCEPTED)
+async def api_render_project(project_id: str) -> Dict[str, Any]:
     try:
-        return await run_in_threadpool(render_translated_project, project_id)
-    except Exception as exc:
-        logger.exception("Failed to run render for project %s", project_id)
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        project = await run_in_threadpool(translator_load_project, project_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    if project.status != "voice_complete":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Project is not ready for rendering (status: {project.status})",
+        )
+    job = job_queue.submit("translator_render", {"project_id": project_id}, target=project_id)
+    return job.to_dict()
 
 
 @translator_router.get("/projects/{project_id}/versions")
@@ -494,11 +657,7 @@ async def api_reverse_translate(project_id: str, payload: Dict[str, Any] = Body(
         if not japanese_text:
             raise HTTPException(status_code=400, detail="Japanese text is required")
 
-        # Use the existing translate_project_segments function with reverse parameters
-        from ai_shorts_maker.translator import translate_text
-
-        korean_text = await run_in_threadpool(
-            translate_text,
+        korean_text = await translate_text_async(
             japanese_text,
             target_lang="ko",  # Japanese to Korean
             translation_mode="reinterpret",
@@ -988,6 +1147,11 @@ def _split_urls(raw: str) -> List[str]:
     return [line.strip() for line in raw.replace("\r", "\n").splitlines() if line.strip()]
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    return Response(content=timings_registry.prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/ytdl", response_class=HTMLResponse)
 async def ytdl_index(request: Request) -> HTMLResponse:
     context = {